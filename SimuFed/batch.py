@@ -0,0 +1,197 @@
+from __future__ import annotations
+from typing import Dict, List, Tuple
+import math
+import time
+
+import numpy as np
+
+from SimuFed.client import ClientConfig, load_partition
+from SimuFed.coordinator import RoundResult
+from SimuFed.utils.aggregator import Summary, grid_edges, hist_groups, merge_summaries
+from SimuFed.utils.sketch import TDigest
+
+# Values binned per hist_groups() call: keeps its temporaries in cache
+HIST_BLOCK = 8192
+
+
+def load_partitions(clients: List[ClientConfig]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Every client's column in one contiguous array.
+
+    Returns (values, offsets): partition p is values[offsets[p]:offsets[p + 1]].
+    """
+    # Copy out of each memory map so its file is closed before the next opens
+    parts = [np.array(load_partition(c)) for c in clients]
+    offsets = np.zeros(len(parts) + 1, dtype=np.int64)
+    np.cumsum([p.size for p in parts], out=offsets[1:])
+    values = np.concatenate(parts) if parts else np.empty(0)
+    return values, offsets
+
+
+def batch_summaries(
+    clients: List[ClientConfig],
+    values: np.ndarray | None = None,
+    offsets: np.ndarray | None = None,
+) -> List[Summary]:
+    """
+    One Summary per client, computed for all partitions at once.
+
+    Sums and moments are segment reductions (np.add.reduceat over the
+    partition offsets), the histograms grouped np.bincounts per distinct
+    bin count, HIST_BLOCK values at a time. Faults are not simulated: every partition answers.
+    """
+    if any(c.columns or c.group_by for c in clients):
+        raise ValueError("the batch engine summarizes one column per partition; multi-column and group-by "
+                         "clients need a coordinator")
+    if values is None:
+        values, offsets = load_partitions(clients)
+    n = np.diff(offsets)
+    p_count = len(clients)
+    seg = np.repeat(np.arange(p_count), n)
+    ne = np.flatnonzero(n > 0)
+    starts = offsets[:-1][ne]  # empty partitions would break reduceat; they stay at 0
+
+    def per_partition(ufunc, x, fill=0.0):
+        out = np.full(p_count, fill)
+        if ne.size:
+            out[ne] = ufunc.reduceat(x, starts)
+        return out
+
+    s = per_partition(np.add, values)
+    s2 = per_partition(np.add, values * values)
+    mean = np.divide(s, n, out=np.zeros(p_count), where=n > 0)
+    d = values - mean[seg]
+    d2 = d * d
+    m2 = per_partition(np.add, d2)
+    m3 = per_partition(np.add, d2 * d)
+    m4 = per_partition(np.add, d2 * d2)
+
+    # Histograms: each partition on its own range (or its hist_range), as np.histogram would
+    lo = per_partition(np.minimum, values, 0.0)
+    hi = per_partition(np.maximum, values, 1.0)
+    counts: Dict[int, np.ndarray] = {}
+    edges: Dict[int, np.ndarray] = {}
+    bins_of = np.array([c.bins for c in clients], dtype=np.int64)
+    for bins in np.unique(bins_of):
+        members = np.flatnonzero(bins_of == bins)
+        r_lo, r_hi = lo[members].copy(), hi[members].copy()
+        fixed = [i for i, p in enumerate(members) if clients[p].hist_range is not None]
+        for i in fixed:
+            r_lo[i], r_hi[i] = clients[members[i]].hist_range
+        grid = grid_edges(r_lo, r_hi, int(bins))
+        # Map each value to its row in `grid`; values of other bin counts are left out
+        row = np.full(p_count, -1)
+        row[members] = np.arange(members.size)
+        pick = row[seg]
+        take = pick >= 0
+        x, g = (values, pick) if take.all() else (values[take], pick[take])
+        c = np.zeros((members.size, int(bins)), dtype=np.int64)
+        for a in range(0, x.size, HIST_BLOCK):
+            c += hist_groups(x[a:a + HIST_BLOCK], g[a:a + HIST_BLOCK], grid, within=not fixed)
+        for i, p in enumerate(members):
+            counts[p], edges[p] = c[i], grid[i]
+
+    out = []
+    for p, cfg in enumerate(clients):
+        a, b = offsets[p], offsets[p + 1]
+        sketch = TDigest.from_array(values[a:b], cfg.sketch_compression) if cfg.sketch_compression else None
+        out.append(Summary(
+            client_id=cfg.client_id,
+            n=int(n[p]),
+            s=float(s[p]),
+            s2=float(s2[p]),
+            hist_counts=counts[p],
+            hist_edges=edges[p],
+            partition_id=cfg.partition_key,
+            sketch=sketch,
+            m2=float(m2[p]),
+            m3=float(m3[p]),
+            m4=float(m4[p]),
+        ))
+    return out
+
+
+class BatchEngine:
+    """
+    In-process fast path: summarizes every partition with a few vectorized
+    calls instead of one client process each. Same RoundResult as the
+    coordinators, with no faults, timeouts or drops.
+    """
+
+    def run_round(self, clients: List[ClientConfig]) -> RoundResult:
+        start = time.time()
+        summaries = batch_summaries(clients)
+        aggregated = merge_summaries(summaries) if summaries else {}
+        duration = time.time() - start
+        print(f"[Batch] Summarized {len(summaries)} partitions in {duration:.3f}s.")
+        return RoundResult(summaries, aggregated, dropped=0, duration_s=duration, stopped_by="all")
+
+
+def check_aggregate(aggregated: dict, clients: List[ClientConfig], rtol: float = 1e-9) -> List[str]:
+    """
+    Compare a coordinator's aggregate with the exact answer over `clients`
+    (the clients whose summaries it merged); returns the mismatches, empty if it agrees.
+
+    Moments are checked to `rtol` against the pooled data. The histogram is
+    checked bin for bin when all clients shared one grid (otherwise it was
+    rebinned and only its total is checked); sketched quantiles must be
+    within 1% in rank.
+    """
+    if any(c.columns for c in clients):
+        raise ValueError("check_aggregate checks single-column rounds")
+    values, _ = load_partitions(clients)
+    problems = []
+    if aggregated.get("n") != values.size:
+        return [f"n: got {aggregated.get('n')}, expected {values.size}"]
+    if values.size == 0:
+        return problems
+    d = values - values.mean()
+    m2, m3, m4 = float(d @ d), float(np.sum(d ** 3)), float(np.sum(d ** 4))
+    expected = {
+        "mean": float(values.mean()),
+        "var": m2 / values.size,
+        "skewness": math.sqrt(values.size) * m3 / m2 ** 1.5 if m2 > 0 else math.nan,
+        "kurtosis": values.size * m4 / m2 ** 2 - 3.0 if m2 > 0 else math.nan,
+    }
+    scale = {"mean": float(np.abs(values).max()), "var": expected["var"], "skewness": 1.0, "kurtosis": 1.0}
+    for key, want in expected.items():
+        got = aggregated.get(key, math.nan)
+        if math.isnan(want) and math.isnan(got):
+            continue
+        if not abs(got - want) <= rtol * max(abs(want), scale[key]):
+            problems.append(f"{key}: got {got!r}, expected {want!r}")
+
+    counts = np.asarray(aggregated.get("hist_counts", []))
+    shared = len({(c.hist_range, c.bins) for c in clients}) == 1 and clients[0].hist_range is not None
+    if shared:
+        want = np.histogram(values, bins=clients[0].bins, range=clients[0].hist_range)[0]
+        if not np.array_equal(counts, want):
+            problems.append(f"hist_counts: off by up to {int(np.abs(counts - want).max())} in a bin")
+    elif counts.sum() != values.size:
+        problems.append(f"hist_counts: total {int(counts.sum())}, expected {values.size}")
+
+    ranked = np.sort(values)
+    for key, q in (("median", 0.5), ("p99", 0.99)):
+        if key in aggregated:
+            rank = np.searchsorted(ranked, aggregated[key]) / values.size
+            if abs(rank - q) > 0.01:
+                problems.append(f"{key}: {aggregated[key]!r} is at rank {rank:.4f}, expected {q}")
+    return problems
+
+
+'''
+Batched, in-process summaries (no client processes, no faults):
+
+    load_partitions() → all partitions' columns in one contiguous array plus
+    offsets, so per-partition statistics are segment reductions.
+
+    batch_summaries() → the same Summary objects the clients would send
+    (n, s, s2, centered moments, histograms, optional sketch), for every
+    partition in a handful of NumPy calls; merge_summaries() accepts them.
+
+    BatchEngine.run_round() → that as a drop-in RoundResult: the fast path
+    when faults are not the point of the run.
+
+    check_aggregate() → ground truth for the coordinators: compares an
+    aggregate against the exact statistics of the pooled data.
+'''
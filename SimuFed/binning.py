@@ -0,0 +1,61 @@
+from __future__ import annotations
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import replace
+from typing import List, Tuple
+import math
+import os
+
+from SimuFed.client import ClientConfig
+from SimuFed.utils.ingest import column_range
+
+
+def _client_range(cfg: ClientConfig) -> Tuple[float, float]:
+    return column_range(cfg.csv_path, cfg.column, cfg.chunk_rows or 1_000_000)
+
+
+def negotiate_range(clients: List[ClientConfig], max_workers: int | None = None) -> Tuple[float, float]:
+    """
+    Cheap first pass: every partition reports only its min/max; returns their union.
+
+    Partitions shared by several clients are scanned once. Scans run on a
+    process pool (CSV parsing holds the GIL); max_workers=1 runs them inline.
+    """
+    partitions = {}
+    for c in clients:
+        partitions.setdefault((c.csv_path, c.column), c)
+    todo = list(partitions.values())
+    workers = min(max_workers or os.cpu_count() or 1, len(todo))
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            ranges = list(pool.map(_client_range, todo))
+    else:
+        ranges = [_client_range(c) for c in todo]
+    lo = min((r[0] for r in ranges), default=math.inf)
+    hi = max((r[1] for r in ranges), default=-math.inf)
+    if lo > hi:
+        raise ValueError("no client has any rows; cannot negotiate a histogram range")
+    return lo, hi
+
+
+def with_grid(clients: List[ClientConfig], hist_range: Tuple[float, float], bins: int | None = None) -> List[ClientConfig]:
+    """Copies of the ClientConfigs that all bin onto one global grid."""
+    return [replace(c, hist_range=hist_range, bins=bins or c.bins) for c in clients]
+
+
+'''
+Global histogram binning.
+
+With hist_range=None every client bins over its own min/max, so client
+histograms have different edges. Two ways to give them one grid:
+
+    configured → with_grid(clients, (lo, hi)): a fixed range set up front;
+    values outside it are not counted.
+
+    negotiated → with_grid(clients, negotiate_range(clients)): one pass in
+    which clients report only min/max, before the round.
+
+On a shared grid the coordinator adds histograms bin by bin and the result is
+exact. Summaries that arrive on other edges are still rebinned onto the
+aggregate's grid (see rebin() in utils/aggregator.py), which assumes counts
+are spread evenly within each client bin.
+'''
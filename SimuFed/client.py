@@ -1,67 +1,259 @@
 from __future__ import annotations
-from dataclasses import dataclass, field
-import pandas as pd
+from dataclasses import dataclass, field, replace
+from typing import List, Tuple
 import numpy as np
-from multiprocessing import Queue
-from SimuFed.utils.aggregator import Summary, make_hist
-from SimuFed.fault_simulator import FaultConfig, maybe_delay_and_drop
+import random
+import time
+from multiprocessing.connection import Connection
+from SimuFed.utils.aggregator import Moments, Summary, central_moments, make_hist
+from SimuFed.utils.columns import ColumnStats, load_columns, resolve_columns, stream_column_stats
+from SimuFed.utils.groups import GroupStats, load_keyed, stream_group_stats
+from SimuFed.utils.ingest import PartitionTail, is_binary, map_column, stream_stats
+from SimuFed.utils.sketch import TDigest
+from SimuFed.transport import QueueTransport, SharedMemoryTransport
+from SimuFed.fault_simulator import FaultConfig, fault_rng, maybe_delay_and_drop
 
 @dataclass
 class ClientConfig:
     """Configuration for a federated client process."""
     client_id: int
-    csv_path: str
+    csv_path: str  # partition file: .csv, or .npy for the memory-mapped binary format
     column: str = "value"
     bins: int = 10
     hist_range: tuple[float, float] | None = None
     faults: FaultConfig = field(default_factory=FaultConfig)
+    chunk_rows: int | None = None  # stream the CSV in chunks of this many rows instead of loading it whole
+    ingest_threads: int = 1        # threads reducing chunks in parallel (streaming only)
+    partition_id: int | None = None  # shared by replica/backup clients of one partition; None = client_id
+    sketch_compression: float | None = None  # also send a TDigest quantile sketch of this compression
+    columns: List[str] | str | None = None  # several columns (a list, or a pattern like "feat_*"); see Summary.columns
+    covariance: bool = False  # with columns: also send their co-moment matrix (covariance / correlation)
+    group_by: str | None = None  # key column: also send per-key n / sum / sum of squares (see Summary.groups)
+    group_hist: bool = False     # with group_by: per-key histograms too, on the partition's histogram grid
 
-def worker(cfg: ClientConfig, out_q: Queue):
-    """
-    Run by each simulated client process.
-    Computes local statistics and sends them to the coordinator.
-    """
-    # Step 1: Load the local dataset
+    @property
+    def partition_key(self) -> int:
+        return self.client_id if self.partition_id is None else self.partition_id
+
+def load_partition(cfg: ClientConfig) -> np.ndarray:
+    """Load the client's local column as a float array (memory-mapped for .npy partitions); rows × columns with cfg.columns."""
+    if cfg.columns:
+        return load_columns(cfg.csv_path, resolve_columns(cfg.csv_path, cfg.columns))
+    if is_binary(cfg.csv_path):
+        return map_column(cfg.csv_path, cfg.column)
+    import pandas as pd  # CSV only: .npy clients never pay for the pandas import
     df = pd.read_csv(cfg.csv_path)
-    x = df[cfg.column].to_numpy(dtype=float)
+    return df[cfg.column].to_numpy(dtype=float)
+
+def load_grouped(cfg: ClientConfig) -> Tuple[np.ndarray, np.ndarray]:
+    """The client's column and its cfg.group_by keys, read together."""
+    if cfg.columns:
+        raise ValueError("group_by summarizes one column; it cannot be combined with columns")
+    return load_keyed(cfg.csv_path, cfg.column, cfg.group_by)
 
-    # Step 2: Compute local statistics
+def summarize(cfg: ClientConfig, x: np.ndarray, round_id: int = 0, keys: np.ndarray | None = None) -> Summary:
+    """
+    Compute the local statistics the coordinator needs from a loaded partition.
+
+    With cfg.group_by, `keys` are the rows' group keys (read from the partition if not given).
+    """
+    if cfg.group_by:
+        if keys is None:
+            x, keys = load_grouped(cfg)
+        summary = summarize(replace(cfg, group_by=None), x, round_id)
+        summary.groups = GroupStats.from_arrays(x, keys, summary.hist_edges if cfg.group_hist else None)
+        return summary
+    if x.ndim == 2:
+        names = resolve_columns(cfg.csv_path, cfg.columns)
+        stats = ColumnStats.from_array(x, names, cfg.bins, cfg.hist_range, cfg.covariance)
+        sketch = TDigest.from_array(x[:, 0], cfg.sketch_compression) if cfg.sketch_compression else None
+        return _package_columns(cfg, stats, round_id, sketch)
     n = int(x.size)
     s = float(np.sum(x))
-    s2 = float(np.sum(x * x))
+    s2 = float(np.dot(x, x))  # sum(x^2) without an x * x temporary
     counts, edges = make_hist(x, bins=cfg.bins, range_=cfg.hist_range)
+    sketch = TDigest.from_array(x, cfg.sketch_compression) if cfg.sketch_compression else None
+    return _package(cfg, n, s, s2, counts, edges, round_id, sketch, central_moments(x))
 
-    # Step 3: Possibly delay or drop
-    should_drop = maybe_delay_and_drop(cfg.faults)
-    if should_drop:
-        # client drops out this round
-        print(f"[Client {cfg.client_id}] Dropped update.")
-        return
+def summarize_stream(cfg: ClientConfig, round_id: int = 0) -> Summary:
+    """Compute the local statistics chunk by chunk, never holding the whole partition."""
+    sketch = TDigest(cfg.sketch_compression) if cfg.sketch_compression else None
+    if cfg.group_by:
+        if cfg.columns:
+            raise ValueError("group_by summarizes one column; it cannot be combined with columns")
+        # a second pass for the keys: the per-key histograms need the grid of the first
+        summary = summarize_stream(replace(cfg, group_by=None), round_id)
+        summary.groups = stream_group_stats(cfg.csv_path, cfg.column, cfg.group_by, cfg.chunk_rows,
+                                            np.asarray(summary.hist_edges) if cfg.group_hist else None)
+        return summary
+    if cfg.columns:
+        names = resolve_columns(cfg.csv_path, cfg.columns)
+        stats = stream_column_stats(cfg.csv_path, names, cfg.chunk_rows, cfg.bins, cfg.hist_range,
+                                    cfg.covariance, sketch)
+        return _package_columns(cfg, stats, round_id, sketch)
+    n, s, s2, counts, edges, central = stream_stats(
+        cfg.csv_path,
+        cfg.column,
+        cfg.chunk_rows,
+        bins=cfg.bins,
+        range_=cfg.hist_range,
+        threads=cfg.ingest_threads,
+        sketch=sketch,
+    )
+    return _package(cfg, n, s, s2, counts, edges, round_id, sketch, central)
 
-    # Step 4: Package and send results to Coordinator
-    summary = Summary(
+def local_summary(cfg: ClientConfig, x: np.ndarray | Tuple[np.ndarray, np.ndarray] | None = None,
+                  round_id: int = 0) -> Summary:
+    """Summarize what keep_in_memory() returned, or stream the partition from disk when `x` is None."""
+    if x is None:
+        return summarize_stream(cfg, round_id=round_id)
+    if cfg.group_by:
+        x, keys = x
+        return summarize(cfg, x, round_id=round_id, keys=keys)
+    return summarize(cfg, x, round_id=round_id)
+
+def keep_in_memory(cfg: ClientConfig) -> np.ndarray | Tuple[np.ndarray, np.ndarray] | None:
+    """Array a long-lived client keeps across rounds ((values, keys) with group_by); streaming clients keep nothing."""
+    if cfg.chunk_rows:
+        return None
+    return load_grouped(cfg) if cfg.group_by else load_partition(cfg)
+
+def _package(cfg: ClientConfig, n: int, s: float, s2: float, counts: np.ndarray, edges: np.ndarray, round_id: int,
+             sketch: TDigest | None = None, central: Moments | None = None) -> Summary:
+    _, _, m2, m3, m4 = central if central is not None else (None,) * 5
+    return Summary(
         client_id=cfg.client_id,
         n=n,
         s=s,
         s2=s2,
-        hist_counts=counts.tolist(),
-        hist_edges=edges.tolist(),
+        hist_counts=counts,
+        hist_edges=edges,
+        round_id=round_id,
+        partition_id=cfg.partition_key,
+        sketch=sketch,
+        m2=m2,
+        m3=m3,
+        m4=m4,
     )
-    out_q.put(summary)
-    print(f"[Client {cfg.client_id}] Sent summary (n={n}).")
+
+def _package_columns(cfg: ClientConfig, stats: ColumnStats, round_id: int, sketch: TDigest | None) -> Summary:
+    # The scalar fields describe the first column, so single-column consumers keep working
+    n, mean, m2 = stats.n, float(stats.mean[0]), float(stats.m2[0])
+    summary = _package(cfg, n, mean * n, m2 + n * mean * mean, stats.hist_counts[0], stats.hist_edges[0], round_id,
+                       sketch, (n, mean, m2, float(stats.m3[0]), float(stats.m4[0])))
+    summary.columns = stats
+    return summary
+
+def deliver(cfg: ClientConfig, summary: Summary, out: QueueTransport | SharedMemoryTransport, rng: random.Random | None = None) -> None:
+    """Apply the simulated faults, then send the summary unless the client drops."""
+    should_drop = maybe_delay_and_drop(cfg.faults, rng)
+    summary.marks["delayed"] = time.time()
+    if should_drop:
+        # client drops out this round
+        print(f"[Client {cfg.client_id}] Dropped update.")
+        return
+    # Encoded bytes on a queue, or written in place on a shared-memory board (see transport.py)
+    out.publish(summary, grid=cfg.hist_range)
+    print(f"[Client {cfg.client_id}] Sent summary (n={summary.n}).")
+
+def worker(cfg: ClientConfig, out: QueueTransport | SharedMemoryTransport):
+    """
+    Run by each simulated client process.
+    Computes local statistics and sends them to the coordinator.
+    """
+    # Step 1 + 2: Load the local dataset and compute local statistics
+    # (streamed in chunks when cfg.chunk_rows is set: load and compute interleave)
+    marks = {"start": time.time()}
+    if cfg.chunk_rows:
+        marks["loaded"] = marks["start"]
+        summary = summarize_stream(cfg)
+    else:
+        x, keys = load_grouped(cfg) if cfg.group_by else (load_partition(cfg), None)
+        marks["loaded"] = time.time()
+        summary = summarize(cfg, x, keys=keys)
+    marks["computed"] = time.time()
+    summary.marks = marks
+
+    # Step 3 + 4: Possibly delay or drop, otherwise send to Coordinator
+    deliver(cfg, summary, out, fault_rng(cfg.faults, cfg.client_id))
+
+def pool_worker(cfg: ClientConfig, commands: Connection, out: QueueTransport | SharedMemoryTransport):
+    """
+    Run by each long-lived client process of a ClientPool.
+    Loads the partition once, then answers one round command at a time.
+    """
+    x = keep_in_memory(cfg)
+    rng = fault_rng(cfg.faults, cfg.client_id)
+    commands.send(("ready", cfg.client_id))
+    while True:
+        try:
+            cmd, round_id = commands.recv()
+        except EOFError:
+            break  # pool owner went away
+        if cmd == "stop":
+            break
+        started = time.time()  # data is already loaded: load phase is empty
+        summary = local_summary(cfg, x, round_id=round_id)
+        summary.marks = {"start": started, "loaded": started, "computed": time.time()}
+        deliver(cfg, summary, out, rng)
+
+def stream_worker(cfg: ClientConfig, out: QueueTransport, epoch: float, interval_s: float, stop) -> None:
+    """
+    Run by each client process of a continuous (StreamCoordinator) session.
+
+    At every tick boundary epoch + k * interval_s, reads only the rows appended
+    to the partition since the previous read and publishes their delta
+    Summary, tagged with the tick (round_id = k); ticks with no new rows send
+    nothing. Returns once `stop` (an Event) is set.
+    """
+    tail = PartitionTail(cfg.csv_path, cfg.column)
+    tick = 0
+    while True:
+        wait = epoch + tick * interval_s - time.time()
+        if stop.wait(max(wait, 0.0)):
+            break
+        started = time.time()
+        tick = int((started - epoch) // interval_s)  # a slow read skips the boundaries it missed
+        x = tail.read()
+        if x.size:
+            summary = summarize(cfg, x, round_id=tick)
+            summary.marks = {"start": started, "loaded": started, "computed": time.time()}
+            out.publish(summary, grid=cfg.hist_range)
+        tick += 1
 
 '''
 ClientConfig → defines all per-client settings (path to CSV, histogram bins, fault config).
 
 worker() → function executed in a separate process:
 
-    Reads CSV into a Pandas DataFrame.
+    Reads CSV into a Pandas DataFrame (or memory-maps a .npy partition).
+
+    Converts the target column into a NumPy array for fast math
+    (several columns → one rows × columns array, reduced in one vectorized pass).
 
-    Converts the target column into a NumPy array for fast math.
+    Computes stats (mean/var indirectly, via sums), plus a TDigest quantile
+    sketch when cfg.sketch_compression is set, and per-key stats over the
+    cfg.group_by column (Summary.groups) when that is set.
 
-    Computes stats (mean/var indirectly, via sums).
+    With chunk_rows set, reads the CSV in bounded chunks instead (see utils/ingest.py),
+    so peak memory does not grow with partition size.
 
     Runs the fault simulation.
 
-    Pushes a Summary object into a Queue.
-'''
\ No newline at end of file
+    Stamps Summary.marks (start, loaded, computed, delayed) for the round timeline.
+
+    Publishes the Summary on the result transport (encoded bytes on a Queue by default).
+
+pool_worker() → same steps, but the process stays alive across rounds:
+
+    The array is loaded once and kept in memory; ("ready", client_id) is sent back once loaded.
+    Streaming clients (chunk_rows set) keep nothing and re-stream each round.
+
+    Each ("round", round_id) command on the pipe produces one tagged Summary.
+
+    ("stop", None) ends the process.
+
+stream_worker() → continuous mode for append-only partitions: once per tick it
+reads just the newly appended rows (PartitionTail) and sends their delta
+Summary tagged with the tick, until the coordinator sets the stop event.
+'''
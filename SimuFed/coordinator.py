@@ -1,10 +1,19 @@
 from __future__ import annotations
-from dataclasses import dataclass
-from multiprocessing import Process, Queue
-from typing import List
+from dataclasses import dataclass, field
+from multiprocessing import Process
+from queue import Empty
+from typing import Dict, List
 import time
 
 from SimuFed.client import ClientConfig, worker
+from SimuFed.pool import ClientPool
+from SimuFed.scheduler import ClientScheduler, ClientTiming
+from SimuFed.speculation import BackupPolicy, BackupTracker
+from SimuFed.startup import make_context, prepare
+from SimuFed.stopping import StoppingPolicy
+from SimuFed.timeline import Timeline
+from SimuFed.virtual_clock import VirtualClientPool
+from SimuFed.transport import make_transport
 from SimuFed.utils.aggregator import Summary, merge_summaries
 
 @dataclass
@@ -14,56 +23,192 @@ class RoundResult:
     aggregated: dict
     dropped: int
     duration_s: float
+    timings: List[ClientTiming] = field(default_factory=list)  # set when clients are scheduled
+    timeline: Timeline | None = None  # per-client, per-phase breakdown of the round
+    stopped_by: str = ""  # "all", "timeout", "exited", or the stopping policy that fired
+    backups_launched: int = 0  # extra clients started by the backup policy
+    backups_won: int = 0       # partitions whose accepted result came from a backup
+    pending: int = 0  # unheard when a stopping policy ended the round (not counted in dropped)
 
 class Coordinator:
     """Central orchestrator managing clients and aggregation."""
-    def __init__(self, timeout_s: float = 5.0):
+    def __init__(
+        self,
+        timeout_s: float = 5.0,
+        virtual_clock: bool = False,
+        transport: str = "queue",
+        max_concurrent: int | None = None,
+        admission: str = "fifo",
+        admission_seed: int | None = None,
+        result_buffer: int = 0,
+        stopping: StoppingPolicy | None = None,
+        backups: BackupPolicy | None = None,
+        start_method: str | None = None,
+    ):
         self.timeout_s = timeout_s
-
-    def run_round(self, clients: List[ClientConfig]) -> RoundResult:
-        """Runs one synchronous round of federated aggregation."""
-        q: Queue = Queue()
+        # Discrete-event mode: delays and the timeout are virtual, nothing sleeps
+        self.virtual_clock = virtual_clock
+        # Result channel: "queue" (multiprocessing.Queue) or "shm" (shared-memory board)
+        self.transport = transport
+        # Admission control: at most max_concurrent client processes alive at once,
+        # admitted in `admission` order (admission_seed seeds "random");
+        # result_buffer > 0 bounds the result queue
+        self.max_concurrent = max_concurrent
+        self.admission = admission
+        self.admission_seed = admission_seed
+        self.result_buffer = result_buffer
+        # Early termination: end the round as soon as the policy is met
+        self.stopping = stopping
+        # Speculative copies of partitions (replicas / hedged backups); first result wins
+        self.backups = backups
+        # How client processes start: "fork", "spawn", "forkserver" (preloaded), None = default
+        self.start_method = start_method
+        self.ctx = make_context(start_method)
+
+    def run_round(self, clients: List[ClientConfig], pool: ClientPool | VirtualClientPool | None = None) -> RoundResult:
+        """
+        Runs one synchronous round of federated aggregation.
+
+        If a started ClientPool is given, the round is dispatched to its
+        long-lived workers instead of spawning a process per client;
+        `clients` must be the configs the pool was created with.
+        """
         procs: List[Process] = []
-
-        start_time = time.time()
-
-        # Step 1: Launch all client processes
-        for cfg in clients:
-            p = Process(target=worker, args=(cfg, q), daemon=True)
-            p.start()
-            procs.append(p)
-
-        # Step 2: Collect results with timeout
+        if pool is None and self.virtual_clock:
+            pool = VirtualClientPool(clients).start()
+        now = pool.clock.time if isinstance(pool, VirtualClientPool) else time.time
+
+        start_time = now()
+
+        # Step 1: Launch all client processes (or wake up the pool)
+        sched: ClientScheduler | None = None
+        timeline = Timeline(origin=start_time)
+        launched: Dict[int, float] = {}
+        launch_phase = "spawn" if pool is None else "dispatch"
+
+        tracker: BackupTracker | None = None
+        if self.backups is not None:
+            if self.max_concurrent or isinstance(pool, ClientPool):
+                raise ValueError("backup clients need per-round client processes or the virtual clock")
+
+            def launch_backup(cfg: ClientConfig) -> None:
+                launched[cfg.client_id] = now()
+                if isinstance(pool, VirtualClientPool):
+                    pool.launch(cfg)
+                else:
+                    p = self.ctx.Process(target=worker, args=(cfg, out), daemon=True)
+                    p.start()
+                    procs.append(p)
+
+            tracker = BackupTracker(self.backups, clients, launch_backup, now)
+
+        if pool is None:
+            # The transport is sized for every client that could report, backups included
+            everyone = clients + tracker.all_configs if tracker is not None else clients
+            prepare(self.ctx, everyone)
+            out = make_transport(self.transport, everyone, maxsize=self.result_buffer, ctx=self.ctx)
+            q = out
+            round_id = 0
+            if self.max_concurrent:
+                sched = ClientScheduler(clients, worker, out, self.max_concurrent, self.admission,
+                                        seed=self.admission_seed, ctx=self.ctx).start()
+                q = sched  # receive through the scheduler so finished clients free their slot
+                procs = sched.procs
+                launched = sched.launched  # filled in as clients are admitted
+            else:
+                for cfg in clients:
+                    p = self.ctx.Process(target=worker, args=(cfg, out), daemon=True)
+                    launched[cfg.client_id] = now()
+                    p.start()
+                    procs.append(p)
+        else:
+            q = pool.results
+            round_id = pool.start_round()
+            launched = {cfg.client_id: start_time for cfg in clients}
+        if tracker is not None:
+            tracker.start()
+        timeline.add(None, "launch", start_time, now())
+
+        # Step 2: Collect results with timeout (one result per partition with backups)
         received: List[Summary] = []
-        expected = len(clients)
+        expected = len(tracker.partitions) if tracker is not None else len(clients)
         remaining = expected
         deadline = start_time + self.timeout_s
-
-        while time.time() < deadline and remaining > 0:
+        stopped_by = "timeout"
+        pending = 0
+        if self.stopping is not None:
+            self.stopping.start(expected)
+
+        while remaining > 0:
+            wake_at = deadline
+            if tracker is not None:
+                tracker.launch_due()
+                due = tracker.next_due()
+                if due is not None:
+                    wake_at = min(wake_at, due)
+            if deadline - now() <= 0:
+                break
             try:
-                s = q.get(timeout=0.1)
-                received.append(s)
-                remaining -= 1
-            except Exception:
-                pass  # no message yet — keep polling
+                # Block until the next result or exactly the deadline, no polling
+                s = q.get(timeout=max(wake_at - now(), 0.0))
+            except Empty:
+                if sched is not None and sched.finished:
+                    stopped_by = "exited"  # every client is gone; nothing else can arrive
+                    break
+                if wake_at < deadline:
+                    continue  # time to launch a backup
+                break  # deadline reached
+            if s.round_id != round_id:
+                continue  # late answer from an earlier pooled round
+            if tracker is not None and not tracker.accept(s):
+                continue  # another copy of this partition already answered
+            received.append(s)
+            timeline.add_client(s, launched.get(s.client_id), now(), launch_phase)
+            remaining -= 1
+            fired = self.stopping.update(s) if self.stopping is not None and remaining else None
+            if fired:
+                stopped_by = fired
+                pending = remaining  # still in flight; they may yet have answered
+                break
+        if remaining == 0 and stopped_by == "timeout":
+            stopped_by = "all"
+
+        # Step 3: Aggregate results
+        dropped = expected - len(received) - pending
+        merge_start = now()
+        aggregated = merge_summaries(received)
+        duration = now() - start_time
+        timeline.add(None, "merge", merge_start, start_time + duration)
 
-        # Step 3: Ensure all processes end gracefully
+        # Step 4: Ensure all processes end gracefully (not counted in the
+        # round duration: joining sleeping stragglers says nothing about clients)
         for p in procs:
             p.join(timeout=0.1)
-
-        # Step 4: Aggregate results
-        dropped = expected - len(received)
-        aggregated = merge_summaries(received)
-        duration = time.time() - start_time
+        if pool is None:
+            out.close()
 
         # Step 5: Return results
         return RoundResult(
             summaries=received,
             aggregated=aggregated,
             dropped=dropped,
-            duration_s=duration
+            duration_s=duration,
+            timings=sched.timings() if sched is not None else [],
+            timeline=timeline,
+            stopped_by=stopped_by,
+            backups_launched=tracker.launched if tracker is not None else 0,
+            backups_won=tracker.won if tracker is not None else 0,
+            pending=pending,
         )
 
+    def run_rounds(self, clients: List[ClientConfig], n_rounds: int) -> List[RoundResult]:
+        """Runs `n_rounds` rounds against one ClientPool (or VirtualClientPool) session."""
+        if self.backups is not None and not self.virtual_clock:
+            # Backups are launched as fresh processes mid-round; a fixed pool cannot host them
+            return [self.run_round(clients) for _ in range(n_rounds)]
+        with (VirtualClientPool(clients) if self.virtual_clock else ClientPool(clients, self.transport, self.start_method)) as pool:
+            return [self.run_round(clients, pool=pool) for _ in range(n_rounds)]
+
 '''
 Coordinator.run_round():
 
@@ -75,4 +220,34 @@ Coordinator.run_round():
 
     Returns a structured RoundResult with everything you need (summaries, global stats, dropped count, duration).
 
+Coordinator.run_rounds():
+
+    Opens a ClientPool once and runs several rounds on the same client processes.
+
+Coordinator(max_concurrent=k):
+
+    Clients are admitted k at a time through a ClientScheduler; RoundResult.timings
+    separates each client's queueing delay from its run time.
+
+Coordinator(stopping=policy):
+
+    The round also ends as soon as a StoppingPolicy (quorum, CI width on the
+    mean, or a combination) is met; RoundResult.stopped_by names the rule.
+
+Coordinator(backups=BackupPolicy(...)):
+
+    Replica clients start with the round and/or a hedge backup starts for a
+    partition that stays quiet past a latency percentile; the first result
+    per partition id is kept, later copies are discarded.
+
+RoundResult.timeline:
+
+    Spawn/load/compute/delay/send spans per received client plus the
+    coordinator's launch and merge; timeline.write_chrome_trace() exports it.
+
+Coordinator(virtual_clock=True):
+
+    Same loop, but clients run on a VirtualClientPool and time comes from its
+    VirtualClock, so delays and the timeout cost no wall time.
+
 '''
\ No newline at end of file
@@ -0,0 +1,234 @@
+# SimuFed/coordinator_aio.py
+
+from __future__ import annotations
+
+import asyncio
+import functools
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import replace
+from typing import Dict, List, Tuple
+
+from SimuFed.client import ClientConfig, keep_in_memory, local_summary
+from SimuFed.coordinator_async import AsyncRoundResult
+from SimuFed.fault_simulator import fault_rng, sample_fault
+from SimuFed.stopping import StoppingPolicy
+from SimuFed.utils.aggregator import RunningAggregate, Summary
+
+
+def summarize_partition(cfg: ClientConfig) -> Summary:
+    """CPU part of a client: load + local statistics. Runs in the executor."""
+    return local_summary(cfg, keep_in_memory(cfg))
+
+
+class AioCoordinator:
+    """
+    Asynchronous coordinator with in-process clients on one event loop.
+
+    No OS process per client:
+    - load + statistics run in an executor (threads by default; NumPy
+      releases the GIL, or processes with executor="process"),
+    - the simulated network delay is an event-loop timer,
+    - the summary goes onto an asyncio.Queue when the timer fires.
+
+    The stopping rules are the same as AsyncCoordinator (all clients,
+    overall timeout, or grace after the last update) and so is the result
+    type. Clients that share a partition file compute it once per round, which
+    is what makes 100k-client rounds over a few partitions cheap.
+    """
+
+    def __init__(
+        self,
+        timeout_s: float,
+        grace_after_last: float = 1.0,
+        max_workers: int | None = None,
+        executor: str = "thread",
+        verbose: bool = True,
+        stopping: StoppingPolicy | None = None,
+    ) -> None:
+        self.timeout_s = timeout_s
+        self.grace_after_last = grace_after_last
+        self.max_workers = max_workers
+        self.executor = executor
+        self.verbose = verbose
+        self.stopping = stopping
+
+    def _make_executor(self) -> Executor:
+        if self.executor == "process":
+            return ProcessPoolExecutor(max_workers=self.max_workers)
+        if self.executor == "thread":
+            return ThreadPoolExecutor(max_workers=self.max_workers)
+        raise ValueError(f"unknown executor {self.executor!r}; expected 'thread' or 'process'")
+
+    def run_round(self, clients: List[ClientConfig]) -> AsyncRoundResult:
+        """Run one round on a fresh event loop."""
+        return asyncio.run(self.run_round_async(clients))
+
+    async def run_round_async(self, clients: List[ClientConfig]) -> AsyncRoundResult:
+        """Coroutine version of run_round, for callers that already run an event loop."""
+        loop = asyncio.get_running_loop()
+        expected = len(clients)
+        # (arrival time, client id, summary): deadlines are judged on when a
+        # client answered, not on when a busy event loop got around to reading it
+        # (None summary: a partition job failed, see `failed`)
+        out: asyncio.Queue[Tuple[float, int, Summary | None]] = asyncio.Queue()
+        executor = self._make_executor()
+
+        # Fault draws come from each client's own seeded stream, exactly as
+        # in the process coordinators; drawing them up front keeps the event
+        # loop free for deliveries once the round is running.
+        faults = [sample_fault(cfg.faults, fault_rng(cfg.faults, cfg.client_id)) for cfg in clients]
+
+        start = loop.time()
+        # One executor job per distinct partition/statistics request; the
+        # clients sharing it are scheduled when it completes.
+        jobs: Dict[Tuple, List[int]] = {}
+        for i, cfg in enumerate(clients):
+            columns = tuple(cfg.columns) if isinstance(cfg.columns, list) else cfg.columns
+            key = (cfg.csv_path, cfg.column, cfg.bins, cfg.hist_range, cfg.chunk_rows, cfg.sketch_compression,
+                   columns, cfg.covariance, cfg.group_by, cfg.group_hist)
+            jobs.setdefault(key, []).append(i)
+        timers: List[asyncio.TimerHandle] = []
+        failed: List[BaseException] = []
+
+        def deliver(arrived: float, cfg: ClientConfig, summary: Summary) -> None:
+            out.put_nowait((arrived, cfg.client_id, summary))
+            if self.verbose:
+                print(f"[Client {cfg.client_id}] Sent summary (n={summary.n}).")
+
+        def schedule(members: List[int], fut: "asyncio.Future[Summary]") -> None:
+            if fut.cancelled():
+                return
+            if fut.exception() is not None:
+                # wake the round; run_round_async re-raises once it has cleaned up
+                failed.append(fut.exception())
+                out.put_nowait((loop.time(), -1, None))
+                return
+            summary = fut.result()
+            done = loop.time()
+            for i in members:
+                cfg = clients[i]
+                delay, should_drop = faults[i]
+                if should_drop:
+                    if self.verbose:
+                        print(f"[Client {cfg.client_id}] Dropped update.")
+                    continue
+                # the job ran for members[0]; each member sends its own copy
+                own = replace(summary, client_id=cfg.client_id, partition_id=cfg.partition_key, marks=dict(summary.marks))
+                timers.append(loop.call_later(delay, deliver, done + delay, cfg, own))
+
+        futures = []
+        for key, members in jobs.items():
+            fut = loop.run_in_executor(executor, summarize_partition, clients[members[0]])
+            fut.add_done_callback(functools.partial(schedule, members))
+            futures.append(fut)
+
+        received = 0
+        agg = RunningAggregate()
+        last_recv_time: float | None = None
+        pending = 0
+        if self.stopping is not None:
+            self.stopping.start(expected)
+
+        if self.verbose:
+            print(f"[Aio] Starting round with {expected} clients, "
+                  f"timeout={self.timeout_s}s, grace={self.grace_after_last}s")
+
+        while True:
+            if out.empty():
+                now = loop.time()
+                if now - start >= self.timeout_s:
+                    if self.verbose:
+                        print("[Aio] Overall timeout reached.")
+                    stopped_by = "timeout"
+                    break
+                if last_recv_time is not None and (now - last_recv_time) >= self.grace_after_last:
+                    if self.verbose:
+                        print("[Aio] Grace period after last update elapsed.")
+                    stopped_by = "grace"
+                    break
+
+                wake_at = start + self.timeout_s
+                if last_recv_time is not None:
+                    wake_at = min(wake_at, last_recv_time + self.grace_after_last)
+                try:
+                    arrived, _, summary = await asyncio.wait_for(out.get(), timeout=max(wake_at - now, 0.0))
+                except asyncio.TimeoutError:
+                    continue
+            else:
+                arrived, _, summary = out.get_nowait()
+
+            if summary is None:
+                stopped_by = "error"
+                break
+            if arrived - start >= self.timeout_s:
+                if self.verbose:
+                    print("[Aio] Overall timeout reached.")
+                stopped_by = "timeout"
+                break
+            if last_recv_time is not None and (arrived - last_recv_time) >= self.grace_after_last:
+                if self.verbose:
+                    print("[Aio] Grace period after last update elapsed.")
+                stopped_by = "grace"
+                break
+
+            received += 1
+            last_recv_time = arrived
+            agg.add(summary)
+            if self.verbose:
+                print(f"[Aio] Update {received}/{expected} → "
+                      f"global mean={agg.mean:.4f}, var={agg.var:.4f}")
+
+            if received == expected:
+                if self.verbose:
+                    print("[Aio] All clients responded.")
+                stopped_by = "all"
+                break
+
+            fired = self.stopping.update(summary) if self.stopping is not None else None
+            if fired:
+                if self.verbose:
+                    print(f"[Aio] Stopping policy met: {fired}.")
+                stopped_by = fired
+                pending = expected - received  # still in flight; they may yet have answered
+                break
+
+        duration = loop.time() - start
+
+        for timer in timers:
+            timer.cancel()
+        for fut in futures:
+            fut.cancel()
+        executor.shutdown(wait=False, cancel_futures=True)
+        if failed:
+            raise failed[0]
+
+        dropped = expected - received - pending
+        final_agg = agg.snapshot() if received else {}
+        if self.verbose:
+            print("\n=== Aio Round Complete ===")
+            print(f"Received: {received} / Dropped: {dropped}" + (f" / Pending: {pending}" if pending else ""))
+            print(f"Duration: {duration:.3f}s")
+
+        return AsyncRoundResult(
+            received=received,
+            dropped=dropped,
+            duration_s=duration,
+            aggregated=final_agg,
+            stopped_by=stopped_by,
+            pending=pending,
+        )
+
+'''
+AioCoordinator.run_round():
+
+    Fault draws (delay, drop) per client, from the same seeded streams as the
+    process clients, so a given seed drops the same clients.
+
+    One executor job per distinct partition; when it finishes, every client
+    sharing it gets a loop.call_later(delay) that queues its own copy of the
+    summary (client_id, partition_id and marks are per client). A job that
+    raises ends the round and the exception propagates from run_round().
+
+    Arrivals carry their scheduled time, and the timeout/grace checks use it,
+    so 100k timers firing together do not make the round look late.
+'''
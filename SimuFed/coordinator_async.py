@@ -2,13 +2,21 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass
-from multiprocessing import Process, Queue
-from typing import List
+from dataclasses import dataclass, field
+from multiprocessing import Process
+from queue import Empty
+from typing import Dict, List
 import time
 
 from SimuFed.client import ClientConfig, worker as client_worker
-from SimuFed.utils.aggregator import merge_summaries
+from SimuFed.pool import ClientPool
+from SimuFed.scheduler import ClientScheduler, ClientTiming
+from SimuFed.startup import make_context, prepare
+from SimuFed.stopping import StoppingPolicy
+from SimuFed.timeline import Timeline
+from SimuFed.virtual_clock import VirtualClientPool
+from SimuFed.transport import QueueTransport, SharedMemoryTransport, make_transport
+from SimuFed.utils.aggregator import RunningAggregate
 
 
 @dataclass
@@ -18,6 +26,10 @@ class AsyncRoundResult:
     dropped: int
     duration_s: float
     aggregated: dict
+    timings: List[ClientTiming] = field(default_factory=list)  # set when clients are scheduled
+    timeline: Timeline | None = None  # per-client, per-phase breakdown of the round
+    stopped_by: str = ""  # "all", "timeout", "grace", "exited", or the stopping policy that fired
+    pending: int = 0  # unheard when a stopping policy ended the round (not counted in dropped)
 
 
 class AsyncCoordinator:
@@ -32,79 +44,163 @@ class AsyncCoordinator:
         * a short 'grace' period has elapsed since the last update.
     """
 
-    def __init__(self, timeout_s: float, grace_after_last: float = 1.0) -> None:
+    def __init__(self, timeout_s: float, grace_after_last: float = 1.0, virtual_clock: bool = False,
+                 transport: str = "queue", max_concurrent: int | None = None,
+                 admission: str = "fifo", admission_seed: int | None = None, result_buffer: int = 0,
+                 stopping: StoppingPolicy | None = None, start_method: str | None = None) -> None:
         self.timeout_s = timeout_s
         self.grace_after_last = grace_after_last
-
-    def _start_clients(self, clients: List[ClientConfig], out_q: Queue) -> List[Process]:
+        # Discrete-event mode: delays, timeout and grace are virtual, nothing sleeps
+        self.virtual_clock = virtual_clock
+        # Result channel: "queue" (multiprocessing.Queue) or "shm" (shared-memory board)
+        self.transport = transport
+        # Admission control: at most max_concurrent client processes alive at once,
+        # admitted in `admission` order (admission_seed seeds "random");
+        # result_buffer > 0 bounds the result queue
+        self.max_concurrent = max_concurrent
+        self.admission = admission
+        self.admission_seed = admission_seed
+        self.result_buffer = result_buffer
+        # Early termination: end the round as soon as the policy is met
+        self.stopping = stopping
+        # How client processes start: "fork", "spawn", "forkserver" (preloaded), None = default
+        self.start_method = start_method
+        self.ctx = make_context(start_method)
+
+    def _start_clients(self, clients: List[ClientConfig],
+                       out: QueueTransport | SharedMemoryTransport,
+                       launched: Dict[int, float]) -> List[Process]:
         procs: List[Process] = []
         for cfg in clients:
-            p = Process(target=client_worker, args=(cfg, out_q), daemon=True)
+            p = self.ctx.Process(target=client_worker, args=(cfg, out), daemon=True)
+            launched[cfg.client_id] = time.time()
             p.start()
             procs.append(p)
         return procs
 
-    def run_round(self, clients: List[ClientConfig]) -> AsyncRoundResult:
+    def run_round(self, clients: List[ClientConfig],
+                  pool: ClientPool | VirtualClientPool | None = None) -> AsyncRoundResult:
         """
         Fire off all clients, then keep consuming summaries as they arrive.
 
         This is 'async' in the sense that we don't wait for a fixed barrier
         before aggregating — the aggregate is updated on every arrival.
+
+        With a started ClientPool the round reuses its long-lived workers.
         """
         expected = len(clients)
-        queue: Queue = Queue()
-        procs = self._start_clients(clients, queue)
+        if pool is None and self.virtual_clock:
+            pool = VirtualClientPool(clients).start()
+        now = pool.clock.time if isinstance(pool, VirtualClientPool) else time.time
+        sched: ClientScheduler | None = None
+        # The timeline starts before the launch; `start` (timeout, grace, duration) after it
+        timeline = Timeline(origin=now())
+        launched: Dict[int, float] = {}
+        launch_phase = "spawn" if pool is None else "dispatch"
+        if pool is None:
+            prepare(self.ctx, clients)
+            out = make_transport(self.transport, clients, maxsize=self.result_buffer, ctx=self.ctx)
+            queue = out
+            round_id = 0
+            if self.max_concurrent:
+                sched = ClientScheduler(clients, client_worker, out, self.max_concurrent, self.admission,
+                                        seed=self.admission_seed, ctx=self.ctx).start()
+                queue = sched  # receive through the scheduler so finished clients free their slot
+                procs = sched.procs
+                launched = sched.launched  # filled in as clients are admitted
+            else:
+                procs = self._start_clients(clients, out, launched)
+        else:
+            queue = pool.results
+            round_id = pool.start_round()
+            procs = []
+            launched = {cfg.client_id: timeline.origin for cfg in clients}
 
-        start = time.time()
+        start = now()
+        timeline.add(None, "launch", timeline.origin, start)
         received = []
+        agg = RunningAggregate()
         last_recv_time: float | None = None
+        pending = 0
+        if self.stopping is not None:
+            self.stopping.start(expected)
 
         print(f"[Async] Starting round with {expected} clients, "
               f"timeout={self.timeout_s}s, grace={self.grace_after_last}s")
 
+        # Deadlines are compared as absolute times, exactly as they are waited for:
+        # on the virtual clock, t_now - last_recv_time can stay one ulp short of
+        # the grace period after the clock has jumped to last_recv_time + grace
+        timeout_at = start + self.timeout_s
         while True:
-            now = time.time()
+            t_now = now()
             # Hard overall timeout
-            if now - start >= self.timeout_s:
+            if t_now >= timeout_at:
                 print("[Async] Overall timeout reached.")
+                stopped_by = "timeout"
                 break
 
             # If we have at least one update, stop after 'grace_after_last' seconds
             # with no new updates.
-            if last_recv_time is not None and (now - last_recv_time) >= self.grace_after_last:
+            if last_recv_time is not None and t_now >= last_recv_time + self.grace_after_last:
                 print("[Async] Grace period after last update elapsed.")
+                stopped_by = "grace"
                 break
 
-            # Try to get one new summary, with a short polling timeout
+            # Block until the next summary or the nearest deadline (overall timeout
+            # or end of grace), whichever comes first.
+            wake_at = timeout_at
+            if last_recv_time is not None:
+                wake_at = min(wake_at, last_recv_time + self.grace_after_last)
             try:
-                summary = queue.get(timeout=0.2)
-            except Exception:
-                # Nothing arrived in this 0.2s window; loop back to check timeouts.
+                summary = queue.get(timeout=max(wake_at - t_now, 0.0))
+            except Empty:
+                if sched is not None and sched.finished:
+                    print("[Async] Every client has exited.")
+                    stopped_by = "exited"
+                    break
+                # A deadline has passed; loop back so the checks above report which one.
                 continue
 
+            if summary.round_id != round_id:
+                continue  # late answer from an earlier pooled round
+
             received.append(summary)
-            last_recv_time = time.time()
+            last_recv_time = now()
+            timeline.add_client(summary, launched.get(summary.client_id), last_recv_time, launch_phase)
 
-            agg = merge_summaries(received)
+            # O(bins) fold-in instead of re-merging everything received so far
+            agg.add(summary)
+            timeline.add(None, "merge", last_recv_time, now())
             print(f"[Async] Update {len(received)}/{expected} → "
-                  f"global mean={agg['mean']:.4f}, var={agg['var']:.4f}")
+                  f"global mean={agg.mean:.4f}, var={agg.var:.4f}")
 
             # If everyone has checked in, we can stop early
             if len(received) == expected:
                 print("[Async] All clients responded.")
+                stopped_by = "all"
+                break
+
+            fired = self.stopping.update(summary) if self.stopping is not None else None
+            if fired:
+                print(f"[Async] Stopping policy met: {fired}.")
+                stopped_by = fired
+                pending = expected - len(received)  # still in flight; they may yet have answered
                 break
 
-        duration = time.time() - start
+        duration = now() - start
 
         # Best-effort join; clients may have exited already
         for p in procs:
             p.join(timeout=0.1)
+        if pool is None:
+            out.close()
 
-        dropped = expected - len(received)
-        final_agg = merge_summaries(received) if received else {}
+        dropped = expected - len(received) - pending
+        final_agg = agg.snapshot() if received else {}
 
         print("\n=== Async Round Complete ===")
-        print(f"Received: {len(received)} / Dropped: {dropped}")
+        print(f"Received: {len(received)} / Dropped: {dropped}" + (f" / Pending: {pending}" if pending else ""))
         print(f"Duration: {duration:.3f}s")
         if final_agg:
             print(
@@ -119,5 +215,13 @@ class AsyncCoordinator:
             dropped=dropped,
             duration_s=duration,
             aggregated=final_agg,
+            timings=sched.timings() if sched is not None else [],
+            timeline=timeline,
+            stopped_by=stopped_by,
+            pending=pending,
         )
 
+    def run_rounds(self, clients: List[ClientConfig], n_rounds: int) -> List[AsyncRoundResult]:
+        """Run `n_rounds` rounds against one ClientPool (or VirtualClientPool) session."""
+        with (VirtualClientPool(clients) if self.virtual_clock else ClientPool(clients, self.transport, self.start_method)) as pool:
+            return [self.run_round(clients, pool=pool) for _ in range(n_rounds)]
@@ -0,0 +1,208 @@
+from __future__ import annotations
+from dataclasses import dataclass, field
+from multiprocessing import Process
+from queue import Empty
+from typing import Dict, List
+import math
+import time
+
+from SimuFed.client import ClientConfig, stream_worker
+from SimuFed.startup import make_context, prepare
+from SimuFed.transport import QueueTransport
+from SimuFed.utils.aggregator import RunningAggregate, Summary, grid_edges
+
+
+@dataclass
+class TickResult:
+    """State of a continuous session when one tick closed."""
+    tick: int
+    deltas: int        # delta summaries received during the tick
+    rows: int          # rows they covered
+    late: int          # of those, deltas for ticks already out of the window (cumulative only)
+    fold_s: float      # time spent folding deltas in and expiring the old bucket
+    cumulative: dict   # everything received so far (scalar snapshot)
+    window: dict       # the last `window` ticks, histogram included
+
+
+@dataclass
+class StreamResult:
+    """Result of a continuous session."""
+    ticks: List[TickResult]
+    cumulative: dict
+    window: dict
+    duration_s: float
+    deltas: int = 0
+    late: int = 0
+    rebuilds: int = 0  # times the window was recomputed from its buckets
+    clients: Dict[int, int] = field(default_factory=dict)  # rows received per client
+
+
+class StreamCoordinator:
+    """
+    Continuous aggregation over append-only partitions.
+
+    Clients stay alive for the whole session and, once per tick, send a delta
+    Summary of only the rows appended since their last read (see
+    client.stream_worker). The coordinator keeps two aggregates:
+
+        cumulative → every delta ever received (RunningAggregate.add)
+        window     → the deltas of the last `window` ticks; one bucket per
+                     tick, and when a tick leaves the window its bucket is
+                     subtracted (RunningAggregate.subtract)
+
+    Both cost O(bins) per delta, whatever the total data size. Subtraction
+    drifts slowly, so every `rebuild_every` expirations the window is
+    recomputed from its buckets (O(window * bins), amortized O(bins)).
+    Clients must share one histogram grid (hist_range, bins), so bucket
+    counts subtract exactly; values appended outside it are not binned.
+    """
+
+    def __init__(self, interval_s: float = 1.0, window: int = 10, rebuild_every: int | None = None,
+                 start_method: str | None = None, verbose: bool = True) -> None:
+        self.interval_s = interval_s
+        self.window = window
+        self.rebuild_every = rebuild_every or window
+        # How client processes start: "fork", "spawn", "forkserver" (preloaded), None = default
+        self.start_method = start_method
+        self.ctx = make_context(start_method)
+        self.verbose = verbose
+
+    def run(self, clients: List[ClientConfig], duration_s: float) -> StreamResult:
+        """Run a session of ceil(duration_s / interval_s) ticks; tick 0 reads what the partitions already hold."""
+        grid = self._grid(clients)
+        n_ticks = max(1, math.ceil(duration_s / self.interval_s))
+        prepare(self.ctx, clients)
+        out = QueueTransport(ctx=self.ctx)
+        stop = self.ctx.Event()
+        # Clients measure ticks from this epoch; one that starts late reads its first tick late
+        epoch = time.time()
+        procs: List[Process] = []
+        for cfg in clients:
+            p = self.ctx.Process(target=stream_worker, args=(cfg, out, epoch, self.interval_s, stop), daemon=True)
+            p.start()
+            procs.append(p)
+
+        self._cumulative = RunningAggregate(edges=grid)
+        self._win = RunningAggregate(edges=grid)
+        self._buckets: Dict[int, RunningAggregate] = {}
+        self._current = 0  # tick being filled; the window holds ticks > current - window
+        self._expired = 0  # buckets subtracted so far
+        self._grid_edges = grid
+        result = StreamResult(ticks=[], cumulative={}, window={}, duration_s=0.0)
+        deltas = rows = late = 0
+        fold_s = 0.0
+
+        if self.verbose:
+            print(f"[Stream] {len(clients)} clients, {n_ticks} ticks of {self.interval_s}s, window={self.window} ticks")
+        while self._current < n_ticks:
+            wait = epoch + (self._current + 1) * self.interval_s - time.time()
+            if wait > 0:
+                try:
+                    summary = out.get(timeout=wait)
+                except Empty:
+                    continue
+                t0 = time.perf_counter()
+                late += not self._fold(summary, result)
+                fold_s += time.perf_counter() - t0
+                deltas += 1
+                rows += summary.n
+                continue
+            # tick closed: report, then move the window on by one tick
+            t0 = time.perf_counter()
+            tick = TickResult(self._current, deltas, rows, late, 0.0,
+                              self._cumulative.snapshot(with_hist=False), self._win.snapshot())
+            self._advance(result)
+            tick.fold_s = fold_s + time.perf_counter() - t0
+            result.ticks.append(tick)
+            if self.verbose:
+                self._report(tick)
+            deltas = rows = late = 0
+            fold_s = 0.0
+
+        stop.set()
+        for p in procs:
+            p.join(timeout=1.0)
+            if p.is_alive():
+                p.terminate()
+        # deltas read at the last boundary, sent before the clients saw the stop
+        while True:
+            try:
+                summary = out.get(timeout=0.05)
+            except Empty:
+                break
+            self._fold(summary, result)
+        out.close()
+
+        result.duration_s = time.time() - epoch
+        result.cumulative = self._cumulative.snapshot()
+        result.window = self._win.snapshot()
+        if self.verbose:
+            print(f"[Stream] Done: {result.deltas} deltas ({result.late} late), "
+                  f"n={result.cumulative['n']}, mean={result.cumulative['mean']:.4f}")
+        return result
+
+    def _grid(self, clients: List[ClientConfig]):
+        bad = [c.client_id for c in clients if c.sketch_compression or c.columns or c.group_by]
+        if bad:
+            raise ValueError(f"clients {bad}: sketches, columns and group_by cannot be subtracted from a window")
+        grids = {(c.hist_range, c.bins) for c in clients}
+        if len(grids) != 1 or None in (g[0] for g in grids):
+            raise ValueError("continuous sessions need one shared histogram grid: set hist_range (see binning.with_grid)")
+        (lo, hi), bins = grids.pop()
+        return grid_edges(lo, hi, bins)
+
+    def _fold(self, summary: Summary, result: StreamResult) -> bool:
+        """Add one delta; False if its tick has already left the window."""
+        result.deltas += 1
+        result.clients[summary.client_id] = result.clients.get(summary.client_id, 0) + summary.n
+        self._cumulative.add(summary)
+        if summary.round_id <= self._current - self.window:
+            result.late += 1
+            return False
+        bucket = self._buckets.get(summary.round_id)
+        if bucket is None:
+            bucket = self._buckets[summary.round_id] = RunningAggregate(edges=self._grid_edges)
+        bucket.add(summary)
+        self._win.add(summary)
+        return True
+
+    def _advance(self, result: StreamResult) -> None:
+        self._current += 1
+        expired = self._buckets.pop(self._current - self.window, None)
+        if expired is None:
+            return
+        self._win.subtract(expired)
+        self._expired += 1
+        if self._expired % self.rebuild_every == 0:
+            self._win = RunningAggregate(edges=self._grid_edges)
+            for bucket in self._buckets.values():
+                self._win.merge(bucket)
+            result.rebuilds += 1
+
+    def _report(self, tick: TickResult) -> None:
+        cum, win = tick.cumulative, tick.window
+        print(f"[Stream] Tick {tick.tick}: +{tick.deltas} deltas ({tick.rows} rows) → "
+              f"total n={cum['n']}, mean={cum['mean']:.4f} | "
+              f"window n={win['n']}, mean={win['mean']:.4f}, var={win['var']:.4f}")
+
+
+'''
+StreamCoordinator turns rounds into a session over growing data:
+
+    run(clients, duration_s) → starts one stream_worker per client; each
+    tracks its read offset (PartitionTail) and sends a delta Summary of the
+    newly appended rows at every tick boundary.
+
+    Deltas fold into the cumulative aggregate and into the bucket of their
+    tick; the window is the sum of the last `window` buckets. When a tick
+    closes, its window is reported (TickResult) and the oldest bucket is
+    subtracted, so per-update cost is O(bins) and independent of how much
+    data the partitions already hold.
+
+    A delta for a tick that already left the window (a very slow client)
+    only counts towards the cumulative aggregate.
+
+Deltas travel on a QueueTransport: the shared-memory board keeps one slot per
+client and would overwrite a delta not yet read. Faults are not simulated: a
+dropped delta would be lost for good, since the client's offset has moved on.
+'''
@@ -0,0 +1,233 @@
+from __future__ import annotations
+from dataclasses import dataclass
+from multiprocessing import Process
+from multiprocessing.context import BaseContext
+from queue import Empty
+from typing import Dict, List
+import time
+
+import numpy as np
+
+from SimuFed.client import ClientConfig, worker
+from SimuFed.coordinator import RoundResult
+from SimuFed.startup import make_context, prepare
+from SimuFed.transport import QueueTransport, SharedMemoryTransport, check_board, sketch_capacity
+from SimuFed.utils.aggregator import RunningAggregate, Summary
+
+
+@dataclass
+class TreeNode:
+    """An intermediate aggregator: merges the summaries of `children` into one partial."""
+    node_id: int          # negative, so it never collides with a client id
+    tier: int             # 0 = directly above the clients
+    children: List[int]   # client ids (tier 0) or node ids of the tier below
+
+
+def build_tree(client_ids: List[int], fan_in: int, depth: int | None = None) -> List[List[TreeNode]]:
+    """
+    Group clients into tiers of aggregator nodes with at most `fan_in` children each.
+
+    With depth=None, tiers are added until the root has at most `fan_in`
+    children. With an explicit depth, exactly that many tiers are built
+    (fewer if a tier already collapses to a single node).
+    """
+    if fan_in < 2:
+        raise ValueError("fan_in must be at least 2")
+    tiers: List[List[TreeNode]] = []
+    below = list(client_ids)
+    next_id = -1
+    while below and (len(below) > fan_in if depth is None else len(tiers) < depth and len(below) > 1):
+        tier = []
+        for k in range(0, len(below), fan_in):
+            tier.append(TreeNode(node_id=next_id, tier=len(tiers), children=below[k:k + fan_in]))
+            next_id -= 1
+        tiers.append(tier)
+        below = [node.node_id for node in tier]
+    return tiers
+
+
+def _new_transport(kind: str, child_ids: List[int], bins: int, sketch_cap: int = 0,
+                   ctx: BaseContext | None = None) -> QueueTransport | SharedMemoryTransport:
+    return QueueTransport(ctx=ctx) if kind == "queue" else SharedMemoryTransport(child_ids, bins, sketch_cap, ctx)
+
+
+def aggregator_node(
+    node: TreeNode,
+    inbound: QueueTransport | SharedMemoryTransport,
+    outbound: QueueTransport | SharedMemoryTransport,
+    deadline: float,
+    round_id: int = 0,
+) -> None:
+    """
+    Run by each intermediate aggregator process.
+
+    Merges whatever its children send until all of them reported or the tier
+    deadline passes, then forwards one partial summary upward. The partial is
+    sent even when empty, so the parent knows this subtree is finished.
+    """
+    agg = RunningAggregate()
+    members = 0
+    heard = 0
+    while heard < len(node.children):
+        wait_s = deadline - time.time()
+        if wait_s <= 0:
+            break
+        try:
+            s = inbound.get(timeout=wait_s)
+        except Empty:
+            break
+        if s.round_id != round_id:
+            continue
+        agg.add(s)
+        members += s.members
+        heard += 1
+
+    outbound.publish(Summary(
+        client_id=node.node_id,
+        n=agg.n,
+        s=agg.s,
+        s2=agg.s2,
+        hist_counts=agg.hist_counts if agg.hist_counts is not None else np.zeros(0, dtype=np.int64),
+        hist_edges=np.asarray(agg.hist_edges, dtype=float),
+        round_id=round_id,
+        members=members,
+        sketch=agg.sketch,
+        m2=agg.m2,
+        m3=agg.m3,
+        m4=agg.m4,
+        columns=agg.columns,
+        groups=agg.groups,
+    ))
+
+
+class TreeCoordinator:
+    """
+    Root of a hierarchical aggregation tree.
+
+    Clients report to tier-0 aggregator processes (groups of `fan_in`), which
+    forward one partial summary each to the tier above, and so on up to this
+    coordinator. Every tier has its own deadline measured from round start:
+
+        tier k deadline = start + sum(tier_timeouts[:k + 1])
+
+    where the last entry is the root's own budget. By default clients get the
+    full `timeout_s` and every tier above adds `tier_slack_s`. A `tier_timeouts`
+    list shorter than tiers + 1 sets the lowest tiers and is padded with
+    `tier_slack_s` for the rest; a longer one is an error.
+    """
+
+    def __init__(
+        self,
+        timeout_s: float = 5.0,
+        fan_in: int = 8,
+        depth: int | None = None,
+        tier_timeouts: List[float] | None = None,
+        tier_slack_s: float = 0.25,
+        transport: str = "queue",
+        start_method: str | None = None,
+    ) -> None:
+        self.timeout_s = timeout_s
+        self.fan_in = fan_in
+        self.depth = depth
+        self.tier_timeouts = tier_timeouts
+        self.tier_slack_s = tier_slack_s
+        self.transport = transport
+        self.start_method = start_method
+        self.ctx = make_context(start_method)
+
+    def _deadlines(self, start: float, n_tiers: int) -> List[float]:
+        budgets = list(self.tier_timeouts or [self.timeout_s])
+        if len(budgets) > n_tiers + 1:
+            raise ValueError(f"tier_timeouts has {len(budgets)} entries; this tree has {n_tiers} tiers plus the root")
+        budgets += [self.tier_slack_s] * (n_tiers + 1 - len(budgets))
+        return [start + b for b in np.cumsum(budgets).tolist()]
+
+    def run_round(self, clients: List[ClientConfig]) -> RoundResult:
+        """Runs one round through the aggregation tree."""
+        procs: List[Process] = []
+        bins = max((c.bins for c in clients), default=0)
+        sketch_cap = sketch_capacity(clients)
+        if self.transport == "shm":
+            check_board(clients)
+        tiers = build_tree([c.client_id for c in clients], self.fan_in, self.depth)
+        prepare(self.ctx, clients)
+
+        start_time = time.time()
+        deadlines = self._deadlines(start_time, len(tiers))
+
+        # Step 1: One inbound channel per aggregator node plus one for the root
+        top_ids = [n.node_id for n in tiers[-1]] if tiers else [c.client_id for c in clients]
+        root_in = _new_transport(self.transport, top_ids, bins, sketch_cap, self.ctx)
+        inbound: Dict[int, QueueTransport | SharedMemoryTransport] = {}
+        parent_of: Dict[int, int] = {}
+        for tier in tiers:
+            for node in tier:
+                inbound[node.node_id] = _new_transport(self.transport, node.children, bins, sketch_cap, self.ctx)
+                for child in node.children:
+                    parent_of[child] = node.node_id
+
+        def channel_above(child_id: int) -> QueueTransport | SharedMemoryTransport:
+            return inbound[parent_of[child_id]] if child_id in parent_of else root_in
+
+        # Step 2: Launch aggregators top-down, then clients
+        for tier in reversed(tiers):
+            for node in tier:
+                p = self.ctx.Process(
+                    target=aggregator_node,
+                    args=(node, inbound[node.node_id], channel_above(node.node_id), deadlines[node.tier]),
+                    daemon=True,
+                )
+                p.start()
+                procs.append(p)
+        for cfg in clients:
+            p = self.ctx.Process(target=worker, args=(cfg, channel_above(cfg.client_id)), daemon=True)
+            p.start()
+            procs.append(p)
+
+        # Step 3: Collect the top-level partials until all arrived or the root deadline
+        received: List[Summary] = []
+        agg = RunningAggregate()
+        remaining = len(top_ids)
+        while remaining > 0:
+            wait_s = deadlines[-1] - time.time()
+            if wait_s <= 0:
+                break
+            try:
+                s = root_in.get(timeout=wait_s)
+            except Empty:
+                break
+            received.append(s)
+            agg.add(s)
+            remaining -= 1
+
+        # Step 4: Aggregate; drops are counted in clients, not in partials
+        members = sum(s.members for s in received)
+        dropped = len(clients) - members
+        aggregated = agg.snapshot()
+        duration = time.time() - start_time
+
+        for p in procs:
+            p.join(timeout=0.1)
+        for ch in [root_in, *inbound.values()]:
+            ch.close()
+
+        return RoundResult(
+            summaries=received,
+            aggregated=aggregated,
+            dropped=dropped,
+            duration_s=duration,
+            stopped_by="all" if remaining == 0 and members == len(clients) else "timeout",
+        )
+
+'''
+TreeCoordinator.run_round():
+
+    build_tree() groups clients into tiers of aggregator nodes (fan_in children each).
+
+    Each node is a process with its own inbound channel; it merges its
+    children's summaries with a RunningAggregate until its tier deadline and
+    forwards one partial Summary whose `members` field counts the clients in it.
+
+    The root merges only the top-tier partials, so its receive/merge load is
+    fan_in messages instead of one per client. dropped = clients - sum(members).
+'''
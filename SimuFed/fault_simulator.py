@@ -8,17 +8,37 @@ class FaultConfig:
     """Configuration for simulating client delays and dropouts."""
     drop_prob: float = 0.0       # probability to drop an update
     max_delay_s: float = 0.0     # maximum artificial delay in seconds
+    seed: int | None = None      # per-client fault streams are seeded from (seed, client_id)
 
-def maybe_delay_and_drop(cfg: FaultConfig) -> bool:
+def fault_rng(cfg: FaultConfig, client_id: int) -> random.Random:
+    """
+    RNG for one client's fault draws.
+
+    With a seed, every client gets its own reproducible stream, so the same
+    clients drop with the same delays whether the round runs on real
+    processes or on the virtual clock.
+    """
+    if cfg.seed is None:
+        return random.Random()
+    return random.Random(f"{cfg.seed}:{client_id}")
+
+def sample_fault(cfg: FaultConfig, rng: random.Random | None = None) -> tuple[float, bool]:
+    """Draw (delay_s, should_drop) for one update without sleeping."""
+    rng = rng if rng is not None else random
+    delay = rng.uniform(0.0, cfg.max_delay_s) if cfg.max_delay_s > 0 else 0.0
+    return delay, rng.random() < cfg.drop_prob
+
+def maybe_delay_and_drop(cfg: FaultConfig, rng: random.Random | None = None) -> bool:
     """
     Simulates real-world client unreliability.
 
     Returns True if the client update should be dropped.
     May sleep for a random delay in [0, max_delay_s].
     """
-    if cfg.max_delay_s > 0:
-        time.sleep(random.uniform(0.0, cfg.max_delay_s))
-    return random.random() < cfg.drop_prob
+    delay, should_drop = sample_fault(cfg, rng)
+    if delay > 0:
+        time.sleep(delay)
+    return should_drop
 
 '''
 Example 'FaultConfig(drop_prob=0.2, max_delay_s=3.0)' meaning:
@@ -26,4 +46,8 @@ Example 'FaultConfig(drop_prob=0.2, max_delay_s=3.0)' meaning:
 20 % chance of dropping the message,
 
 otherwise, may sleep for up to 3 seconds.
-'''
\ No newline at end of file
+
+sample_fault() makes the same draws as maybe_delay_and_drop() (delay first,
+then the drop coin) but returns the delay instead of sleeping; the virtual
+clock mode schedules it as an event.
+'''
@@ -0,0 +1,96 @@
+from __future__ import annotations
+from multiprocessing import Process
+from multiprocessing.connection import Connection
+from typing import List
+
+from SimuFed.client import ClientConfig, pool_worker
+from SimuFed.startup import make_context, prepare
+from SimuFed.transport import make_transport
+
+
+class ClientPool:
+    """
+    Long-lived client processes reused across rounds.
+
+    Each client process is spawned once, loads its partition once and then
+    waits for round commands on its own pipe. Results from every round go to
+    a single result transport (queue or shared-memory board) and are tagged
+    with the round id, so a coordinator can discard late answers from a
+    previous round.
+
+    Use it as a session:
+
+        with ClientPool(clients) as pool:
+            for _ in range(3):
+                coord.run_round(clients, pool=pool)
+    """
+
+    def __init__(self, clients: List[ClientConfig], transport: str = "queue", start_method: str | None = None) -> None:
+        self.clients = list(clients)
+        self.ctx = make_context(start_method)
+        self.results = make_transport(transport, self.clients, ctx=self.ctx)
+        self.round_id = 0
+        self._conns: List[Connection] = []
+        self._procs: List[Process] = []
+
+    def start(self) -> "ClientPool":
+        """Spawn one worker process per client and wait until each has loaded its data."""
+        if self._procs:
+            return self
+        prepare(self.ctx, self.clients)
+        for cfg in self.clients:
+            parent_conn, child_conn = self.ctx.Pipe()
+            p = self.ctx.Process(target=pool_worker, args=(cfg, child_conn, self.results), daemon=True)
+            p.start()
+            child_conn.close()
+            self._conns.append(parent_conn)
+            self._procs.append(p)
+        # Startup cost stays out of round timings: block until every worker is ready
+        for conn in self._conns:
+            conn.recv()
+        return self
+
+    def start_round(self) -> int:
+        """Tell every client to run a new round; returns the round id."""
+        if not self._procs:
+            raise RuntimeError("ClientPool is not started")
+        self.round_id += 1
+        for conn in self._conns:
+            conn.send(("round", self.round_id))
+        return self.round_id
+
+    def close(self, timeout_s: float = 1.0) -> None:
+        """Stop all workers; stragglers still sleeping in a delay are terminated."""
+        for conn in self._conns:
+            try:
+                conn.send(("stop", None))
+            except (BrokenPipeError, OSError):
+                pass  # worker already gone
+        for p in self._procs:
+            p.join(timeout=timeout_s)
+            if p.is_alive():
+                p.terminate()
+        for conn in self._conns:
+            conn.close()
+        self._conns.clear()
+        self._procs.clear()
+        self.results.close()
+
+    def __enter__(self) -> "ClientPool":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+'''
+ClientPool turns the process-per-round model into a session:
+
+    start() → one process per client, each loads its CSV exactly once.
+
+    start_round() → sends ("round", id) to every worker; summaries come back on
+    pool.results tagged with that id.
+
+    close() → sends ("stop", None) and joins.
+
+Spawn + import + CSV parse is paid once per session instead of once per round.
+'''
@@ -0,0 +1,147 @@
+from __future__ import annotations
+from dataclasses import dataclass
+from multiprocessing import Process, get_context
+from multiprocessing.context import BaseContext
+from multiprocessing.connection import wait
+from queue import Empty
+from typing import Callable, Dict, List
+import os
+import random
+import time
+
+from SimuFed.client import ClientConfig
+from SimuFed.transport import QueueTransport, SharedMemoryTransport
+
+POLICIES = ("fifo", "random", "spf")
+
+
+@dataclass
+class ClientTiming:
+    """Where one client's time went in a scheduled round."""
+    client_id: int
+    queued_s: float | None  # round start → process launched (None: never admitted)
+    run_s: float | None     # launched → process exited (None: still running at round end)
+
+
+def admission_order(clients: List[ClientConfig], policy: str, seed: int | None = None) -> List[ClientConfig]:
+    """Order in which waiting clients are admitted."""
+    if policy == "fifo":
+        return list(clients)
+    if policy == "random":
+        order = list(clients)
+        random.Random(seed).shuffle(order)
+        return order
+    if policy == "spf":
+        # shortest partition first, by file size on disk
+        return sorted(clients, key=lambda c: os.path.getsize(c.csv_path))
+    raise ValueError(f"unknown admission policy {policy!r}; expected one of {POLICIES}")
+
+
+class ClientScheduler:
+    """
+    Runs client processes with at most `max_concurrent` alive at once.
+
+    Exposes the same get(timeout) call as a transport, so a coordinator's
+    collection loop can use it unchanged: while waiting for the next result it
+    also wakes on client process exits, reaps them and admits the next clients
+    in policy order. With a bounded result queue, clients block on publish
+    until the coordinator drains it, so the cap also throttles the channel.
+    """
+
+    def __init__(
+        self,
+        clients: List[ClientConfig],
+        target: Callable,
+        out: QueueTransport | SharedMemoryTransport,
+        max_concurrent: int,
+        policy: str = "fifo",
+        seed: int | None = None,
+        ctx: BaseContext | None = None,
+    ) -> None:
+        if max_concurrent < 1:
+            raise ValueError("max_concurrent must be at least 1")
+        self.out = out
+        self.target = target
+        self.ctx = ctx or get_context()
+        self.max_concurrent = max_concurrent
+        self._waiting = admission_order(clients, policy, seed)
+        self._waiting.reverse()  # pop() from the end = next in order
+        self._running: Dict[int, tuple[Process, ClientConfig]] = {}  # sentinel → (process, cfg)
+        self.procs: List[Process] = []
+        self._start = time.time()
+        self.launched: Dict[int, float] = {}  # client id → time its Process.start() was called
+        self._exited: Dict[int, float] = {}
+        self._all_ids = [c.client_id for c in clients]
+
+    def start(self) -> "ClientScheduler":
+        self._start = time.time()
+        self._admit()
+        return self
+
+    @property
+    def finished(self) -> bool:
+        """True once every client has been admitted and has exited."""
+        return not self._running and not self._waiting
+
+    def _admit(self) -> None:
+        while self._waiting and len(self._running) < self.max_concurrent:
+            cfg = self._waiting.pop()
+            p = self.ctx.Process(target=self.target, args=(cfg, self.out), daemon=True)
+            self.launched[cfg.client_id] = time.time()
+            p.start()
+            self._running[p.sentinel] = (p, cfg)
+            self.procs.append(p)
+
+    def _reap(self, sentinels) -> None:
+        for sentinel in sentinels:
+            entry = self._running.pop(sentinel, None)
+            if entry is not None:
+                entry[0].join()
+                self._exited[entry[1].client_id] = time.time()
+
+    def get(self, timeout: float | None = None):
+        deadline = None if timeout is None else time.time() + timeout
+        while True:
+            try:
+                return self.out.get(timeout=0)
+            except Empty:
+                pass
+            if self.finished:
+                # Everybody has exited and the transport is drained; nothing
+                # else can arrive, so don't sit out the deadline
+                raise Empty
+            wait_s = None if deadline is None else max(deadline - time.time(), 0.0)
+            handles = list(self._running)
+            if isinstance(self.out, QueueTransport):
+                handles.append(self.out.q._reader)  # wake on results too (bounded queue)
+            ready = wait(handles, timeout=wait_s)
+            if not ready:
+                raise Empty
+            self._reap([h for h in ready if h in self._running])
+            self._admit()
+
+    def timings(self) -> List[ClientTiming]:
+        out = []
+        for cid in self._all_ids:
+            launched = self.launched.get(cid)
+            exited = self._exited.get(cid)
+            out.append(ClientTiming(
+                client_id=cid,
+                queued_s=None if launched is None else launched - self._start,
+                run_s=None if launched is None or exited is None else exited - launched,
+            ))
+        return out
+
+'''
+ClientScheduler replaces "start every client at once":
+
+    admission_order() → fifo, random (seeded) or spf (shortest partition first).
+
+    get(timeout) → the coordinator's receive call; it also blocks on process
+    sentinels, so a finished client immediately frees a slot for the next one.
+    Once every client has exited and the transport is empty it raises Empty
+    at once; the coordinators check `finished` and end the round as "exited".
+
+    timings() → per-client queueing delay (waiting for a slot) and run time
+    (load + compute + simulated delay + send), kept apart on the round result.
+'''
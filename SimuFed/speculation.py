@@ -0,0 +1,140 @@
+from __future__ import annotations
+from dataclasses import dataclass, replace
+from typing import Callable, Dict, List, Set
+import math
+
+from SimuFed.client import ClientConfig
+from SimuFed.utils.aggregator import Summary
+
+
+@dataclass
+class BackupPolicy:
+    """
+    When to run extra copies of a partition.
+
+    replicas          → extra clients per partition, launched with the round
+    hedge_percentile  → launch one backup for every partition still missing once
+                        it has been quiet past this quantile (0–1) of the round's
+                        partition latencies, i.e. once that fraction has answered
+    hedge_after_s     → or: launch that backup after a fixed quiet time
+    min_samples       → answers needed before the quantile is trusted
+    """
+    replicas: int = 0
+    hedge_percentile: float | None = None
+    hedge_after_s: float | None = None
+    min_samples: int = 3
+
+    @property
+    def hedges(self) -> bool:
+        return self.hedge_percentile is not None or self.hedge_after_s is not None
+
+
+class BackupTracker:
+    """
+    Launches backup clients for one round and keeps the first result per partition.
+
+    Backups are copies of a partition's client with a fresh client id (so
+    they draw their own delay/dropout) and the partition id of the original.
+    `launch(cfg)` is how the coordinator starts a client: a process, or a
+    scheduled arrival on the virtual clock.
+    """
+
+    def __init__(
+        self,
+        policy: BackupPolicy,
+        clients: List[ClientConfig],
+        launch: Callable[[ClientConfig], None],
+        now: Callable[[], float],
+    ) -> None:
+        self.policy = policy
+        self.launch = launch
+        self.now = now
+        next_id = max((c.client_id for c in clients), default=0) + 1
+        self.partitions: List[int] = list(dict.fromkeys(c.partition_key for c in clients))
+        first = {}
+        for c in clients:
+            first.setdefault(c.partition_key, c)
+        # Every backup a round could need, created up front so transports can size for them
+        self.spares: Dict[int, List[ClientConfig]] = {}
+        n_spares = policy.replicas + (1 if policy.hedges else 0)
+        for key in self.partitions:
+            self.spares[key] = []
+            for _ in range(n_spares):
+                self.spares[key].append(replace(first[key], client_id=next_id, partition_id=key))
+                next_id += 1
+        self.backup_ids: Set[int] = {b.client_id for bs in self.spares.values() for b in bs}
+        self.started_at = 0.0
+        self.latencies: List[float] = []
+        self.done: Set[int] = set()
+        self.hedged: Set[int] = set()
+        self.launched = 0
+        self.won = 0
+
+    @property
+    def all_configs(self) -> List[ClientConfig]:
+        return [b for bs in self.spares.values() for b in bs]
+
+    def start(self) -> None:
+        """Call when the primaries have been launched: starts the replicas."""
+        self.started_at = self.now()
+        for key in self.partitions:
+            for cfg in self.spares[key][:self.policy.replicas]:
+                self._launch(cfg)
+
+    def _launch(self, cfg: ClientConfig) -> None:
+        self.launch(cfg)
+        self.launched += 1
+
+    def accept(self, summary: Summary) -> bool:
+        """True for the first result of a partition; duplicates are to be discarded."""
+        key = summary.partition_key
+        if key in self.done:
+            return False
+        self.done.add(key)
+        self.latencies.append(self.now() - self.started_at)
+        if summary.client_id in self.backup_ids:
+            self.won += 1
+        return True
+
+    def _quiet_limit(self) -> float | None:
+        if self.policy.hedge_after_s is not None:
+            return self.policy.hedge_after_s
+        if self.policy.hedge_percentile is None:
+            return None
+        # The p-quantile over *all* partitions is only known once a fraction p
+        # has answered; quantiles of the early answers alone would be too short.
+        k = max(math.ceil(self.policy.hedge_percentile * len(self.partitions)), self.policy.min_samples, 1)
+        if len(self.latencies) < k:
+            return None
+        return self.latencies[k - 1]  # answers arrive in latency order
+
+    def next_due(self) -> float | None:
+        """When the next hedge could fire; None if no backup is pending."""
+        limit = self._quiet_limit()
+        if limit is None or all(k in self.done or k in self.hedged for k in self.partitions):
+            return None
+        return self.started_at + limit
+
+    def launch_due(self) -> None:
+        """Launch the hedge backup of every partition that has been quiet too long."""
+        due = self.next_due()
+        if due is None or self.now() < due:
+            return
+        for key in self.partitions:
+            if key not in self.done and key not in self.hedged:
+                self.hedged.add(key)
+                self._launch(self.spares[key][-1])
+
+'''
+Speculative backups, first result per partition wins:
+
+    BackupPolicy(replicas=r) → r copies of every partition start with the round.
+
+    BackupPolicy(hedge_percentile=p) → once a fraction p of the partitions has
+    answered, every partition still silent gets one more copy
+    (hedge_after_s for a fixed quiet-time threshold instead).
+
+    The coordinator hands every summary to accept(); later copies of a
+    partition are dropped by partition id. `launched` and `won` go on the
+    RoundResult as backups_launched / backups_won: extra compute vs. benefit.
+'''
@@ -0,0 +1,76 @@
+from __future__ import annotations
+import importlib
+import multiprocessing as mp
+from multiprocessing.context import BaseContext
+from typing import List
+
+from SimuFed.utils.ingest import is_binary
+
+START_METHODS = ("fork", "spawn", "forkserver")
+
+# Imported once by the fork server; every client it forks starts with them loaded
+PRELOAD = ("SimuFed.client", "numpy")
+# Imported by clients only for CSV partitions
+CSV_IMPORTS = ("pandas",)
+
+
+def make_context(start_method: str | None = None) -> BaseContext:
+    """
+    Multiprocessing context that client processes, queues and semaphores are created from.
+
+    None keeps the interpreter's default start method. "forkserver" preloads
+    PRELOAD in the server (see prepare()), so a client costs a fork instead of an interpreter
+    start plus imports.
+    """
+    if start_method is None:
+        return mp.get_context()
+    if start_method not in START_METHODS:
+        raise ValueError(f"unknown start method {start_method!r}; expected one of {START_METHODS}")
+    ctx = mp.get_context(start_method)
+    if start_method == "forkserver":
+        # Only takes effect before the server's first use; there is one server per coordinator process
+        ctx.set_forkserver_preload(list(PRELOAD))
+    return ctx
+
+
+def client_imports(clients) -> List[str]:
+    """Modules these ClientConfigs' processes will import: PRELOAD, plus pandas if any partition is CSV."""
+    csv = any(not is_binary(c.csv_path) for c in clients)
+    return list(PRELOAD) + (list(CSV_IMPORTS) if csv else [])
+
+
+def prepare(ctx: BaseContext, clients) -> None:
+    """
+    Make the clients' imports free where the start method allows it, before launching them.
+
+    fork: import them here, children inherit them. forkserver: add them to the
+    server's preload (effective until the server has started). spawn: nothing to do.
+    """
+    modules = client_imports(clients)
+    method = ctx.get_start_method()
+    if method == "fork":
+        for name in modules:
+            importlib.import_module(name)
+    elif method == "forkserver":
+        ctx.set_forkserver_preload(modules)
+
+'''
+Start methods for client processes:
+
+    fork       → cheapest launch, child inherits the coordinator's memory
+                 (Linux default)
+
+    spawn      → fresh interpreter per client: pays interpreter start and
+                 every import (SimuFed.client, numpy; pandas for CSV) each time
+
+    forkserver → a server process imports PRELOAD once, then forks each
+                 client from it: spawn's clean state at close to fork's cost
+
+Queues and semaphores must come from the same context as the processes
+that use them, so coordinators pass the context to make_transport().
+
+The client path imports pandas only to read CSV, so .npy clients skip it.
+Coordinators call prepare() before launching: under fork the parent imports
+pandas once for CSV clients (as it always used to), and the fork server
+preloads it.
+'''
@@ -0,0 +1,165 @@
+from __future__ import annotations
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from statistics import NormalDist
+from typing import List
+import math
+
+from SimuFed.utils.aggregator import Summary, combine_moments
+
+CI_LEVELS = ("row", "client")
+
+
+class StoppingPolicy(ABC):
+    """
+    Ends a round early once enough has been heard.
+
+    A coordinator calls start(expected) when a round begins and update(summary)
+    for every summary it accepts; update() returns the name of the rule that is
+    now satisfied (reported as the result's `stopped_by`), or None to keep going.
+    """
+    name = "policy"
+
+    def start(self, expected: int) -> None:
+        self.expected = expected
+
+    @abstractmethod
+    def update(self, summary: Summary) -> str | None:
+        ...
+
+
+@dataclass
+class Quorum(StoppingPolicy):
+    """Stop after k clients answered (k counts clients, so tree partials count their members)."""
+    k: int
+    name: str = "quorum"
+
+    def start(self, expected: int) -> None:
+        super().start(expected)
+        self.heard = 0
+
+    def update(self, summary: Summary) -> str | None:
+        self.heard += summary.members
+        return self.name if self.heard >= min(self.k, self.expected) else None
+
+
+@dataclass
+class MeanPrecision(StoppingPolicy):
+    """
+    Stop once the confidence interval on the global mean is narrower than `width`.
+
+    level="row" treats the rows received so far as a sample: half-width is
+    z * sqrt(var / n) from the running n, sum and sum of squares.
+
+    level="client" treats each client's mean as one draw from the population
+    of partitions, which is the honest error when partitions differ (non-IID):
+    half-width is z * sqrt(s_m^2 / m * (1 - m / expected)) over the m client
+    means, with a finite-population correction so it closes as m → expected.
+    """
+    width: float
+    confidence: float = 0.95
+    level: str = "row"
+    min_clients: int = 2
+    name: str = "ci_width"
+
+    def __post_init__(self) -> None:
+        if self.level not in CI_LEVELS:
+            raise ValueError(f"unknown CI level {self.level!r}; expected one of {CI_LEVELS}")
+        self.z = NormalDist().inv_cdf(0.5 + self.confidence / 2)
+
+    def start(self, expected: int) -> None:
+        super().start(expected)
+        self.clients = 0
+        self.moments = (0, 0.0, 0.0, 0.0, 0.0)  # (n, mean, m2, m3, m4), pooled rows or client means
+
+    def update(self, summary: Summary) -> str | None:
+        if summary.n == 0:
+            return None
+        self.clients += summary.members
+        point = summary.moments() if self.level == "row" else (1, summary.mean, 0.0, 0.0, 0.0)
+        self.moments = combine_moments(self.moments, point)
+        if self.clients < self.min_clients:
+            return None
+        return self.name if self.ci_width() <= self.width else None
+
+    def ci_width(self) -> float:
+        """Current full width (2 × half-width) of the interval; inf until it can be estimated."""
+        n, _, m2, _, _ = self.moments
+        if n < 2:
+            return math.inf
+        se2 = m2 / (n - 1) / n
+        if self.level == "client":
+            se2 *= max(1.0 - self.clients / self.expected, 0.0)
+        return 2 * self.z * math.sqrt(se2)
+
+
+@dataclass
+class AnyOf(StoppingPolicy):
+    """Stop when any of the policies is met; reports the first one that fired."""
+    policies: List[StoppingPolicy] = field(default_factory=list)
+
+    def start(self, expected: int) -> None:
+        super().start(expected)
+        for p in self.policies:
+            p.start(expected)
+
+    def update(self, summary: Summary) -> str | None:
+        fired = [p.update(summary) for p in self.policies]  # every policy sees every summary
+        return next((f for f in fired if f), None)
+
+
+@dataclass
+class AllOf(StoppingPolicy):
+    """Stop only once every policy is met (each stays met once it fired)."""
+    policies: List[StoppingPolicy] = field(default_factory=list)
+
+    def start(self, expected: int) -> None:
+        super().start(expected)
+        self._met: List[str | None] = [None] * len(self.policies)
+        for p in self.policies:
+            p.start(expected)
+
+    def update(self, summary: Summary) -> str | None:
+        for i, p in enumerate(self.policies):
+            fired = p.update(summary)
+            self._met[i] = self._met[i] or fired
+        return "+".join(self._met) if all(self._met) else None
+
+
+def make_policy(
+    quorum: int | None = None,
+    ci_width: float | None = None,
+    confidence: float = 0.95,
+    ci_level: str = "row",
+    combine: str = "any",
+) -> StoppingPolicy | None:
+    """Builds the policy the demo flags describe; None when no rule is set."""
+    rules: List[StoppingPolicy] = []
+    if quorum is not None:
+        rules.append(Quorum(quorum))
+    if ci_width is not None:
+        rules.append(MeanPrecision(ci_width, confidence=confidence, level=ci_level))
+    if not rules:
+        return None
+    if len(rules) == 1:
+        return rules[0]
+    if combine == "any":
+        return AnyOf(rules)
+    if combine == "all":
+        return AllOf(rules)
+    raise ValueError(f"unknown combine mode {combine!r}; expected 'any' or 'all'")
+
+'''
+Stopping policies, checked on every accepted summary:
+
+    Quorum(k) → k-of-n clients answered.
+
+    MeanPrecision(width) → the CI on the global mean, estimated from running
+    moments, is narrower than `width` (row- or client-level).
+
+    AnyOf / AllOf → combinations; stopped_by names the rule(s) that fired.
+
+Without a policy, rounds end as before: all clients answered ("all"), the
+timeout passed ("timeout") or, for the async coordinator, the grace period
+after the last update elapsed ("grace").
+'''
@@ -0,0 +1,181 @@
+from __future__ import annotations
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from dataclasses import asdict, dataclass, fields
+from itertools import product
+from pathlib import Path
+from typing import Dict, Iterable, List
+import json
+import math
+import os
+
+from SimuFed.client import ClientConfig
+from SimuFed.coordinator import Coordinator
+from SimuFed.coordinator_async import AsyncCoordinator
+from SimuFed.fault_simulator import FaultConfig
+
+MODES = ("sync", "async")
+
+
+@dataclass(frozen=True)
+class SweepPoint:
+    """One configuration of a sweep; every field is part of its cache key."""
+    mode: str = "sync"
+    drop_prob: float = 0.0
+    clients: int = 5
+    timeout: float = 5.0
+    max_delay: float = 0.0
+    grace: float = 1.0  # async only
+    seed: int = 0
+    replicate: int = 0
+    virtual_clock: bool = False
+    data_dir: str = "datasets"
+    format: str = "csv"
+    transport: str = "queue"
+    bins: int = 10
+
+
+def point_key(point: SweepPoint) -> str:
+    """Stable cache key: the point's fields as sorted JSON."""
+    return json.dumps(asdict(point), sort_keys=True)
+
+
+def grid(replicates: int = 1, base_seed: int = 0, **axes) -> List[SweepPoint]:
+    """
+    Cartesian product of the given axes, `replicates` times over.
+
+    Each axis is a SweepPoint field name mapped to a list of values; fields not
+    given keep their defaults. Replicate r gets seed base_seed + r, so the same
+    grid always expands to the same points.
+    """
+    names = {f.name for f in fields(SweepPoint)}
+    unknown = set(axes) - names
+    if unknown:
+        raise ValueError(f"unknown sweep axes: {sorted(unknown)}")
+    keys = list(axes)
+    points = []
+    for values in product(*(axes[k] for k in keys)):
+        for r in range(replicates):
+            points.append(SweepPoint(**dict(zip(keys, values)), seed=base_seed + r, replicate=r))
+    return points
+
+
+def build_clients(point: SweepPoint) -> List[ClientConfig]:
+    faults = FaultConfig(drop_prob=point.drop_prob, max_delay_s=point.max_delay, seed=point.seed)
+    base = Path(point.data_dir)
+    return [
+        ClientConfig(client_id=cid, csv_path=str(base / f"partition_{cid}.{point.format}"),
+                     bins=point.bins, faults=faults)
+        for cid in range(1, point.clients + 1)
+    ]
+
+
+def run_point(point: SweepPoint) -> Dict:
+    """Runs one configuration in this process and returns its record."""
+    clients = build_clients(point)
+    if point.mode == "sync":
+        result = Coordinator(timeout_s=point.timeout, virtual_clock=point.virtual_clock,
+                             transport=point.transport).run_round(clients)
+        received = sum(s.members for s in result.summaries)
+    elif point.mode == "async":
+        result = AsyncCoordinator(timeout_s=point.timeout, grace_after_last=point.grace,
+                                  virtual_clock=point.virtual_clock,
+                                  transport=point.transport).run_round(clients)
+        received = result.received
+    else:
+        raise ValueError(f"unknown mode {point.mode!r}; expected one of {MODES}")
+
+    agg = result.aggregated or {}
+    return {
+        **asdict(point),
+        "clients_expected": point.clients,
+        "received": received,
+        "dropped": result.dropped,
+        "duration": result.duration_s,
+        "global_n": agg.get("n", 0),
+        "global_mean": agg.get("mean", math.nan),
+        "global_var": agg.get("var", math.nan),
+        "stopped_by": result.stopped_by,
+    }
+
+
+def load_cache(path: str | Path) -> Dict[str, Dict]:
+    """Completed records of earlier runs, by point key. A torn last line is ignored."""
+    done: Dict[str, Dict] = {}
+    path = Path(path)
+    if not path.exists():
+        return done
+    with path.open() as f:
+        for line in f:
+            try:
+                rec = json.loads(line)
+            except json.JSONDecodeError:
+                continue  # interrupted mid-write
+            done[rec["key"]] = rec["record"]
+    return done
+
+
+def _quiet_worker() -> None:
+    # Coordinators and their client processes print progress; keep it off the terminal
+    devnull = os.open(os.devnull, os.O_WRONLY)
+    os.dup2(devnull, 1)
+
+
+def run_sweep(
+    points: Iterable[SweepPoint],
+    cache_path: str | Path | None = None,
+    workers: int | None = None,
+    quiet: bool = True,
+) -> List[Dict]:
+    """
+    Runs every point not already in the cache on a process pool.
+
+    Each finished point is appended to the JSONL cache as soon as it completes,
+    so an interrupted sweep resumes where it stopped and a grown grid only runs
+    its new points. Returns the records in the order of `points`.
+    """
+    points = list(points)
+    done = load_cache(cache_path) if cache_path else {}
+    todo = list({point_key(p): p for p in points if point_key(p) not in done}.values())
+    print(f"[Sweep] {len(points)} points, {len(points) - len(todo)} cached, {len(todo)} to run")
+
+    if todo:
+        cache = open(cache_path, "a+") if cache_path else None
+        if cache and cache.tell():
+            cache.seek(cache.tell() - 1)
+            if cache.read(1) != "\n":
+                cache.write("\n")  # end a torn line so the next record starts clean
+        finished_count = len(points) - len(todo)
+        try:
+            with ProcessPoolExecutor(max_workers=workers, initializer=_quiet_worker if quiet else None) as ex:
+                pending = {ex.submit(run_point, p): p for p in todo}
+                while pending:
+                    finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for fut in finished:
+                        point = pending.pop(fut)
+                        key = point_key(point)
+                        done[key] = fut.result()
+                        if cache:
+                            cache.write(json.dumps({"key": key, "record": done[key]}) + "\n")
+                            cache.flush()
+                        finished_count += 1
+                        print(f"[Sweep] {finished_count}/{len(points)} {point.mode} "
+                              f"drop_prob={point.drop_prob} replicate={point.replicate}")
+        finally:
+            if cache:
+                cache.close()
+
+    return [done[point_key(p)] for p in points]
+
+'''
+run_sweep() instead of one subprocess per configuration:
+
+    grid(replicates, base_seed, axis=[values], ...) → frozen SweepPoints (seed = base_seed + replicate)
+
+    run_point(point) → builds the ClientConfigs and calls the coordinator in
+    process; the record is the point's fields plus received/dropped/duration
+    and the global n/mean/var, the same columns the STATS lines carried.
+
+    The cache is JSONL, one {"key", "record"} line per finished point, keyed
+    by the point's sorted JSON. Real-time runs share the machine when run in
+    parallel, so compare durations from sweeps with the same worker count.
+'''
@@ -0,0 +1,119 @@
+from __future__ import annotations
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, List
+import json
+
+from SimuFed.utils.aggregator import Summary
+
+
+@dataclass
+class Span:
+    """One phase of one participant, in seconds since the round started."""
+    client_id: int | None  # None = the coordinator itself
+    phase: str
+    start_s: float
+    end_s: float
+
+    @property
+    def duration_s(self) -> float:
+        return self.end_s - self.start_s
+
+
+@dataclass
+class Timeline:
+    """
+    Where a round's time went, per client and per phase.
+
+    Client phases come from the marks a worker stamps on its Summary
+    (start, loaded, computed, delayed) plus the coordinator's own launch and
+    receive times:
+
+        spawn | dispatch   launched → start     (process start, or pooled round command)
+        load               start → loaded
+        compute            loaded → computed
+        delay              computed → delayed   (simulated network delay)
+        send               delayed → received   (transport + coordinator wake-up)
+
+    Coordinator phases (client_id None) are launch and merge.
+    """
+    origin: float  # round start on the coordinator's clock
+    spans: List[Span] = field(default_factory=list)
+
+    def add(self, client_id: int | None, phase: str, start: float | None, end: float | None) -> None:
+        """Record a phase from absolute times; phases with a missing end point are skipped."""
+        if start is None or end is None:
+            return
+        self.spans.append(Span(client_id, phase, start - self.origin, max(end, start) - self.origin))
+
+    def add_client(
+        self,
+        summary: Summary,
+        launched: float | None,
+        received: float,
+        launch_phase: str = "spawn",
+    ) -> None:
+        m = summary.marks
+        cid = summary.client_id
+        self.add(cid, launch_phase, launched, m.get("start"))
+        self.add(cid, "load", m.get("start"), m.get("loaded"))
+        self.add(cid, "compute", m.get("loaded"), m.get("computed"))
+        self.add(cid, "delay", m.get("computed"), m.get("delayed"))
+        self.add(cid, "send", m.get("delayed"), received)
+
+    def for_client(self, client_id: int | None) -> List[Span]:
+        return [s for s in self.spans if s.client_id == client_id]
+
+    def phase_totals(self) -> Dict[str, float]:
+        """Seconds spent in each phase, summed over all clients."""
+        totals: Dict[str, float] = {}
+        for s in self.spans:
+            totals[s.phase] = totals.get(s.phase, 0.0) + s.duration_s
+        return totals
+
+    def to_chrome_trace(self, pid: int = 0, label: str | None = None) -> List[dict]:
+        """Trace events (complete "X" events, microseconds); one thread per client."""
+        events: List[dict] = []
+        if label is not None:
+            events.append({"name": "process_name", "ph": "M", "pid": pid, "args": {"name": label}})
+        tids = sorted({s.client_id for s in self.spans}, key=lambda c: -1 if c is None else c)
+        for tid in tids:
+            name = "coordinator" if tid is None else f"client {tid}"
+            events.append({"name": "thread_name", "ph": "M", "pid": pid, "tid": _tid(tid), "args": {"name": name}})
+        for s in self.spans:
+            events.append({
+                "name": s.phase,
+                "cat": "coordinator" if s.client_id is None else "client",
+                "ph": "X",
+                "pid": pid,
+                "tid": _tid(s.client_id),
+                "ts": s.start_s * 1e6,
+                "dur": s.duration_s * 1e6,
+            })
+        return events
+
+
+def _tid(client_id: int | None) -> int:
+    return 0 if client_id is None else client_id
+
+
+def write_chrome_trace(path: str | Path, timelines: Iterable[Timeline]) -> None:
+    """
+    Write one or more round timelines as Chrome trace-event JSON
+    (chrome://tracing, Perfetto). Each round becomes its own process row.
+    """
+    events: List[dict] = []
+    for k, tl in enumerate(timelines):
+        events.extend(tl.to_chrome_trace(pid=k + 1, label=f"round {k + 1}"))
+    Path(path).write_text(json.dumps({"traceEvents": events, "displayTimeUnit": "ms"}))
+
+'''
+Timeline → the per-phase breakdown behind RoundResult.duration_s.
+
+    Workers stamp Summary.marks (wall-clock, or virtual time in the
+    discrete-event mode); the marks travel with the summary on either
+    transport. The coordinator adds its own launch / receive / merge times.
+
+    write_chrome_trace() turns rounds into trace events: one row per client,
+    so stragglers and the fixed overheads (spawn, send) are easy to spot.
+'''
@@ -0,0 +1,251 @@
+from __future__ import annotations
+from collections import deque
+from multiprocessing import Queue, get_context
+from multiprocessing.context import BaseContext
+from multiprocessing.shared_memory import SharedMemory
+from queue import Empty
+from typing import Deque, Dict, List, Tuple
+import time
+
+import numpy as np
+
+from SimuFed.utils.aggregator import MARKS, Summary
+from SimuFed.utils.sketch import TDigest, max_centroids
+from SimuFed.utils.wire import decode_summary, encode_summary
+
+
+class QueueTransport:
+    """
+    Default result channel: encoded summaries over a multiprocessing.Queue.
+
+    Clients call publish(); the coordinator calls get(timeout), which blocks
+    until a summary arrives or the timeout passes (then raises queue.Empty).
+    """
+
+    def __init__(self, maxsize: int = 0, ctx: BaseContext | None = None) -> None:
+        # maxsize > 0 bounds the channel: publishers block until the coordinator drains it
+        self.q: Queue = (ctx or get_context()).Queue(maxsize)
+
+    def publish(self, summary: Summary, grid: Tuple[float, float] | None = None) -> None:
+        self.q.put(encode_summary(summary, grid=grid))
+
+    def get(self, timeout: float | None = None) -> Summary:
+        return decode_summary(self.q.get(timeout=timeout))
+
+    def close(self) -> None:
+        self.q.close()
+
+
+class SharedMemoryTransport:
+    """
+    Result board in shared memory: one preallocated slot per client.
+
+    Each slot holds n, s, s2, the phase marks, the histogram counts and edges,
+    plus a sequence word. A client writes its slot in place (seq = -1 while writing, then
+    round_id + 1) and releases a semaphore; the coordinator wakes on the
+    semaphore, scans the sequence words for fresh slots and copies the
+    statistics straight out of the buffer. No feeder thread, pipe or pickling.
+    """
+
+    def __init__(self, client_ids: List[int], bins: int, sketch_cap: int = 0, ctx: BaseContext | None = None) -> None:
+        self.slots: Dict[int, int] = {cid: i for i, cid in enumerate(client_ids)}
+        self.bins = bins
+        self.sketch_cap = sketch_cap  # max centroids per slot; 0 = no sketches on this board
+        self.sem = (ctx or get_context()).Semaphore(0)
+        n_slots = max(len(client_ids), 1)
+        self.shm = SharedMemory(create=True, size=self._nbytes(n_slots, bins, sketch_cap))
+        self._owner = True
+        self._attach(n_slots)
+        self.seq[:] = 0
+        self._seen = np.zeros(n_slots, dtype=np.int64)  # last seq consumed per slot
+        self._pending: Deque[int] = deque()
+
+    @staticmethod
+    def _nbytes(n_slots: int, bins: int, sketch_cap: int) -> int:
+        # seq, client_id, partition_id, round_id, members, n, nbins: int64; s, s2, m2, m3, m4: float64;
+        # marks; counts; edges; sketch: count (int64), compression/min/max, means, weights
+        return 8 * n_slots * (12 + len(MARKS) + bins + bins + 1 + 4 + 2 * sketch_cap)
+
+    def _attach(self, n_slots: int) -> None:
+        buf = self.shm.buf
+        off = 0
+
+        def take(dtype, shape):
+            nonlocal off
+            arr = np.ndarray(shape, dtype=dtype, buffer=buf, offset=off)
+            off += arr.nbytes
+            return arr
+
+        self.n_slots = n_slots
+        self.seq = take(np.int64, (n_slots,))
+        self.client_id = take(np.int64, (n_slots,))
+        self.partition_id = take(np.int64, (n_slots,))
+        self.round_id = take(np.int64, (n_slots,))
+        self.members = take(np.int64, (n_slots,))
+        self.n = take(np.int64, (n_slots,))
+        self.nbins = take(np.int64, (n_slots,))
+        self.s = take(np.float64, (n_slots,))
+        self.s2 = take(np.float64, (n_slots,))
+        self.central = take(np.float64, (n_slots, 3))  # m2, m3, m4; NaN if not computed
+        self.marks = take(np.float64, (n_slots, len(MARKS)))
+        self.counts = take(np.int64, (n_slots, self.bins))
+        self.edges = take(np.float64, (n_slots, self.bins + 1))
+        self.sk_count = take(np.int64, (n_slots,))
+        self.sk_params = take(np.float64, (n_slots, 3))  # compression, min, max
+        self.sk_means = take(np.float64, (n_slots, self.sketch_cap))
+        self.sk_weights = take(np.float64, (n_slots, self.sketch_cap))
+
+    # Client processes receive the board by pickling: re-attach by name.
+    def __getstate__(self):
+        return {"slots": self.slots, "bins": self.bins, "sketch_cap": self.sketch_cap, "sem": self.sem,
+                "name": self.shm.name, "n_slots": self.n_slots}
+
+    def __setstate__(self, state) -> None:
+        self.slots = state["slots"]
+        self.bins = state["bins"]
+        self.sketch_cap = state["sketch_cap"]
+        self.sem = state["sem"]
+        # Child processes share the creator's resource tracker, so attaching
+        # does not add a second owner; only the creator unlinks.
+        self.shm = SharedMemory(name=state["name"])
+        self._owner = False
+        self._attach(state["n_slots"])
+        # Reader state too: a tree aggregator consumes the board it was handed
+        self._seen = self.seq.copy()
+        self._pending = deque()
+
+    def publish(self, summary: Summary, grid: Tuple[float, float] | None = None) -> None:
+        slot = self.slots[summary.client_id]
+        counts = np.asarray(summary.hist_counts, dtype=np.int64)
+        edges = np.asarray(summary.hist_edges, dtype=np.float64)
+        if counts.size > self.bins:
+            raise ValueError(f"summary has {counts.size} bins, board was sized for {self.bins}")
+        if summary.columns is not None or summary.groups is not None:
+            raise ValueError("multi-column and group-by summaries do not fit the board; use the queue transport")
+        sk_means, sk_weights = summary.sketch.centroids() if summary.sketch is not None else (None, None)
+        if sk_means is not None and sk_means.size > self.sketch_cap:
+            raise ValueError(f"sketch has {sk_means.size} centroids, board was sized for {self.sketch_cap}")
+        self.seq[slot] = -1  # writing
+        self.client_id[slot] = summary.client_id
+        self.partition_id[slot] = summary.partition_id
+        self.round_id[slot] = summary.round_id
+        self.members[slot] = summary.members
+        self.n[slot] = summary.n
+        self.s[slot] = summary.s
+        self.s2[slot] = summary.s2
+        self.central[slot] = [np.nan if m is None else m for m in (summary.m2, summary.m3, summary.m4)]
+        self.marks[slot] = [summary.marks.get(k, np.nan) for k in MARKS]
+        self.nbins[slot] = counts.size
+        self.counts[slot, :counts.size] = counts
+        self.edges[slot, :edges.size] = edges
+        if sk_means is None:
+            self.sk_count[slot] = -1
+        else:
+            self.sk_count[slot] = sk_means.size
+            self.sk_params[slot] = (summary.sketch.compression, summary.sketch.min, summary.sketch.max)
+            self.sk_means[slot, :sk_means.size] = sk_means
+            self.sk_weights[slot, :sk_means.size] = sk_weights
+        self.seq[slot] = summary.round_id + 1  # publish
+        self.sem.release()
+
+    def _read(self, slot: int) -> Summary | None:
+        seq = int(self.seq[slot])
+        if seq <= 0:
+            return None  # being rewritten (-1); the writer will signal again when it is done
+        nb = int(self.nbins[slot])
+        nc = int(self.sk_count[slot])
+        m2, m3, m4 = (None if np.isnan(v) else float(v) for v in self.central[slot])
+        sketch = None
+        if nc >= 0:
+            compression, lo, hi = self.sk_params[slot]
+            sketch = TDigest.from_centroids(self.sk_means[slot, :nc].copy(), self.sk_weights[slot, :nc].copy(),
+                                            compression, lo, hi)
+        summary = Summary(
+            client_id=int(self.client_id[slot]),
+            n=int(self.n[slot]),
+            s=float(self.s[slot]),
+            s2=float(self.s2[slot]),
+            hist_counts=self.counts[slot, :nb].copy(),
+            hist_edges=self.edges[slot, :nb + 1 if nb else 0].copy(),
+            round_id=int(self.round_id[slot]),
+            members=int(self.members[slot]),
+            marks={k: float(v) for k, v in zip(MARKS, self.marks[slot]) if not np.isnan(v)},
+            partition_id=int(self.partition_id[slot]),
+            sketch=sketch,
+            m2=m2,
+            m3=m3,
+            m4=m4,
+        )
+        if int(self.seq[slot]) != seq:
+            return None  # rewritten while copying (seq went to -1 or on); the writer will signal again
+        self._seen[slot] = seq
+        return summary
+
+    def get(self, timeout: float | None = None) -> Summary:
+        deadline = None if timeout is None else time.time() + timeout
+        while True:
+            while self._pending:
+                summary = self._read(self._pending.popleft())
+                if summary is not None:
+                    return summary
+            fresh = np.flatnonzero((self.seq > 0) & (self.seq != self._seen))
+            if fresh.size:
+                self._pending.extend(fresh.tolist())
+                continue
+            wait_s = None if deadline is None else max(deadline - time.time(), 0.0)
+            if not self.sem.acquire(timeout=wait_s):
+                raise Empty
+
+    def close(self) -> None:
+        # Drop the NumPy views before closing the mapping
+        self.seq = self.client_id = self.partition_id = self.round_id = self.members = self.n = self.nbins = None
+        self.s = self.s2 = self.central = self.marks = self.counts = self.edges = None
+        self.sk_count = self.sk_params = self.sk_means = self.sk_weights = None
+        self.shm.close()
+        if self._owner:
+            self.shm.unlink()
+
+
+TRANSPORTS = ("queue", "shm")
+
+
+def check_board(clients) -> None:
+    """Raise if these ClientConfigs would send something the fixed-size board slots cannot hold."""
+    if any(c.columns for c in clients):
+        raise ValueError("multi-column clients (ClientConfig.columns) need the queue transport")
+    if any(c.group_by for c in clients):
+        raise ValueError("group-by clients (ClientConfig.group_by) need the queue transport")
+
+
+def sketch_capacity(clients) -> int:
+    """Centroid slots a board needs for the largest sketch these ClientConfigs can send."""
+    return max((max_centroids(c.sketch_compression) for c in clients if c.sketch_compression), default=0)
+
+
+def make_transport(kind: str, clients, maxsize: int = 0,
+                   ctx: BaseContext | None = None) -> QueueTransport | SharedMemoryTransport:
+    """
+    Build the result channel named by `kind` for this set of ClientConfigs.
+
+    `maxsize` bounds the queue transport; the board has one slot per client and never fills up.
+    `ctx` is the multiprocessing context the clients will be started from (see startup.py).
+    """
+    if kind == "queue":
+        return QueueTransport(maxsize, ctx)
+    if kind == "shm":
+        check_board(clients)
+        return SharedMemoryTransport([c.client_id for c in clients], max((c.bins for c in clients), default=0),
+                                     sketch_capacity(clients), ctx)
+    raise ValueError(f"unknown transport {kind!r}; expected one of {TRANSPORTS}")
+
+'''
+Both transports expose the same two calls:
+
+    publish(summary, grid) → client side
+
+    get(timeout) → coordinator side; blocks until a summary is ready or raises queue.Empty
+
+so the coordinators' collection loops do not care which one is in use.
+The shared-memory board is sized up front (one slot per client, max bins),
+which is what makes it cheap at 1k+ clients.
+'''
@@ -1,8 +1,15 @@
 from __future__ import annotations
-from dataclasses import dataclass
-from typing import List, Tuple, Dict
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, List, Tuple, Dict
+import math
 import numpy as np
 
+from SimuFed.utils.sketch import TDigest
+
+if TYPE_CHECKING:
+    from SimuFed.utils.columns import ColumnStats
+    from SimuFed.utils.groups import GroupStats
+
 
 '''
 Summary → stores a single client’s local stats.
@@ -10,7 +17,37 @@ Summary → stores a single client’s local stats.
 make_hist() → quickly builds a histogram (using NumPy).
 
 merge_summaries() → merges all summaries efficiently without raw data.
+
+RunningAggregate → the same merge, but incremental: fold summaries in one at a time.
+RunningAggregate.subtract() undoes an add() / merge(), for sliding windows.
+
+rebin() → moves a histogram onto another grid by interpolating its cumulative
+counts, so clients that binned over their own min/max still merge correctly.
+
+Summary.m2/m3/m4 → centered moment sums, so variance, skewness and kurtosis
+stay exact on data with a large offset (where s2/n - mean² cancels to noise);
+combine_moments() merges them pairwise in any order.
+
+Summary.columns → optional ColumnStats (utils/columns.py): array-valued
+statistics for several columns at once; the scalar fields then describe the
+first of them.
+
+Summary.groups → optional GroupStats (utils/groups.py): a sparse per-key
+table (n, sum, sum of squares) over the client's group_by column; merged
+tables are buffered and compacted GROUP_BUFFER at a time.
+
+Summary.sketch → optional TDigest of the client's column; merged alongside
+the moments, it answers global quantile queries (median, p99) that the
+fixed histogram cannot resolve.
 '''
+# Phase timestamps a worker stamps on its Summary, in order (see SimuFed/timeline.py)
+MARKS = ("start", "loaded", "computed", "delayed")
+
+# Group tables a RunningAggregate buffers before merging them in one pass (at least;
+# it waits until the buffered keys add up to the merged table's size)
+GROUP_BUFFER = 32
+
+
 @dataclass
 class Summary:
     """Holds a client’s summarized statistics."""
@@ -18,8 +55,23 @@ class Summary:
     n: int
     s: float          # sum(x)
     s2: float         # sum(x^2)
-    hist_counts: List[int]
-    hist_edges: List[float]
+    hist_counts: List[int] | np.ndarray
+    hist_edges: List[float] | np.ndarray
+    round_id: int = 0  # round this summary answers (used by ClientPool)
+    members: int = 1   # clients merged into this summary (>1 for tree partials)
+    marks: Dict[str, float] = field(default_factory=dict)  # worker phase timestamps, see MARKS
+    partition_id: int = -1  # partition this summary covers; -1 = the client's own
+    sketch: TDigest | None = None  # quantile sketch of the column (ClientConfig.sketch_compression)
+    m2: float | None = None  # sum((x - mean)^2); None → derived from s2 (less precise)
+    m3: float | None = None  # sum((x - mean)^3)
+    m4: float | None = None  # sum((x - mean)^4)
+    columns: ColumnStats | None = None  # per-column statistics (ClientConfig.columns)
+    groups: GroupStats | None = None  # per-key statistics of the column (ClientConfig.group_by)
+
+    @property
+    def partition_key(self) -> int:
+        """Partition identity: replicas of one partition share it, whatever their client id."""
+        return self.client_id if self.partition_id < 0 else self.partition_id
 
     @property
     def mean(self) -> float:
@@ -29,8 +81,104 @@ class Summary:
     def var(self) -> float:
         if self.n <= 1:
             return 0.0
-        # stable variance calculation
-        return max(self.s2 / self.n - (self.s / self.n) ** 2, 0.0)
+        return self.moments()[2] / self.n
+
+    @property
+    def skewness(self) -> float:
+        return _skewness(*self.moments())
+
+    @property
+    def kurtosis(self) -> float:
+        return _kurtosis(*self.moments())
+
+    def moments(self) -> Tuple[int, float, float, float, float]:
+        """(n, mean, m2, m3, m4) for combine_moments(); m3/m4 are nan if the sender did not compute them."""
+        if self.m2 is None:
+            m2 = max(self.s2 - self.s * self.s / self.n, 0.0) if self.n else 0.0
+            return self.n, self.mean, m2, math.nan, math.nan
+        return self.n, self.mean, self.m2, self.m3, self.m4
+
+
+Moments = Tuple[int, float, float, float, float]  # (n, mean, m2, m3, m4)
+
+
+def central_moments(x: np.ndarray) -> Moments:
+    """(n, mean, m2, m3, m4) of an array: the mean, then one vectorized pass over the deviations."""
+    n = int(x.size)
+    if n == 0:
+        return 0, 0.0, 0.0, 0.0, 0.0
+    mean = float(np.mean(x))
+    d = x - mean
+    d2 = d * d
+    return n, mean, float(np.sum(d2)), float(np.dot(d2, d)), float(np.dot(d2, d2))
+
+
+def combine_moments(a: Moments, b: Moments) -> Moments:
+    """
+    Merge the centered moments of two disjoint groups (Pébay's pairwise update).
+
+    Exact in exact arithmetic, so any merge order (tree, streaming, chunked)
+    gives the same answer up to rounding; no large sums cancel.
+    """
+    na, ma, m2a, m3a, m4a = a
+    nb, mb, m2b, m3b, m4b = b
+    if nb == 0:
+        return a
+    if na == 0:
+        return b
+    n = na + nb
+    d = mb - ma
+    d_n = d / n
+    nab = na * nb
+    m2 = m2a + m2b + d * d_n * nab
+    m3 = (m3a + m3b + d * d_n * d_n * nab * (na - nb)
+          + 3 * d_n * (na * m2b - nb * m2a))
+    m4 = (m4a + m4b + d * d_n ** 3 * nab * (na * na - nab + nb * nb)
+          + 6 * d_n * d_n * (na * na * m2b + nb * nb * m2a)
+          + 4 * d_n * (na * m3b - nb * m3a))
+    return n, ma + d_n * nb, m2, m3, m4
+
+
+def split_moments(total: Moments, part: Moments) -> Moments:
+    """
+    Moments of what remains of `total` once the disjoint group `part` is removed.
+
+    combine_moments() solved for its first argument: exact in exact
+    arithmetic, but it subtracts large sums, so long chains of removals
+    drift and callers should recompute from the parts now and then.
+    """
+    n, mean, m2, m3, m4 = total
+    nb, mb, m2b, m3b, m4b = part
+    if nb == 0:
+        return total
+    na = n - nb
+    if na <= 0:
+        return 0, 0.0, 0.0, 0.0, 0.0
+    ma = mean - (mb - mean) * nb / na
+    d = mb - ma
+    d_n = d / n
+    nab = na * nb
+    m2a = max(m2 - m2b - d * d_n * nab, 0.0)
+    m3a = (m3 - m3b - d * d_n * d_n * nab * (na - nb)
+           - 3 * d_n * (na * m2b - nb * m2a))
+    m4a = (m4 - m4b - d * d_n ** 3 * nab * (na * na - nab + nb * nb)
+           - 6 * d_n * d_n * (na * na * m2b + nb * nb * m2a)
+           - 4 * d_n * (na * m3b - nb * m3a))
+    return na, ma, m2a, m3a, m4a
+
+
+def _skewness(n: int, mean: float, m2: float, m3: float, m4: float) -> float:
+    """Sample skewness g1 = sqrt(n) m3 / m2^1.5; nan when undefined."""
+    if n < 2 or m2 <= 0:
+        return math.nan
+    return math.sqrt(n) * m3 / m2 ** 1.5
+
+
+def _kurtosis(n: int, mean: float, m2: float, m3: float, m4: float) -> float:
+    """Excess kurtosis g2 = n m4 / m2² - 3 (0 for a normal distribution); nan when undefined."""
+    if n < 2 or m2 <= 0:
+        return math.nan
+    return n * m4 / (m2 * m2) - 3.0
 
 
 def make_hist(x: np.ndarray, bins: int = 10, range_: Tuple[float, float] | None = None) -> Tuple[np.ndarray, np.ndarray]:
@@ -39,28 +187,328 @@ def make_hist(x: np.ndarray, bins: int = 10, range_: Tuple[float, float] | None
     return counts.astype(int), edges
 
 
-def merge_summaries(summaries: List[Summary]) -> Dict[str, float | List[int] | List[float]]:
-    """Aggregate multiple client summaries into one global summary."""
-    n_total = sum(s.n for s in summaries)
-    s_total = sum(s.s for s in summaries)
-    s2_total = sum(s.s2 for s in summaries)
+def hist_groups(x: np.ndarray, group, edges: np.ndarray, within: bool = False) -> np.ndarray:
+    """
+    Many histograms in one np.bincount: value x[i] is binned on edges[group[i]].
+
+    `group` is an int array broadcastable to x (np.arange(k) for the columns
+    of an (n, k) array, or a partition index per value); edges is
+    [groups, bins + 1] with equal-width rows. Returns [groups, bins] counts,
+    the same ones np.histogram gives per group; values outside their edges
+    are not counted (`within=True` skips that check when the edges come from
+    the data's own min/max).
+    """
+    bins = edges.shape[1] - 1
+    # C order, so idx.ravel() below is a view that the edge fix-up writes through
+    # (a Fortran-ordered block, e.g. from DataFrame.to_numpy(), would ravel to a copy)
+    x = np.ascontiguousarray(x)
+    lo_g, hi_g = edges[:, 0], edges[:, -1]
+    lo, scale = lo_g[group], (bins / (hi_g - lo_g))[group]  # per group first, then spread
+    f = x - lo
+    f *= scale
+    idx = f.astype(np.int64)
+    np.clip(idx, 0, bins - 1, out=idx)
+    # Like np.histogram, trust the edges over the float division, which can
+    # only be off for values within rounding of a bin boundary
+    f -= idx
+    near = np.flatnonzero((f < 1e-6) | (f > 1 - 1e-6))
+    if near.size:
+        g = np.broadcast_to(group, x.shape).ravel()[near]
+        v, i = x.ravel()[near], idx.ravel()[near]
+        i -= v < edges[g, i]
+        i += (v >= edges[g, i + 1]) & (i != bins - 1)
+        idx.ravel()[near] = i
+    idx += group * bins
+    flat = idx.ravel() if within else idx[(x >= lo) & (x <= hi_g[group])]
+    return np.bincount(flat, minlength=edges.shape[0] * bins).reshape(edges.shape[0], bins)
+
+
+def grid_edges(lo, hi, bins: int) -> np.ndarray:
+    """
+    Edges of an equal-width grid, exactly as np.histogram(range=(lo, hi)) makes them.
+
+    With arrays lo / hi, one grid per row ([len(lo), bins + 1]); an empty
+    range is widened by ±0.5, as np.histogram does.
+    """
+    if np.ndim(lo) == 0:
+        return np.histogram(np.empty(0), bins=bins, range=(lo, hi))[1]
+    lo, hi = np.asarray(lo, dtype=float), np.asarray(hi, dtype=float)
+    flat = lo == hi
+    return np.linspace(np.where(flat, lo - 0.5, lo), np.where(flat, hi + 0.5, hi), bins + 1, axis=1)
+
+
+def union_grid(summaries: List[Summary]) -> np.ndarray | None:
+    """Equal-width grid spanning every summary's histogram, with the most bins any of them has."""
+    spans = [(s.hist_edges[0], s.hist_edges[-1], len(s.hist_counts)) for s in summaries if len(s.hist_counts)]
+    if not spans:
+        return None
+    lo, hi, bins = zip(*spans)
+    return grid_edges(min(lo), max(hi), max(bins))
+
+
+def rebin_cumulative(counts, edges, grid: np.ndarray) -> np.ndarray:
+    """
+    Cumulative counts of a histogram evaluated at `grid` edges.
+
+    Assumes counts are spread evenly within each source bin, so the cumulative
+    is piecewise linear and one np.interp moves it onto any other grid; mass
+    below grid[0] or above grid[-1] is not counted.
+    """
+    cum = np.zeros(len(counts) + 1)
+    np.cumsum(counts, out=cum[1:])
+    return _regrid(cum, edges, grid)
+
+
+def _regrid(cum: np.ndarray, edges, grid: np.ndarray) -> np.ndarray:
+    return np.interp(grid, edges, cum) - np.interp(grid[0], edges, cum)
+
+
+def rebin(counts, edges, grid: np.ndarray) -> np.ndarray:
+    """Redistribute a histogram onto `grid`; integer counts, rounded on the cumulative so totals are kept."""
+    return np.diff(np.rint(rebin_cumulative(counts, edges, grid))).astype(np.int64)
+
+
+class RunningAggregate:
+    """
+    Mergeable running aggregate of client summaries.
+
+    Holds the running n, sum and sum of squares, the centered moments and a
+    preallocated histogram, so folding in one Summary costs O(bins) and reading
+    mean/var/skewness/kurtosis costs O(1).
+
+    Histograms are kept on one global grid: `edges` fixes it up front
+    (mass outside it is dropped, as np.histogram(range=...) would); otherwise
+    the first histogram's edges are used and the grid widens when a later one
+    reaches past it. Histograms on other edges are rebinned onto the grid.
+    """
+
+    def __init__(self, bins: int | None = None, edges=None) -> None:
+        self.n = 0
+        self.s = 0.0
+        self.s2 = 0.0
+        self._mean = 0.0
+        self.m2 = self.m3 = self.m4 = 0.0
+        self.count = 0  # number of summaries folded in
+        self.fixed_grid = edges is not None
+        self._grid: np.ndarray | None = None if edges is None else np.asarray(edges, dtype=float)
+        if self._grid is not None:
+            bins = self._grid.size - 1
+        # Exact counts from histograms already on the grid; rebinned ones go to a
+        # float cumulative and are rounded once, when read
+        self._exact: np.ndarray | None = None if bins is None else np.zeros(bins, dtype=np.int64)
+        self._rebinned: np.ndarray | None = None
+        self.sketch: TDigest | None = None
+        self.columns: ColumnStats | None = None
+        self._groups: List[GroupStats] = []  # compacted table first, then buffered arrivals
+        self._groups_buffered = 0  # keys in the buffered tables
+
+    def add(self, summary: Summary) -> "RunningAggregate":
+        """Fold one client summary into the aggregate."""
+        self._add_moments(summary.moments())
+        self.n += summary.n
+        self.s += summary.s
+        self.s2 += summary.s2
+        self.count += 1
+        self._add_hist(summary.hist_counts, summary.hist_edges)
+        self._add_sketch(summary.sketch)
+        self._add_columns(summary.columns)
+        self._add_groups(summary.groups)
+        return self
+
+    def merge(self, other: "RunningAggregate") -> "RunningAggregate":
+        """Fold another aggregate (e.g. from a sub-group of clients) into this one."""
+        self._add_moments(other.moments())
+        self.n += other.n
+        self.s += other.s
+        self.s2 += other.s2
+        self.count += other.count
+        if other._grid is not None:
+            self._add_hist(other.hist_counts, other._grid)
+        self._add_sketch(other.sketch)
+        self._add_columns(other.columns)
+        self._add_groups(other.groups)
+        return self
+
+    def subtract(self, other: "Summary | RunningAggregate") -> "RunningAggregate":
+        """
+        Remove a summary (or aggregate) folded in earlier: the inverse of add() / merge().
+
+        n, the sums and on-grid histogram counts subtract exactly; the centered
+        moments through split_moments(). Histograms on other edges come off the
+        rebinned part, so they should not straddle a widening of the grid.
+        Sketches, column and group tables cannot be subtracted.
+        """
+        if other.sketch is not None or other.columns is not None or other.groups is not None:
+            raise ValueError("sketches, columns and groups cannot be subtracted from a RunningAggregate")
+        _, self._mean, self.m2, self.m3, self.m4 = split_moments(self.moments(), other.moments())
+        self.n -= other.n
+        self.s -= other.s
+        self.s2 -= other.s2
+        if isinstance(other, RunningAggregate):
+            self.count -= other.count
+            if other._grid is not None:
+                self._sub_hist(other.hist_counts, other._grid)
+        else:
+            self.count -= 1
+            self._sub_hist(other.hist_counts, other.hist_edges)
+        return self
+
+    def moments(self) -> Moments:
+        return self.n, self._mean, self.m2, self.m3, self.m4
+
+    def _add_moments(self, m: Moments) -> None:
+        _, self._mean, self.m2, self.m3, self.m4 = combine_moments(self.moments(), m)
+
+    def _add_sketch(self, sketch: TDigest | None) -> None:
+        if sketch is None:
+            return
+        if self.sketch is None:
+            self.sketch = TDigest(sketch.compression)
+        self.sketch.merge(sketch)
+
+    def _add_columns(self, columns: ColumnStats | None) -> None:
+        if columns is None:
+            return
+        if self.columns is None:
+            self.columns = columns.copy()
+        else:
+            self.columns.merge(columns)
+
+    def _add_groups(self, groups: GroupStats | None) -> None:
+        if groups is None:
+            return
+        self._groups.append(groups)
+        self._groups_buffered += len(groups)
+        # Each compaction re-sorts the merged table, so it waits for as many new keys as that table holds
+        if len(self._groups) > GROUP_BUFFER and self._groups_buffered >= len(self._groups[0]):
+            self._compact_groups()
+
+    def _compact_groups(self) -> None:
+        from SimuFed.utils.groups import GroupStats
+        self._groups = [GroupStats.merge_many(self._groups)]
+        self._groups_buffered = 0
+
+    @property
+    def groups(self) -> GroupStats | None:
+        """Merged per-key table of every summary folded in so far (None if none had one)."""
+        if not self._groups:
+            return None
+        if len(self._groups) > 1:
+            self._compact_groups()
+        return self._groups[0]
+
+    def quantile(self, q):
+        """Global q-quantile from the merged client sketches; nan when no client sent one."""
+        if self.sketch is None:
+            return np.full(np.shape(q), np.nan) if np.ndim(q) else float("nan")
+        return self.sketch.quantile(q)
+
+    def _add_hist(self, counts, edges) -> None:
+        if len(counts) == 0:
+            return  # e.g. an empty partial from a tree node that heard from nobody
+        edges = np.asarray(edges, dtype=float)
+        if self._grid is None:
+            self._grid = edges.copy()
+        if self._exact is None or self._exact.size != self._grid.size - 1:
+            self._exact = np.zeros(self._grid.size - 1, dtype=np.int64)
+        if edges.size == self._grid.size and np.array_equal(edges, self._grid):
+            self._exact += np.asarray(counts, dtype=np.int64)
+            return
+        if not self.fixed_grid and (edges[0] < self._grid[0] or edges[-1] > self._grid[-1]):
+            self._widen(min(edges[0], self._grid[0]), max(edges[-1], self._grid[-1]), max(len(counts), self._exact.size))
+        if self._rebinned is None:
+            self._rebinned = np.zeros(self._grid.size)
+        self._rebinned += rebin_cumulative(counts, edges, self._grid)
+
+    def _sub_hist(self, counts, edges) -> None:
+        if len(counts) == 0 or self._grid is None:
+            return
+        edges = np.asarray(edges, dtype=float)
+        if edges.size == self._grid.size and np.array_equal(edges, self._grid):
+            self._exact -= np.asarray(counts, dtype=np.int64)
+            return
+        if self._rebinned is None:
+            self._rebinned = np.zeros(self._grid.size)
+        self._rebinned -= rebin_cumulative(counts, edges, self._grid)
+
+    def _widen(self, lo: float, hi: float, bins: int) -> None:
+        grid = grid_edges(lo, hi, bins)
+        cum = np.zeros(self._grid.size)
+        np.cumsum(self._exact, out=cum[1:])
+        if self._rebinned is not None:
+            cum += self._rebinned
+        self._rebinned = _regrid(cum, self._grid, grid)
+        self._grid = grid
+        self._exact = np.zeros(bins, dtype=np.int64)
+
+    @property
+    def hist_counts(self) -> np.ndarray | None:
+        """Global histogram on hist_edges (None before the first histogram, unless `bins` preallocated it)."""
+        if self._rebinned is None:
+            return self._exact
+        return self._exact + np.diff(np.rint(self._rebinned)).astype(np.int64)
+
+    @property
+    def hist_edges(self) -> List[float]:
+        return [] if self._grid is None else self._grid.tolist()
+
+    @property
+    def mean(self) -> float:
+        return self._mean
+
+    @property
+    def var(self) -> float:
+        if self.n == 0:
+            return 0.0
+        return self.m2 / self.n
+
+    @property
+    def skewness(self) -> float:
+        return _skewness(*self.moments())
+
+    @property
+    def kurtosis(self) -> float:
+        return _kurtosis(*self.moments())
+
+    def snapshot(self, with_hist: bool = True) -> Dict[str, float | List[int] | List[float]]:
+        """
+        Current global summary in the same shape as merge_summaries().
+
+        The scalar part is O(1); with_hist=False skips the O(bins) copy of the
+        histogram for callers that only want running moments.
+        """
+        out = {
+            "n": self.n,
+            "sum": self.s,
+            "sumsq": self.s2,
+            "mean": self.mean,
+            "var": self.var,
+            "skewness": self.skewness,
+            "kurtosis": self.kurtosis,
+        }
+        if self.sketch is not None:
+            out["median"], out["p99"] = self.sketch.quantile([0.5, 0.99]).tolist()
+        if with_hist:
+            counts = self.hist_counts
+            out["hist_counts"] = counts.tolist() if counts is not None and self.count else []
+            out["hist_edges"] = self.hist_edges
+            if self.columns is not None:
+                out["columns"] = self.columns.to_dict()
+            if self._groups:
+                out["groups"] = self.groups.to_dict()
+        return out
 
-    # Assume same bin edges for all clients
-    edges = summaries[0].hist_edges if summaries else []
-    counts = np.sum([np.array(s.hist_counts, dtype=int) for s in summaries], axis=0).tolist() if summaries else []
 
-    mean = 0.0 if n_total == 0 else s_total / n_total
-    var = 0.0 if n_total == 0 else max(s2_total / n_total - mean ** 2, 0.0)
+def merge_summaries(summaries: List[Summary], edges=None) -> Dict[str, float | List[int] | List[float]]:
+    """
+    Aggregate multiple client summaries into one global summary.
 
-    return {
-        "n": n_total,
-        "sum": s_total,
-        "sumsq": s2_total,
-        "mean": mean,
-        "var": var,
-        "hist_counts": counts,
-        "hist_edges": edges,
-    }
+    Histograms land on `edges` if given, else on a grid spanning all of them.
+    """
+    agg = RunningAggregate(edges=edges if edges is not None else union_grid(summaries))
+    for s in summaries:
+        agg.add(s)
+    return agg.snapshot()
 
 
 
@@ -74,7 +522,7 @@ Each client computes local statistics:
 
 3. sum(x²)
 
-4. histogram counts
+4. histogram counts (on a shared grid, or rebinned onto one)
 
 The Coordinator receives these and merges them to get the global mean and variance efficiently without centralizing data.
 
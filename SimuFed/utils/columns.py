@@ -0,0 +1,266 @@
+from __future__ import annotations
+from dataclasses import dataclass
+from fnmatch import fnmatchcase
+from functools import lru_cache
+from typing import Dict, Iterator, List, Tuple
+import numpy as np
+from numpy.lib.recfunctions import structured_to_unstructured
+
+from SimuFed.utils.aggregator import combine_moments, grid_edges, hist_groups, rebin
+from SimuFed.utils.sketch import TDigest
+
+
+'''
+Multi-column statistics: one vectorized pass over an (n, k) array.
+
+ColumnStats → per-column mean, centered moments m2..m4 and histograms as
+arrays, plus an optional co-moment matrix (covariance / correlation).
+
+ColumnStats.from_array() → everything for all k columns at once: the
+moments as column reductions, the k histograms with a single np.bincount,
+the co-moment matrix as one d.T @ d product.
+
+ColumnStats.merge() → the pairwise combine of utils/aggregator.py applied
+elementwise, plus the matching update of the co-moment matrix.
+
+resolve_columns() → a column list, or an fnmatch pattern ("feat_*")
+matched against the partition's header.
+'''
+
+
+@dataclass
+class ColumnStats:
+    """Array-valued statistics for several columns of one partition (or a merge of many)."""
+    names: List[str]
+    n: int
+    mean: np.ndarray         # [k]
+    m2: np.ndarray           # [k] sum((x - mean)^2)
+    m3: np.ndarray           # [k]
+    m4: np.ndarray           # [k]
+    hist_counts: np.ndarray  # [k, bins] int64
+    hist_edges: np.ndarray   # [k, bins + 1]
+    comoment: np.ndarray | None = None  # [k, k] sum((x_i - mean_i)(x_j - mean_j))
+
+    @classmethod
+    def from_array(
+        cls,
+        x: np.ndarray,
+        names: List[str],
+        bins: int = 10,
+        range_: Tuple[float, float] | None = None,
+        covariance: bool = False,
+    ) -> "ColumnStats":
+        """Statistics of every column of `x` (rows × columns); histograms span each column's min/max unless `range_`."""
+        x = np.asarray(x, dtype=float)
+        n, k = x.shape
+        if range_ is not None:
+            lo, hi = np.full(k, float(range_[0])), np.full(k, float(range_[1]))
+        elif n:
+            lo, hi = x.min(axis=0), x.max(axis=0)
+        else:
+            lo, hi = np.zeros(k), np.ones(k)
+        edges = grid_edges(lo, hi, bins)
+        n, mean, m2, m3, m4, comoment = _column_moments(x, covariance)
+        return cls(list(names), n, mean, m2, m3, m4, _hist_columns(x, edges, within=range_ is None), edges, comoment)
+
+    @property
+    def var(self) -> np.ndarray:
+        return self.m2 / self.n if self.n else np.zeros_like(self.m2)
+
+    @property
+    def skewness(self) -> np.ndarray:
+        """Per-column g1, as Summary.skewness; nan where undefined."""
+        ok = (self.m2 > 0) & (self.n >= 2)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return np.where(ok, np.sqrt(self.n) * self.m3 / self.m2 ** 1.5, np.nan)
+
+    @property
+    def kurtosis(self) -> np.ndarray:
+        """Per-column excess kurtosis g2, as Summary.kurtosis; nan where undefined."""
+        ok = (self.m2 > 0) & (self.n >= 2)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return np.where(ok, self.n * self.m4 / (self.m2 * self.m2) - 3.0, np.nan)
+
+    def covariance(self) -> np.ndarray | None:
+        """Population covariance matrix (same normalization as `var`); None unless requested."""
+        if self.comoment is None:
+            return None
+        return self.comoment / self.n if self.n else np.zeros_like(self.comoment)
+
+    def correlation(self) -> np.ndarray | None:
+        if self.comoment is None:
+            return None
+        sd = np.sqrt(np.diag(self.comoment))
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return self.comoment / np.outer(sd, sd)
+
+    def merge(self, other: "ColumnStats") -> "ColumnStats":
+        """Fold in another partition's statistics for the same columns."""
+        if other.names != self.names:
+            raise ValueError(f"cannot merge columns {other.names} into {self.names}")
+        if other.n == 0:
+            return self
+        if self.n == 0:
+            self.__dict__.update(other.copy().__dict__)
+            return self
+        na, nb = self.n, other.n
+        if self.comoment is not None and other.comoment is not None:
+            d = other.mean - self.mean
+            self.comoment = self.comoment + other.comoment + np.outer(d, d) * (na * nb / (na + nb))
+        else:
+            self.comoment = None
+        self.n, self.mean, self.m2, self.m3, self.m4 = combine_moments(
+            (na, self.mean, self.m2, self.m3, self.m4),
+            (nb, other.mean, other.m2, other.m3, other.m4),
+        )
+        self._merge_hist(other.hist_counts, other.hist_edges)
+        return self
+
+    def _merge_hist(self, counts: np.ndarray, edges: np.ndarray) -> None:
+        if np.array_equal(edges, self.hist_edges):
+            self.hist_counts = self.hist_counts + counts
+            return
+        # Columns whose edges differ move both sides onto the union range
+        merged_counts = self.hist_counts.copy()
+        merged_edges = self.hist_edges.copy()
+        for j in np.flatnonzero(np.any(edges != self.hist_edges, axis=1)):
+            grid = grid_edges(min(edges[j, 0], self.hist_edges[j, 0]), max(edges[j, -1], self.hist_edges[j, -1]),
+                              self.hist_counts.shape[1])
+            merged_counts[j] = rebin(self.hist_counts[j], self.hist_edges[j], grid) + rebin(counts[j], edges[j], grid)
+            merged_edges[j] = grid
+        same = np.all(edges == self.hist_edges, axis=1)
+        merged_counts[same] += counts[same]
+        self.hist_counts, self.hist_edges = merged_counts, merged_edges
+
+    def copy(self) -> "ColumnStats":
+        return ColumnStats(list(self.names), self.n, self.mean.copy(), self.m2.copy(), self.m3.copy(),
+                           self.m4.copy(), self.hist_counts.copy(), self.hist_edges.copy(),
+                           None if self.comoment is None else self.comoment.copy())
+
+    def to_dict(self) -> Dict[str, object]:
+        """Plain-list form for snapshots / JSON."""
+        out = {
+            "names": list(self.names),
+            "mean": self.mean.tolist(),
+            "var": self.var.tolist(),
+            "skewness": self.skewness.tolist(),
+            "kurtosis": self.kurtosis.tolist(),
+            "hist_counts": self.hist_counts.tolist(),
+            "hist_edges": self.hist_edges.tolist(),
+        }
+        if self.comoment is not None:
+            out["covariance"] = self.covariance().tolist()
+            out["correlation"] = self.correlation().tolist()
+        return out
+
+
+def _column_moments(x: np.ndarray, covariance: bool):
+    n, k = x.shape
+    if n == 0:
+        return 0, np.zeros(k), np.zeros(k), np.zeros(k), np.zeros(k), (np.zeros((k, k)) if covariance else None)
+    mean = x.mean(axis=0)
+    d = x - mean
+    d2 = d * d
+    m3 = np.einsum("ij,ij->j", d2, d)
+    m4 = np.einsum("ij,ij->j", d2, d2)
+    return n, mean, d2.sum(axis=0), m3, m4, (d.T @ d if covariance else None)
+
+
+# Rows binned per block: keeps the (rows × columns) temporaries cache-sized
+HIST_BLOCK_ROWS = 16384
+
+
+def _hist_columns(x: np.ndarray, edges: np.ndarray, within: bool = False) -> np.ndarray:
+    """Histogram of every column on its own edges (same bins as np.histogram), block by block."""
+    counts = np.zeros(edges.shape[0] * (edges.shape[1] - 1), dtype=np.int64)
+    for start in range(0, x.shape[0], HIST_BLOCK_ROWS):
+        counts += hist_groups(x[start:start + HIST_BLOCK_ROWS], np.arange(edges.shape[0]), edges, within).ravel()
+    return counts.reshape(edges.shape[0], -1)
+
+
+def header(path: str) -> List[str]:
+    """Column names of a partition file, without reading its rows."""
+    if str(path).endswith(".npy"):
+        names = np.load(path, mmap_mode="r").dtype.names
+        return list(names) if names else []
+    import pandas as pd  # CSV only, see load_partition
+    return list(pd.read_csv(path, nrows=0).columns)
+
+
+def resolve_columns(path: str, spec: List[str] | Tuple[str, ...] | str) -> List[str]:
+    """Column list for a spec: a list is taken as is, a string is an fnmatch pattern over the header."""
+    return list(_resolve(path, spec if isinstance(spec, str) else tuple(spec)))
+
+
+@lru_cache(maxsize=1024)
+def _resolve(path: str, spec: Tuple[str, ...] | str) -> Tuple[str, ...]:
+    if not isinstance(spec, str):
+        return spec
+    names = tuple(c for c in header(path) if fnmatchcase(c, spec))
+    if not names:
+        raise ValueError(f"no column of {path} matches {spec!r}")
+    return names
+
+
+def load_columns(path: str, names: List[str]) -> np.ndarray:
+    """The named columns as one (rows × columns) float array."""
+    if str(path).endswith(".npy"):
+        # a view straight into the memory map when the fields are packed float64
+        return structured_to_unstructured(np.load(path, mmap_mode="r")[names], dtype=float)
+    import pandas as pd
+    return pd.read_csv(path, usecols=names)[names].to_numpy(dtype=float)
+
+
+def iter_column_chunks(path: str, names: List[str], chunk_rows: int) -> Iterator[np.ndarray]:
+    """Read several columns in (rows × columns) chunks of at most `chunk_rows` rows."""
+    if str(path).endswith(".npy"):
+        arr = np.load(path, mmap_mode="r")
+        for start in range(0, arr.shape[0], chunk_rows):
+            yield structured_to_unstructured(arr[start:start + chunk_rows][names], dtype=float)
+        return
+    import pandas as pd
+    for df in pd.read_csv(path, usecols=names, chunksize=chunk_rows):
+        yield df[names].to_numpy(dtype=float)
+
+
+def stream_column_stats(
+    path: str,
+    names: List[str],
+    chunk_rows: int,
+    bins: int = 10,
+    range_: Tuple[float, float] | None = None,
+    covariance: bool = False,
+    sketch: TDigest | None = None,
+) -> ColumnStats:
+    """
+    ColumnStats of a partition read in chunks.
+
+    Each chunk is reduced with from_array() and merged. Without a fixed
+    `range_` a second pass bins every chunk on the columns' global min/max,
+    so the streamed histograms equal the in-memory ones. With `sketch`, the
+    first column's chunk digests are merged into it.
+    """
+    k = len(names)
+    total = ColumnStats.from_array(np.empty((0, k)), names, bins, range_, covariance)
+    lo, hi = np.full(k, np.inf), np.full(k, -np.inf)
+    for x in iter_column_chunks(path, names, chunk_rows):
+        if x.shape[0] == 0:
+            continue
+        if sketch is not None:
+            sketch.merge(TDigest.from_array(x[:, 0], sketch.compression))
+        if range_ is not None:
+            total.merge(ColumnStats.from_array(x, names, bins, range_, covariance))
+            continue
+        # moments only; histograms wait for the global min/max
+        n, mean, m2, m3, m4, comoment = _column_moments(x, covariance)
+        total.merge(ColumnStats(list(names), n, mean, m2, m3, m4, np.zeros_like(total.hist_counts),
+                                total.hist_edges, comoment))
+        lo, hi = np.minimum(lo, x.min(axis=0)), np.maximum(hi, x.max(axis=0))
+    if range_ is None and total.n:
+        edges = grid_edges(lo, hi, bins)
+        counts = np.zeros((k, bins), dtype=np.int64)
+        for x in iter_column_chunks(path, names, chunk_rows):
+            if x.shape[0]:
+                counts += _hist_columns(x, edges, within=True)
+        total.hist_counts, total.hist_edges = counts, edges
+    return total
@@ -0,0 +1,222 @@
+from __future__ import annotations
+from dataclasses import dataclass
+from typing import Dict, Iterator, List, Tuple
+import numpy as np
+
+from SimuFed.utils.aggregator import grid_edges
+
+
+'''
+Group-by statistics: per-key n, sum, sum of squares (and m2, optionally a
+histogram) of one column, keyed by another column of the same partition.
+
+GroupStats → a sparse key → stats table: sorted keys present in the data
+plus aligned stat arrays, so a client with 3 of 100k regions sends 3 rows.
+
+GroupStats.from_arrays() → every key at once: factorize the keys, then one
+np.bincount per statistic over the codes; per-key histograms are one more
+bincount over code * bins + bin.
+
+GroupStats.merge_many() → any number of tables, whatever their key sets:
+concatenate, factorize the union of keys, bincount the sums back down;
+m2 combines by the parallel-axis rule, so it needs no second pass.
+RunningAggregate buffers incoming tables and compacts them this way in
+batches, instead of re-merging the whole table on every arrival.
+'''
+
+
+# Integer keys are factorized through a lookup table when max - min < DENSE_SPAN * rows
+DENSE_SPAN = 4
+
+
+def factorize(keys) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    (sorted unique keys, code of every row); missing keys (NaN / None) get code -1.
+
+    Integer keys spanning a range not much wider than their count use a
+    dense lookup table (no sort); other numeric keys go through np.unique;
+    string keys through pandas' hash factorize, which avoids sorting every
+    row with Python comparisons.
+    """
+    keys = np.asarray(keys)
+    if keys.dtype == object or keys.dtype.kind in "US":
+        import pandas as pd  # only for string keys
+        codes, uniques = pd.factorize(keys.astype(object), sort=True)
+        return np.asarray(uniques, dtype=object), codes
+    if keys.dtype.kind in "iu" and keys.size:
+        lo, hi = int(keys.min()), int(keys.max())
+        if hi - lo < DENSE_SPAN * keys.size:
+            present = np.zeros(hi - lo + 1, dtype=bool)
+            offset = keys - lo
+            present[offset] = True
+            slot = np.cumsum(present) - 1
+            return np.flatnonzero(present) + lo, slot[offset]
+    if keys.dtype.kind == "f":
+        missing = np.isnan(keys)
+        if missing.any():
+            uniques, codes = np.unique(keys[~missing], return_inverse=True)
+            out = np.full(keys.size, -1, dtype=np.int64)
+            out[~missing] = codes
+            return uniques, out
+    return np.unique(keys, return_inverse=True)
+
+
+def bin_index(x: np.ndarray, edges: np.ndarray) -> np.ndarray:
+    """Bin of each value on `edges` as np.histogram assigns it (last bin closed); -1 outside."""
+    bins = edges.size - 1
+    idx = np.searchsorted(edges, x, side="right") - 1
+    idx[x == edges[-1]] = bins - 1
+    idx[(idx < 0) | (idx >= bins)] = -1
+    return idx
+
+
+@dataclass
+class GroupStats:
+    """Per-key statistics of one column, for the keys that occur (sorted)."""
+    keys: np.ndarray   # [k] int64 / float64 / str (object)
+    n: np.ndarray      # [k] int64
+    s: np.ndarray      # [k] sum(x)
+    s2: np.ndarray     # [k] sum(x^2)
+    m2: np.ndarray     # [k] sum((x - mean)^2), kept for a stable variance
+    hist_counts: np.ndarray | None = None  # [k, bins] int64, on hist_edges
+    hist_edges: np.ndarray | None = None   # [bins + 1], shared by every key
+
+    @classmethod
+    def from_arrays(cls, x: np.ndarray, keys, edges: np.ndarray | None = None) -> "GroupStats":
+        """Statistics of `x` per distinct value of `keys` (same length); per-key histograms on `edges` if given."""
+        x = np.asarray(x, dtype=float)
+        uniques, codes = factorize(keys)
+        if (codes < 0).any():
+            x, codes = x[codes >= 0], codes[codes >= 0]
+        k = uniques.size
+        n = np.bincount(codes, minlength=k)
+        s = np.bincount(codes, weights=x, minlength=k)
+        s2 = np.bincount(codes, weights=x * x, minlength=k)
+        d = x - (s / np.maximum(n, 1))[codes]
+        m2 = np.bincount(codes, weights=d * d, minlength=k)
+        counts = None
+        if edges is not None:
+            edges = np.asarray(edges, dtype=float)
+            bins = edges.size - 1
+            idx = bin_index(x, edges)
+            ok = idx >= 0
+            counts = np.bincount(codes[ok] * bins + idx[ok], minlength=k * bins).reshape(k, bins)
+        return cls(uniques, n.astype(np.int64), s, s2, m2, counts, edges)
+
+    @classmethod
+    def merge_many(cls, tables: List["GroupStats"]) -> "GroupStats":
+        """One table for the union of the keys of `tables`."""
+        tables = [t for t in tables if len(t)] or tables[:1]
+        if len(tables) == 1:
+            return tables[0].copy()
+        uniques, inv = factorize(np.concatenate([t.keys for t in tables]))
+        k = uniques.size
+        n_i = np.concatenate([t.n for t in tables])
+        s_i = np.concatenate([t.s for t in tables])
+        n = np.bincount(inv, weights=n_i, minlength=k)
+        s = np.bincount(inv, weights=s_i, minlength=k)
+        s2 = np.bincount(inv, weights=np.concatenate([t.s2 for t in tables]), minlength=k)
+        # parallel-axis rule: each table's m2 about its own mean, shifted to the merged mean
+        d = s_i / n_i - (s / n)[inv]
+        m2 = np.bincount(inv, weights=np.concatenate([t.m2 for t in tables]) + n_i * d * d, minlength=k)
+        counts, edges = _merge_hists(tables, inv, k)
+        return cls(uniques, n.astype(np.int64), s, s2, m2, counts, edges)
+
+    def merge(self, other: "GroupStats") -> "GroupStats":
+        """Fold in another table, in place."""
+        self.__dict__.update(GroupStats.merge_many([self, other]).__dict__)
+        return self
+
+    def __len__(self) -> int:
+        return self.keys.size
+
+    @property
+    def mean(self) -> np.ndarray:
+        return self.s / self.n
+
+    @property
+    def var(self) -> np.ndarray:
+        """Per-key population variance, as Summary.var."""
+        return self.m2 / self.n
+
+    def copy(self) -> "GroupStats":
+        return GroupStats(self.keys.copy(), self.n.copy(), self.s.copy(), self.s2.copy(), self.m2.copy(),
+                          None if self.hist_counts is None else self.hist_counts.copy(),
+                          None if self.hist_edges is None else self.hist_edges.copy())
+
+    def to_dict(self) -> Dict[str, object]:
+        """Plain-list form for snapshots / JSON."""
+        out = {
+            "keys": self.keys.tolist(),
+            "n": self.n.tolist(),
+            "mean": self.mean.tolist(),
+            "var": self.var.tolist(),
+        }
+        if self.hist_counts is not None:
+            out["hist_counts"] = self.hist_counts.tolist()
+            out["hist_edges"] = self.hist_edges.tolist()
+        return out
+
+
+def _merge_hists(tables: List[GroupStats], inv: np.ndarray, k: int):
+    if any(t.hist_counts is None for t in tables):
+        return None, None
+    edges = tables[0].hist_edges
+    if not all(np.array_equal(t.hist_edges, edges) for t in tables):
+        # one grid spanning every table; each moves onto it by its cumulative counts
+        edges = grid_edges(min(t.hist_edges[0] for t in tables), max(t.hist_edges[-1] for t in tables),
+                           max(t.hist_counts.shape[1] for t in tables))
+    bins = edges.size - 1
+    rows = np.concatenate([t.hist_counts if np.array_equal(t.hist_edges, edges)
+                           else rebin_rows(t.hist_counts, t.hist_edges, edges) for t in tables])
+    flat = (inv[:, None] * bins + np.arange(bins)).ravel()
+    counts = np.bincount(flat, weights=rows.ravel(), minlength=k * bins)
+    return np.rint(counts).astype(np.int64).reshape(k, bins), edges
+
+
+def rebin_rows(counts: np.ndarray, edges: np.ndarray, grid: np.ndarray) -> np.ndarray:
+    """utils.aggregator.rebin() for every row of `counts` at once (all rows on the same `edges`)."""
+    cum = np.zeros((counts.shape[0], counts.shape[1] + 1))
+    np.cumsum(counts, axis=1, out=cum[:, 1:])
+    # np.interp's weights depend only on the edges, so they are shared by every row
+    pos = np.interp(grid, edges, np.arange(edges.size))
+    j = np.minimum(pos.astype(np.int64), edges.size - 2)
+    at = cum[:, j] + (pos - j) * (cum[:, j + 1] - cum[:, j])
+    at -= at[:, :1]
+    return np.diff(np.rint(at), axis=1).astype(np.int64)
+
+
+def iter_keyed_chunks(path: str, column: str, key: str, chunk_rows: int) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+    """(values, keys) of a partition in chunks of at most `chunk_rows` rows."""
+    if str(path).endswith(".npy"):
+        arr = np.load(path, mmap_mode="r")
+        for start in range(0, arr.shape[0], chunk_rows):
+            chunk = arr[start:start + chunk_rows]
+            yield np.asarray(chunk[column], dtype=float), np.asarray(chunk[key])
+        return
+    import pandas as pd
+    for df in pd.read_csv(path, usecols=[column, key], chunksize=chunk_rows):
+        yield df[column].to_numpy(dtype=float), df[key].to_numpy()
+
+
+def load_keyed(path: str, column: str, key: str) -> Tuple[np.ndarray, np.ndarray]:
+    """Values and keys of a whole partition (memory-mapped for .npy)."""
+    if str(path).endswith(".npy"):
+        arr = np.load(path, mmap_mode="r")
+        return np.asarray(arr[column], dtype=float), np.asarray(arr[key])
+    import pandas as pd
+    df = pd.read_csv(path, usecols=[column, key])
+    return df[column].to_numpy(dtype=float), df[key].to_numpy()
+
+
+def stream_group_stats(path: str, column: str, key: str, chunk_rows: int,
+                       edges: np.ndarray | None = None, buffer: int = 32) -> GroupStats:
+    """GroupStats of a partition read in chunks; chunk tables are compacted `buffer` at a time."""
+    tables: List[GroupStats] = []
+    for x, keys in iter_keyed_chunks(path, column, key, chunk_rows):
+        tables.append(GroupStats.from_arrays(x, keys, edges))
+        if len(tables) >= buffer:
+            tables = [GroupStats.merge_many(tables)]
+    if not tables:
+        return GroupStats.from_arrays(np.empty(0), np.empty(0), edges)
+    return GroupStats.merge_many(tables)
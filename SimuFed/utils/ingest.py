@@ -0,0 +1,265 @@
+from __future__ import annotations
+from collections import deque
+import io
+import os
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import Dict, Iterator, Tuple
+import numpy as np
+
+from SimuFed.utils.aggregator import Moments, central_moments, combine_moments
+from SimuFed.utils.sketch import TDigest
+
+
+'''
+Streaming ingestion for client partitions that are too large to load whole.
+
+Partitions are either CSV (parsed with pandas) or binary .npy files holding a
+structured array with one named field per column. The binary form is opened
+with mmap_mode="r", so statistics run straight over the page cache.
+
+iter_chunks() → yields the target column in bounded-size float arrays.
+
+stream_stats() → folds n, sum, sum(x^2), centered moments and histogram counts chunk by chunk,
+optionally reducing chunks on a few threads (NumPy releases the GIL).
+
+column_range() → min/max only, for negotiating a shared histogram grid.
+
+PartitionTail → for append-only partitions: remembers how far it has read
+and returns only the rows appended since (a byte offset into a CSV, a row
+offset into a .npy file), so each read costs the new data, not the file.
+append_rows() is the writing side.
+'''
+
+
+NPY_SUFFIX = ".npy"
+
+
+def is_binary(path: str) -> bool:
+    """True for the memory-mappable .npy partition format."""
+    return str(path).endswith(NPY_SUFFIX)
+
+
+def write_npy(path: str, columns: Dict[str, np.ndarray]) -> None:
+    """Write equally long columns as one structured .npy file (self-describing: field names + dtypes)."""
+    n = len(next(iter(columns.values())))
+    arr = np.empty(n, dtype=[(name, "<f8") for name in columns])
+    for name, values in columns.items():
+        arr[name] = values
+    np.save(path, arr)
+
+
+def append_rows(path: str, columns: Dict[str, np.ndarray]) -> None:
+    """
+    Append equally long columns to a partition, creating it if needed.
+
+    Columns of an existing file that are not given are written as NaN. A
+    .npy file gets the raw records at its end and then its header's row
+    count rewritten in place (np.save leaves room for the count to grow).
+    """
+    n = len(next(iter(columns.values())))
+    if not os.path.exists(path):
+        if is_binary(path):
+            write_npy(path, columns)
+        else:
+            import pandas as pd
+            pd.DataFrame(columns).to_csv(path, index=False)
+        return
+    if not is_binary(path):
+        import pandas as pd
+        with open(path, "rb") as f:
+            names = f.readline().decode().strip().split(",")
+        df = pd.DataFrame({name: columns.get(name, np.full(n, np.nan)) for name in names})
+        df.to_csv(path, mode="a", header=False, index=False)
+        return
+    with open(path, "r+b") as f:
+        version, (shape, fortran, dtype), start = _npy_header(f)
+        arr = np.empty(n, dtype=dtype)
+        for name in dtype.names:
+            arr[name] = columns.get(name, np.nan)
+        f.seek(0, os.SEEK_END)
+        f.write(arr.tobytes())
+        f.seek(0)
+        header = {"shape": (shape[0] + n,), "fortran_order": fortran, "descr": np.lib.format.dtype_to_descr(dtype)}
+        if version == (1, 0):
+            np.lib.format.write_array_header_1_0(f, header)
+        else:
+            np.lib.format.write_array_header_2_0(f, header)
+        if f.tell() != start:
+            raise ValueError(f"{path}: the .npy header cannot grow in place; rewrite the file with write_npy")
+
+
+def _npy_header(f):
+    version = np.lib.format.read_magic(f)
+    read = np.lib.format.read_array_header_1_0 if version == (1, 0) else np.lib.format.read_array_header_2_0
+    return version, read(f), f.tell()
+
+
+class PartitionTail:
+    """
+    Reader of the rows appended to a partition since its previous read().
+
+    `offset` is in bytes for CSV (always at a line end) and in rows for .npy,
+    where the row count comes from the file size, so rows appended before
+    the header was updated are already visible. A partly written last line
+    or record is left for the next read.
+    """
+
+    def __init__(self, path: str, column: str) -> None:
+        self.path = path
+        self.column = column
+        self.offset = 0
+        self._names: list | None = None  # CSV header
+        self._dtype: np.dtype | None = None  # .npy record type
+        self._start = 0  # first data byte
+
+    def read(self) -> np.ndarray:
+        """The column's new rows as a float array (empty if nothing was appended)."""
+        with open(self.path, "rb") as f:
+            if is_binary(self.path):
+                return self._read_npy(f)
+            return self._read_csv(f)
+
+    def _read_npy(self, f) -> np.ndarray:
+        if self._dtype is None:
+            _, (_, _, self._dtype), self._start = _npy_header(f)
+        rows = (os.fstat(f.fileno()).st_size - self._start) // self._dtype.itemsize
+        f.seek(self._start + self.offset * self._dtype.itemsize)
+        arr = np.frombuffer(f.read((rows - self.offset) * self._dtype.itemsize), dtype=self._dtype)
+        self.offset = rows
+        col = arr if arr.dtype.names is None else arr[self.column]
+        return np.asarray(col, dtype=float)
+
+    def _read_csv(self, f) -> np.ndarray:
+        if self._names is None:
+            line = f.readline()
+            if not line.endswith(b"\n"):
+                return np.empty(0)  # header not complete yet
+            self._names = line.decode().strip().split(",")
+            self.offset = self._start = len(line)
+        f.seek(self.offset)
+        data = f.read()
+        end = data.rfind(b"\n") + 1
+        if end == 0:
+            return np.empty(0)
+        self.offset += end
+        import pandas as pd
+        df = pd.read_csv(io.BytesIO(data[:end]), header=None, names=self._names, usecols=[self.column])
+        return df[self.column].to_numpy(dtype=float)
+
+
+def map_column(path: str, column: str) -> np.ndarray:
+    """Memory-map one column of a .npy partition; no parse and no copy for float64 data."""
+    arr = np.load(path, mmap_mode="r")
+    col = arr if arr.dtype.names is None else arr[column]
+    return np.asarray(col, dtype=float)
+
+
+def iter_chunks(path: str, column: str, chunk_rows: int) -> Iterator[np.ndarray]:
+    """Read one column of a partition in chunks of at most `chunk_rows` rows."""
+    if is_binary(path):
+        col = map_column(path, column)
+        for start in range(0, col.size, chunk_rows):
+            yield col[start:start + chunk_rows]
+        return
+    import pandas as pd  # imported on first CSV read, see load_partition
+    for df in pd.read_csv(path, usecols=[column], chunksize=chunk_rows):
+        yield df[column].to_numpy(dtype=float)
+
+
+def _moments(x: np.ndarray) -> Tuple[int, float, float, float, float, Moments]:
+    if x.size == 0:
+        return 0, 0.0, 0.0, np.inf, -np.inf, central_moments(x)
+    # np.dot avoids materializing x * x as a second full-size temporary
+    return int(x.size), float(np.sum(x)), float(np.dot(x, x)), float(x.min()), float(x.max()), central_moments(x)
+
+
+def column_range(path: str, column: str, chunk_rows: int = 1_000_000) -> Tuple[float, float]:
+    """(min, max) of one column, streamed; (inf, -inf) for an empty partition."""
+    lo, hi = np.inf, -np.inf
+    for x in iter_chunks(path, column, chunk_rows):
+        if x.size:
+            lo, hi = min(lo, float(x.min())), max(hi, float(x.max()))
+    return lo, hi
+
+
+def _counts(x: np.ndarray, bins: int, range_: Tuple[float, float]) -> np.ndarray:
+    return np.histogram(x, bins=bins, range=range_)[0].astype(np.int64)
+
+
+def _reduce(chunks, fn, executor: Executor | None, max_pending: int):
+    """Map `fn` over chunks, keeping at most `max_pending` chunks alive at once."""
+    if executor is None:
+        for x in chunks:
+            yield fn(x)
+        return
+    pending: deque = deque()
+    for x in chunks:
+        pending.append(executor.submit(fn, x))
+        if len(pending) >= max_pending:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+
+def stream_stats(
+    path: str,
+    column: str,
+    chunk_rows: int,
+    bins: int = 10,
+    range_: Tuple[float, float] | None = None,
+    threads: int = 1,
+    sketch: TDigest | None = None,
+) -> Tuple[int, float, float, np.ndarray, np.ndarray, Moments]:
+    """
+    Compute (n, sum, sum of squares, hist counts, hist edges, central moments) with bounded memory.
+
+    Peak memory is about (2 * threads) chunks regardless of partition size.
+    Without a fixed `range_` the histogram edges depend on the global min/max,
+    so the partition is streamed twice: once for moments and range, once for counts.
+    With `sketch`, each chunk's digest is merged into it during the first pass.
+    """
+    executor = ThreadPoolExecutor(max_workers=threads) if threads > 1 else None
+    max_pending = 2 * threads
+    try:
+        n, s, s2 = 0, 0.0, 0.0
+        central = central_moments(np.empty(0))
+        lo, hi = np.inf, -np.inf
+        counts = np.zeros(bins, dtype=np.int64)
+        fixed = range_ is not None
+
+        def first_pass(x):
+            digest = TDigest.from_array(x, sketch.compression) if sketch is not None else None
+            return _moments(x), (_counts(x, bins, range_) if fixed else None), digest
+
+        for (cn, cs, cs2, cmin, cmax, cmoments), ccounts, cdigest in _reduce(
+            iter_chunks(path, column, chunk_rows), first_pass, executor, max_pending
+        ):
+            if cdigest is not None:
+                sketch.merge(cdigest)
+            central = combine_moments(central, cmoments)
+            n += cn
+            s += cs
+            s2 += cs2
+            lo, hi = min(lo, cmin), max(hi, cmax)
+            if fixed:
+                counts += ccounts
+
+        if not fixed:
+            if n == 0:
+                counts, edges = np.histogram(np.empty(0), bins=bins)
+                return n, s, s2, counts.astype(np.int64), edges, central
+            range_ = (lo, hi)
+            for ccounts in _reduce(
+                iter_chunks(path, column, chunk_rows),
+                lambda x: _counts(x, bins, range_),
+                executor,
+                max_pending,
+            ):
+                counts += ccounts
+
+        # Same edges np.histogram would produce over the whole array
+        edges = np.histogram(np.empty(0), bins=bins, range=range_)[1]
+        return n, s, s2, counts, edges, central
+    finally:
+        if executor is not None:
+            executor.shutdown()
@@ -0,0 +1,132 @@
+from __future__ import annotations
+from typing import List, Tuple
+import math
+import numpy as np
+
+
+'''
+Mergeable quantile sketch: a merging t-digest with the k1 scale function.
+
+A digest is a sorted list of centroids (mean, weight). Centroids are small
+near the tails and large in the middle, so extreme quantiles (p99, p99.9) stay
+accurate while the whole sketch is at most about compression / 2 centroids,
+whatever the amount of data behind it.
+
+TDigest.from_array() → sort once, then group the sorted values into
+centroids in a single vectorized pass (no per-element Python loop).
+
+TDigest.merge() → buffers the other digest's centroids; the buffer is
+compressed lazily, so folding in many client digests one by one costs
+O(c log c) per compression, not per merge.
+
+TDigest.quantile() → interpolates between centroid centres (and the exact
+min / max at the ends).
+'''
+
+# Merge buffered centroids once there are this many times `compression` of them
+BUFFER_FACTOR = 5
+
+
+def max_centroids(compression: float) -> int:
+    """Upper bound on the centroids a compressed digest keeps (sizes fixed-slot transports)."""
+    return int(compression // 2) + 2
+
+
+def _compress(means: np.ndarray, weights: np.ndarray, compression: float) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Group centroids sorted by mean so that each group spans at most one unit
+    of k1(q) = compression / (2 pi) * asin(2q - 1), measured at the groups'
+    left edges; returns the merged (means, weights).
+    """
+    if means.size == 0:
+        return means, weights
+    total = weights.sum()
+    left = (np.cumsum(weights) - weights) / total
+    k = compression / (2 * math.pi) * np.arcsin(np.clip(2 * left - 1, -1.0, 1.0))
+    group = np.floor(k + compression / 4).astype(np.int64)
+    starts = np.flatnonzero(np.r_[True, group[1:] != group[:-1]])
+    w = np.add.reduceat(weights, starts)
+    m = np.add.reduceat(means * weights, starts) / w
+    return m, w
+
+
+class TDigest:
+    """Mergeable quantile sketch with memory bounded by `compression`."""
+
+    def __init__(self, compression: float = 200.0) -> None:
+        self.compression = float(compression)
+        self.means = np.empty(0)
+        self.weights = np.empty(0)
+        self.min = math.inf
+        self.max = -math.inf
+        self._buffer: List[Tuple[np.ndarray, np.ndarray]] = []
+        self._buffered = 0
+
+    @classmethod
+    def from_array(cls, x: np.ndarray, compression: float = 200.0) -> "TDigest":
+        """Digest of raw values."""
+        d = cls(compression)
+        x = np.sort(np.asarray(x, dtype=float).ravel())
+        if x.size:
+            d.means, d.weights = _compress(x, np.ones(x.size), d.compression)
+            d.min, d.max = float(x[0]), float(x[-1])
+        return d
+
+    @classmethod
+    def from_centroids(cls, means, weights, compression: float, min_: float, max_: float) -> "TDigest":
+        """Rebuild a digest from its parts (e.g. after decoding it from the wire)."""
+        d = cls(compression)
+        d.means = np.asarray(means, dtype=float)
+        d.weights = np.asarray(weights, dtype=float)
+        d.min, d.max = float(min_), float(max_)
+        return d
+
+    @property
+    def count(self) -> float:
+        """Total weight, i.e. number of values summarized."""
+        return float(self.weights.sum()) + sum(float(w.sum()) for _, w in self._buffer)
+
+    def merge(self, other: "TDigest") -> "TDigest":
+        """Fold another digest into this one."""
+        m, w = other.centroids()
+        if m.size == 0:
+            return self
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self._buffer.append((m, w))
+        self._buffered += m.size
+        if self._buffered > BUFFER_FACTOR * self.compression:
+            self._flush()
+        return self
+
+    def _flush(self) -> None:
+        if not self._buffer:
+            return
+        means = np.concatenate([self.means] + [m for m, _ in self._buffer])
+        weights = np.concatenate([self.weights] + [w for _, w in self._buffer])
+        order = np.argsort(means, kind="stable")
+        self.means, self.weights = _compress(means[order], weights[order], self.compression)
+        self._buffer.clear()
+        self._buffered = 0
+
+    def centroids(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Compressed (means, weights), sorted by mean."""
+        self._flush()
+        return self.means, self.weights
+
+    def quantile(self, q):
+        """Estimated q-quantile (q in [0, 1], scalar or array); nan for an empty digest."""
+        means, weights = self.centroids()
+        q = np.asarray(q, dtype=float)
+        if means.size == 0:
+            return np.full(q.shape, np.nan) if q.ndim else math.nan
+        total = weights.sum()
+        centres = np.cumsum(weights) - weights / 2
+        ranks = np.r_[0.0, centres, total]
+        values = np.r_[self.min, means, self.max]
+        out = np.interp(q * total, ranks, values)
+        return out if q.ndim else float(out)
+
+    def copy(self) -> "TDigest":
+        means, weights = self.centroids()
+        return TDigest.from_centroids(means.copy(), weights.copy(), self.compression, self.min, self.max)
@@ -0,0 +1,231 @@
+from __future__ import annotations
+import struct
+from typing import Tuple
+import numpy as np
+
+from SimuFed.utils.aggregator import MARKS, Summary
+from SimuFed.utils.columns import ColumnStats
+from SimuFed.utils.groups import GroupStats
+from SimuFed.utils.sketch import TDigest
+
+
+'''
+Fixed-layout binary encoding of a Summary, used on the client → coordinator queue.
+
+    header   magic, version, flags, client_id, partition_id, round_id, members, n, s, s2,
+             m2, m3, m4 (NaN if not computed), lo, hi, bins
+    counts   int64[bins]          (little-endian, contiguous)
+    edges    float64[bins + 1]    (omitted when FLAG_GRID is set)
+    marks    float64[len(MARKS)]  (phase timestamps, NaN if unset; only with FLAG_MARKS)
+    sketch   count, compression, min, max, means float64[count], weights float64[count]
+             (quantile sketch; only with FLAG_SKETCH)
+    columns  k, bins, has_comoment, names length, names (UTF-8, NUL-separated),
+             mean/m2/m3/m4 float64[k], counts int64[k, bins], edges float64[k, bins + 1],
+             comoment float64[k, k] if has_comoment  (only with FLAG_COLUMNS)
+    groups   k, bins (0 = no histograms), key kind (0 int64, 1 float64, 2 UTF-8 text),
+             text length, keys (int64/float64[k], or NUL-separated text), n int64[k],
+             s/s2/m2 float64[k], counts int64[k, bins], edges float64[bins + 1]
+             (only with FLAG_GROUPS)
+
+When the edges are exactly np.linspace(lo, hi, bins + 1) — which is what
+np.histogram produces, and what a negotiated grid means — only (lo, hi) travel
+in the header and the decoder rebuilds the identical edges.
+Decoding returns NumPy views into the buffer, so nothing is converted back
+from Python lists.
+'''
+
+MAGIC = b"SFS"
+VERSION = 6
+FLAG_GRID = 0x1
+FLAG_MARKS = 0x2
+FLAG_SKETCH = 0x4
+FLAG_COLUMNS = 0x8
+FLAG_GROUPS = 0x10
+
+_HEADER = struct.Struct("<3sBHqqqqqdddddddI")
+_SKETCH = struct.Struct("<Iddd")
+_COLUMNS = struct.Struct("<IIBI")
+_GROUPS = struct.Struct("<IIBI")
+_KEY_INT, _KEY_FLOAT, _KEY_TEXT = 0, 1, 2
+
+
+def _grid_edges(lo: float, hi: float, bins: int) -> np.ndarray:
+    return np.linspace(lo, hi, bins + 1)
+
+
+def _central(summary: Summary) -> Tuple[float, float, float]:
+    return tuple(np.nan if m is None else m for m in (summary.m2, summary.m3, summary.m4))
+
+
+def encode_summary(summary: Summary, grid: Tuple[float, float] | None = None) -> bytes:
+    """
+    Pack a Summary into bytes.
+
+    `grid` is the (lo, hi) range both sides agreed on; without it the edges'
+    own first/last values are tried. Edges are sent explicitly only when they
+    do not match that uniform grid.
+    """
+    counts = np.ascontiguousarray(summary.hist_counts, dtype="<i8")
+    edges = np.asarray(summary.hist_edges, dtype="<f8")
+    bins = counts.size
+
+    flags = 0
+    lo = hi = 0.0
+    if edges.size == bins + 1 and bins > 0:
+        lo, hi = grid if grid is not None else (float(edges[0]), float(edges[-1]))
+        if np.array_equal(edges, _grid_edges(lo, hi, bins)):
+            flags |= FLAG_GRID
+    if summary.marks:
+        flags |= FLAG_MARKS
+    if summary.sketch is not None:
+        flags |= FLAG_SKETCH
+    if summary.columns is not None:
+        flags |= FLAG_COLUMNS
+    if summary.groups is not None:
+        flags |= FLAG_GROUPS
+
+    header = _HEADER.pack(
+        MAGIC, VERSION, flags,
+        summary.client_id, summary.partition_id, summary.round_id, summary.members, summary.n,
+        summary.s, summary.s2, *_central(summary), lo, hi,
+        bins,
+    )
+    parts = [header, counts.tobytes()]
+    if not flags & FLAG_GRID:
+        parts.append(np.ascontiguousarray(edges).tobytes())
+    if flags & FLAG_MARKS:
+        parts.append(np.array([summary.marks.get(k, np.nan) for k in MARKS], dtype="<f8").tobytes())
+    if flags & FLAG_SKETCH:
+        sk = summary.sketch
+        means, weights = sk.centroids()
+        parts.append(_SKETCH.pack(means.size, sk.compression, sk.min, sk.max))
+        parts.append(np.ascontiguousarray(means, dtype="<f8").tobytes())
+        parts.append(np.ascontiguousarray(weights, dtype="<f8").tobytes())
+    if flags & FLAG_COLUMNS:
+        cs = summary.columns
+        names = "\0".join(cs.names).encode()
+        has_comoment = cs.comoment is not None
+        parts.append(_COLUMNS.pack(len(cs.names), cs.hist_counts.shape[1], has_comoment, len(names)))
+        parts.append(names)
+        parts.append(np.concatenate([cs.mean, cs.m2, cs.m3, cs.m4]).astype("<f8").tobytes())
+        parts.append(np.ascontiguousarray(cs.hist_counts, dtype="<i8").tobytes())
+        parts.append(np.ascontiguousarray(cs.hist_edges, dtype="<f8").tobytes())
+        if has_comoment:
+            parts.append(np.ascontiguousarray(cs.comoment, dtype="<f8").tobytes())
+    if flags & FLAG_GROUPS:
+        parts.extend(_encode_groups(summary.groups))
+    return b"".join(parts)
+
+
+def _encode_groups(gs: GroupStats) -> list:
+    kind = {"i": _KEY_INT, "u": _KEY_INT, "b": _KEY_INT, "f": _KEY_FLOAT}.get(gs.keys.dtype.kind, _KEY_TEXT)
+    if kind == _KEY_TEXT:
+        keys = "\0".join(map(str, gs.keys)).encode()
+    else:
+        keys = gs.keys.astype("<i8" if kind == _KEY_INT else "<f8").tobytes()
+    bins = 0 if gs.hist_counts is None else gs.hist_counts.shape[1]
+    parts = [_GROUPS.pack(len(gs), bins, kind, len(keys) if kind == _KEY_TEXT else 0), keys,
+             np.ascontiguousarray(gs.n, dtype="<i8").tobytes(),
+             np.concatenate([gs.s, gs.s2, gs.m2]).astype("<f8").tobytes()]
+    if bins:
+        parts.append(np.ascontiguousarray(gs.hist_counts, dtype="<i8").tobytes())
+        parts.append(np.ascontiguousarray(gs.hist_edges, dtype="<f8").tobytes())
+    return parts
+
+
+def decode_summary(buf: bytes) -> Summary:
+    """Unpack bytes produced by encode_summary(); arrays are views into `buf`."""
+    (magic, version, flags, client_id, partition_id, round_id, members, n, s, s2, m2, m3, m4, lo, hi, bins) = \
+        _HEADER.unpack_from(buf, 0)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError(f"not a SimuFed summary (magic={magic!r}, version={version})")
+
+    offset = _HEADER.size
+    counts = np.frombuffer(buf, dtype="<i8", count=bins, offset=offset)
+    offset += 8 * bins
+    if flags & FLAG_GRID:
+        edges = _grid_edges(lo, hi, bins)
+    else:
+        edges = np.frombuffer(buf, dtype="<f8", count=bins + 1 if bins else 0, offset=offset)
+        offset += edges.nbytes
+    marks = {}
+    if flags & FLAG_MARKS:
+        stamps = np.frombuffer(buf, dtype="<f8", count=len(MARKS), offset=offset)
+        marks = {k: float(v) for k, v in zip(MARKS, stamps) if not np.isnan(v)}
+        offset += stamps.nbytes
+    sketch = None
+    if flags & FLAG_SKETCH:
+        count, compression, lo_x, hi_x = _SKETCH.unpack_from(buf, offset)
+        offset += _SKETCH.size
+        means = np.frombuffer(buf, dtype="<f8", count=count, offset=offset)
+        weights = np.frombuffer(buf, dtype="<f8", count=count, offset=offset + 8 * count)
+        sketch = TDigest.from_centroids(means, weights, compression, lo_x, hi_x)
+        offset += 16 * count
+    columns = groups = None
+    if flags & FLAG_COLUMNS:
+        columns, offset = _decode_columns(buf, offset, n)
+    if flags & FLAG_GROUPS:
+        groups = _decode_groups(buf, offset)
+
+    return Summary(
+        client_id=client_id,
+        n=n,
+        s=s,
+        s2=s2,
+        hist_counts=counts,
+        hist_edges=edges,
+        round_id=round_id,
+        members=members,
+        marks=marks,
+        partition_id=partition_id,
+        sketch=sketch,
+        m2=None if np.isnan(m2) else m2,
+        m3=None if np.isnan(m3) else m3,
+        m4=None if np.isnan(m4) else m4,
+        columns=columns,
+        groups=groups,
+    )
+
+
+def _decode_columns(buf: bytes, offset: int, n: int) -> Tuple[ColumnStats, int]:
+    k, bins, has_comoment, names_len = _COLUMNS.unpack_from(buf, offset)
+    offset += _COLUMNS.size
+    names = bytes(buf[offset:offset + names_len]).decode().split("\0")
+    offset += names_len
+
+    def take(dtype, shape):
+        nonlocal offset
+        arr = np.frombuffer(buf, dtype=dtype, count=int(np.prod(shape)), offset=offset).reshape(shape)
+        offset += arr.nbytes
+        return arr
+
+    mean, m2, m3, m4 = take("<f8", (4, k))
+    counts = take("<i8", (k, bins))
+    edges = take("<f8", (k, bins + 1))
+    comoment = take("<f8", (k, k)) if has_comoment else None
+    return ColumnStats(names, n, mean, m2, m3, m4, counts, edges, comoment), offset
+
+
+def _decode_groups(buf: bytes, offset: int) -> GroupStats:
+    k, bins, kind, text_len = _GROUPS.unpack_from(buf, offset)
+    offset += _GROUPS.size
+
+    def take(dtype, shape):
+        nonlocal offset
+        arr = np.frombuffer(buf, dtype=dtype, count=int(np.prod(shape)), offset=offset).reshape(shape)
+        offset += arr.nbytes
+        return arr
+
+    if kind == _KEY_TEXT:
+        text = bytes(buf[offset:offset + text_len]).decode()
+        keys = np.array(text.split("\0") if k else [], dtype=object)
+        offset += text_len
+    else:
+        keys = take("<i8" if kind == _KEY_INT else "<f8", (k,))
+    n = take("<i8", (k,))
+    s, s2, m2 = take("<f8", (3, k))
+    counts = edges = None
+    if bins:
+        counts = take("<i8", (k, bins))
+        edges = take("<f8", (bins + 1,))
+    return GroupStats(keys, n, s, s2, m2, counts, edges)
@@ -0,0 +1,132 @@
+from __future__ import annotations
+import heapq
+import itertools
+from queue import Empty
+from typing import Any, Dict, List
+
+import numpy as np
+
+from SimuFed.client import ClientConfig, keep_in_memory, local_summary
+from SimuFed.fault_simulator import fault_rng, sample_fault
+
+
+class VirtualClock:
+    """Simulated time in seconds; only moves when the event queue says so."""
+
+    def __init__(self, start: float = 0.0) -> None:
+        self.now = start
+
+    def time(self) -> float:
+        return self.now
+
+    def advance_to(self, t: float) -> None:
+        self.now = max(self.now, t)
+
+
+class EventQueue:
+    """
+    Result channel for the discrete-event mode.
+
+    Messages are scheduled at a virtual arrival time. get(timeout=...) has the
+    same contract as multiprocessing.Queue.get: it returns the next message if
+    one arrives within `timeout` (jumping the clock to its arrival time), and
+    otherwise jumps the clock by `timeout` and raises queue.Empty.
+    """
+
+    def __init__(self, clock: VirtualClock) -> None:
+        self.clock = clock
+        self._heap: List[tuple[float, int, Any]] = []
+        self._seq = itertools.count()  # FIFO among equal arrival times
+
+    def put_at(self, t: float, item: Any) -> None:
+        heapq.heappush(self._heap, (t, next(self._seq), item))
+
+    def get(self, timeout: float | None = None) -> Any:
+        if self._heap and (timeout is None or self._heap[0][0] <= self.clock.now + timeout):
+            t, _, item = heapq.heappop(self._heap)
+            self.clock.advance_to(t)
+            return item
+        if timeout is not None:
+            self.clock.advance_to(self.clock.now + timeout)
+        raise Empty
+
+
+class VirtualClientPool:
+    """
+    Drop-in replacement for ClientPool that runs clients on a virtual clock.
+
+    Clients are simulated in-process: partitions are loaded once and kept,
+    statistics are computed for real, and the fault delay becomes the arrival
+    time of an event instead of a sleep. Compute time is not modelled, so a
+    client's answer arrives exactly `delay` seconds after the round starts.
+
+    Like a real pooled worker, a client still "sleeping" on a previous round
+    only starts the next round once that delay is over.
+    """
+
+    def __init__(self, clients: List[ClientConfig]) -> None:
+        self.clients = list(clients)
+        self.clock = VirtualClock()
+        self.results = EventQueue(self.clock)
+        self.round_id = 0
+        self._data: Dict[int, np.ndarray | None] = {}
+        self._rngs = {cfg.client_id: fault_rng(cfg.faults, cfg.client_id) for cfg in self.clients}
+        self._busy_until = {cfg.client_id: 0.0 for cfg in self.clients}
+
+    def start(self) -> "VirtualClientPool":
+        for cfg in self.clients:
+            if cfg.client_id not in self._data:
+                self._data[cfg.client_id] = keep_in_memory(cfg)
+        return self
+
+    def start_round(self) -> int:
+        """Schedule every client's answer for a new round; returns the round id."""
+        self.round_id += 1
+        for cfg in self.clients:
+            self._schedule(cfg)
+        return self.round_id
+
+    def launch(self, cfg: ClientConfig) -> None:
+        """Start one extra client (e.g. a backup) in the current round, at the current time."""
+        if cfg.client_id not in self._data:
+            self._data[cfg.client_id] = keep_in_memory(cfg)
+            self._rngs[cfg.client_id] = fault_rng(cfg.faults, cfg.client_id)
+            self._busy_until[cfg.client_id] = 0.0
+        self._schedule(cfg)
+
+    def _schedule(self, cfg: ClientConfig) -> None:
+        summary = local_summary(cfg, self._data[cfg.client_id], round_id=self.round_id)
+        delay, should_drop = sample_fault(cfg.faults, self._rngs[cfg.client_id])
+        begin = max(self.clock.now, self._busy_until[cfg.client_id])
+        done = begin + delay
+        self._busy_until[cfg.client_id] = done
+        # compute takes no virtual time; the whole phase budget is the delay
+        summary.marks = {"start": begin, "loaded": begin, "computed": begin, "delayed": done}
+        if should_drop:
+            print(f"[Client {cfg.client_id}] Dropped update.")
+            return
+        self.results.put_at(done, summary)
+
+    def close(self) -> None:
+        self._data.clear()
+
+    def __enter__(self) -> "VirtualClientPool":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+'''
+Discrete-event mode in three pieces:
+
+    VirtualClock → a float that the event queue advances; nothing ever sleeps.
+
+    EventQueue → a heap of (arrival_time, message); get(timeout) behaves like
+    Queue.get(timeout), so the coordinators' collection loops run unchanged.
+
+    VirtualClientPool → same interface as ClientPool (start / start_round /
+    results / close), with fault delays turned into scheduled arrivals.
+
+Fault draws go through sample_fault() with the same per-client seeded RNG as
+the real workers, so a seeded run drops the same clients with the same delays.
+'''
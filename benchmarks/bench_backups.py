@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Tail latency vs. extra compute for speculative backup clients.
+
+Runs many seeded sync rounds on the virtual clock (so only simulated delays
+and dropouts count, and each round costs milliseconds) for several backup
+policies, and reports per policy:
+
+    p50 / p95 / max   → round duration in simulated seconds
+    complete          → fraction of partitions that made it into the aggregate
+    clients/partition → processes a real run would start: 1 + backups / partitions
+
+Usage:
+    python benchmarks/bench_backups.py --partitions 50 --rounds 200 --drop-prob 0.1 --max-delay 3
+"""
+from __future__ import annotations
+
+import argparse
+import contextlib
+import io
+import sys
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))  # repo root, for SimuFed
+from SimuFed.client import ClientConfig
+from SimuFed.coordinator import Coordinator
+from SimuFed.fault_simulator import FaultConfig
+from SimuFed.speculation import BackupPolicy
+from SimuFed.utils.ingest import write_npy
+
+POLICIES = {
+    "none": None,
+    "replicas=1": BackupPolicy(replicas=1),
+    "hedge p50": BackupPolicy(hedge_percentile=0.5, min_samples=5),
+    "hedge p90": BackupPolicy(hedge_percentile=0.9, min_samples=5),
+    "hedge 1.0s": BackupPolicy(hedge_after_s=1.0),
+}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Backup-client tail-latency benchmark (virtual clock)")
+    parser.add_argument("--partitions", type=int, default=50)
+    parser.add_argument("--rounds", type=int, default=200)
+    parser.add_argument("--drop-prob", type=float, default=0.1)
+    parser.add_argument("--max-delay", type=float, default=3.0)
+    parser.add_argument("--timeout", type=float, default=10.0)
+    args = parser.parse_args()
+
+    print(f"{'policy':<12} {'p50 s':>7} {'p95 s':>7} {'max s':>7} {'complete':>9} {'clients/partition':>18}")
+    with tempfile.TemporaryDirectory() as tmp:
+        rng = np.random.default_rng(0)
+        paths = []
+        for k in range(args.partitions):
+            paths.append(str(Path(tmp) / f"p{k}.npy"))
+            write_npy(paths[-1], {"value": rng.normal(size=100)})
+
+        for name, policy in POLICIES.items():
+            durations, complete, extra = [], [], []
+            coord = Coordinator(timeout_s=args.timeout, virtual_clock=True, backups=policy)
+            for seed in range(args.rounds):
+                faults = FaultConfig(drop_prob=args.drop_prob, max_delay_s=args.max_delay, seed=seed)
+                clients = [ClientConfig(client_id=k + 1, csv_path=p, faults=faults) for k, p in enumerate(paths)]
+                with contextlib.redirect_stdout(io.StringIO()):
+                    r = coord.run_round(clients)
+                durations.append(r.duration_s)
+                complete.append(len(r.summaries) / args.partitions)
+                extra.append(r.backups_launched / args.partitions)
+            d = np.array(durations)
+            print(f"{name:<12} {np.percentile(d, 50):>7.2f} {np.percentile(d, 95):>7.2f} {d.max():>7.2f} "
+                  f"{np.mean(complete):>9.3f} {1 + np.mean(extra):>18.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Batched in-process summaries vs. per-partition work.
+
+Times, for --partitions partitions of --rows rows (written as .npy):
+
+    coordinator  → one sync round: a client process per partition
+    loop         → summarize() per partition in this process
+    batch        → BatchEngine: all partitions in a few vectorized calls
+                   (load included; "batch compute" excludes it)
+
+and checks that the batch aggregate agrees with the exact statistics
+(check_aggregate) and with the coordinator's.
+
+Usage:
+    python benchmarks/bench_batch.py --partitions 200 --rows 10000
+"""
+from __future__ import annotations
+
+import argparse
+import contextlib
+import io
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))  # repo root, for SimuFed
+from SimuFed.batch import BatchEngine, batch_summaries, check_aggregate, load_partitions
+from SimuFed.client import ClientConfig, load_partition, summarize
+from SimuFed.coordinator import Coordinator
+from SimuFed.utils.aggregator import merge_summaries
+from SimuFed.utils.ingest import write_npy
+
+
+def timed(fn):
+    t0 = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        out = fn()
+    return time.perf_counter() - t0, out
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Batch engine benchmark")
+    parser.add_argument("--partitions", type=int, default=200)
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--bins", type=int, default=10)
+    parser.add_argument("--skip-coordinator", action="store_true")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    with tempfile.TemporaryDirectory() as tmp:
+        clients = []
+        for k in range(args.partitions):
+            path = str(Path(tmp) / f"p{k}.npy")
+            write_npy(path, {"value": rng.normal(loc=1e6 + k, size=args.rows)})
+            clients.append(ClientConfig(client_id=k + 1, csv_path=path, bins=args.bins))
+
+        rows = []
+        if not args.skip_coordinator:
+            t, result = timed(lambda: Coordinator(timeout_s=600).run_round(clients))
+            rows.append(("coordinator", t))
+            coord_agg = result.aggregated
+        t, _ = timed(lambda: merge_summaries([summarize(c, load_partition(c)) for c in clients]))
+        rows.append(("loop", t))
+        t, result = timed(lambda: BatchEngine().run_round(clients))
+        rows.append(("batch", t))
+        values, offsets = load_partitions(clients)
+        t, _ = timed(lambda: batch_summaries(clients, values, offsets))
+        rows.append(("batch compute", t))
+
+        total = args.partitions * args.rows
+        print(f"{args.partitions} partitions x {args.rows} rows")
+        print(f"{'engine':<14} {'seconds':>9} {'Mrows/s':>9}")
+        for name, seconds in rows:
+            print(f"{name:<14} {seconds:>9.4f} {total / seconds / 1e6:>9.1f}")
+
+        problems = check_aggregate(result.aggregated, clients)
+        print("batch vs exact:", "OK" if not problems else "; ".join(problems))
+        if not args.skip_coordinator:
+            problems = check_aggregate(coord_agg, clients)
+            print("coordinator vs exact:", "OK" if not problems else "; ".join(problems))
+
+
+if __name__ == "__main__":
+    main()
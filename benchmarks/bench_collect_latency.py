@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Microbenchmark: fixed-interval queue polling vs. deadline-driven blocking.
+
+Compares the old collection loops (q.get(timeout=0.1) in the sync coordinator,
+queue.get(timeout=0.2) in the async one) with the event-driven loops that now
+block on the result queue until the next message or the exact deadline.
+
+For each loop it reports
+    overshoot  → how long after the timeout / grace deadline the loop noticed it
+    wakeups    → how many times the loop woke up during the round
+
+Usage:
+    python benchmarks/bench_collect_latency.py --trials 10 --timeout 0.52 --grace 0.25
+"""
+from __future__ import annotations
+
+import argparse
+import statistics
+import time
+from multiprocessing import Process, Queue
+from queue import Empty
+
+
+def producer(q: Queue, delays: list[float]) -> None:
+    """Send one message per delay (seconds from start); never sends if delays is empty."""
+    start = time.time()
+    for d in delays:
+        time.sleep(max(start + d - time.time(), 0.0))
+        q.put(time.time())
+
+
+# --- sync coordinator loops -------------------------------------------------
+
+def sync_polling(q: Queue, expected: int, timeout_s: float) -> tuple[float, int]:
+    start = time.time()
+    deadline = start + timeout_s
+    remaining, wakeups = expected, 0
+    while time.time() < deadline and remaining > 0:
+        wakeups += 1
+        try:
+            q.get(timeout=0.1)
+            remaining -= 1
+        except Exception:
+            pass
+    return time.time() - deadline, wakeups
+
+
+def sync_event(q: Queue, expected: int, timeout_s: float) -> tuple[float, int]:
+    start = time.time()
+    deadline = start + timeout_s
+    remaining, wakeups = expected, 0
+    while remaining > 0:
+        wait_s = deadline - time.time()
+        if wait_s <= 0:
+            break
+        wakeups += 1
+        try:
+            q.get(timeout=wait_s)
+        except Empty:
+            break
+        remaining -= 1
+    return time.time() - deadline, wakeups
+
+
+# --- async coordinator loops ------------------------------------------------
+# Both return (time past the grace deadline after the last message, wakeups).
+
+def async_polling(q: Queue, expected: int, timeout_s: float, grace_s: float) -> tuple[float, int]:
+    start = time.time()
+    last, wakeups, got = None, 0, 0
+    while True:
+        now = time.time()
+        if now - start >= timeout_s:
+            break
+        if last is not None and now - last >= grace_s:
+            break
+        wakeups += 1
+        try:
+            q.get(timeout=0.2)
+        except Exception:
+            continue
+        last = time.time()
+        got += 1
+        if got == expected:
+            break
+    end_deadline = min(start + timeout_s, last + grace_s) if last is not None else start + timeout_s
+    return time.time() - end_deadline, wakeups
+
+
+def async_event(q: Queue, expected: int, timeout_s: float, grace_s: float) -> tuple[float, int]:
+    start = time.time()
+    last, wakeups, got = None, 0, 0
+    while True:
+        now = time.time()
+        if now - start >= timeout_s:
+            break
+        if last is not None and now - last >= grace_s:
+            break
+        wake_at = start + timeout_s
+        if last is not None:
+            wake_at = min(wake_at, last + grace_s)
+        wakeups += 1
+        try:
+            q.get(timeout=max(wake_at - now, 0.0))
+        except Empty:
+            continue
+        last = time.time()
+        got += 1
+        if got == expected:
+            break
+    end_deadline = min(start + timeout_s, last + grace_s) if last is not None else start + timeout_s
+    return time.time() - end_deadline, wakeups
+
+
+def run_trials(loop, trials: int, delays: list[float], expected: int, *loop_args) -> tuple[list[float], list[int]]:
+    overshoots, wakeups = [], []
+    for _ in range(trials):
+        q: Queue = Queue()
+        p = Process(target=producer, args=(q, delays), daemon=True)
+        p.start()
+        o, w = loop(q, expected, *loop_args)
+        p.join()
+        overshoots.append(o)
+        wakeups.append(w)
+    return overshoots, wakeups
+
+
+def report(name: str, overshoots: list[float], wakeups: list[int]) -> None:
+    ms = [o * 1000 for o in overshoots]
+    print(f"{name:<28} overshoot mean={statistics.mean(ms):7.2f} ms  "
+          f"max={max(ms):7.2f} ms  wakeups mean={statistics.mean(wakeups):6.1f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Collection-loop latency microbenchmark")
+    parser.add_argument("--trials", type=int, default=10)
+    parser.add_argument("--timeout", type=float, default=0.52)
+    parser.add_argument("--grace", type=float, default=0.25)
+    args = parser.parse_args()
+
+    # Sync: 2 expected results, only 1 arrives → the round must end at the timeout.
+    print("sync: one of two clients never reports (deadline decision)")
+    report("polling q.get(timeout=0.1)", *run_trials(sync_polling, args.trials, [0.05], 2, args.timeout))
+    report("event-driven", *run_trials(sync_event, args.trials, [0.05], 2, args.timeout))
+
+    # Async: 3 expected, 1 arrives early → the round must end at last update + grace.
+    print("async: one of three clients reports, round ends on grace")
+    report("polling queue.get(timeout=0.2)",
+           *run_trials(async_polling, args.trials, [0.05], 3, 10 * args.timeout, args.grace))
+    report("event-driven",
+           *run_trials(async_event, args.trials, [0.05], 3, 10 * args.timeout, args.grace))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Cost of multi-column summaries: one round over K columns vs. K single-column rounds.
+
+Writes --clients partitions with --columns columns each (CSV or .npy), then
+times real sync rounds (process start, load, statistics, send, merge):
+
+    per-column rounds → K rounds with ClientConfig(column=c), the old way
+    one round         → a single round with ClientConfig(columns=[...])
+    one round + cov   → the same, also merging the K × K covariance matrix
+
+and, for reference, one round over a single column.
+
+Usage:
+    python benchmarks/bench_columns.py --clients 8 --rows 200000 --columns 20 --format npy
+"""
+from __future__ import annotations
+
+import argparse
+import contextlib
+import io
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))  # repo root, for SimuFed
+from SimuFed.client import ClientConfig
+from SimuFed.coordinator import Coordinator
+from SimuFed.utils.ingest import write_npy
+
+
+def timed_rounds(coord: Coordinator, rounds) -> float:
+    t0 = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        for clients in rounds:
+            result = coord.run_round(clients)
+            assert len(result.summaries) == len(clients), "a client did not answer; raise --timeout"
+    return time.perf_counter() - t0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Multi-column summary benchmark")
+    parser.add_argument("--clients", type=int, default=8)
+    parser.add_argument("--rows", type=int, default=200_000, help="Rows per partition")
+    parser.add_argument("--columns", type=int, default=20)
+    parser.add_argument("--format", choices=["csv", "npy"], default="npy")
+    parser.add_argument("--timeout", type=float, default=120.0)
+    args = parser.parse_args()
+
+    names = [f"feat_{j}" for j in range(args.columns)]
+    rng = np.random.default_rng(0)
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = []
+        for k in range(args.clients):
+            x = rng.normal(size=(args.rows, args.columns)) * rng.uniform(1, 5, args.columns) + 1e6
+            path = str(Path(tmp) / f"p{k}.{args.format}")
+            if args.format == "npy":
+                write_npy(path, {c: x[:, j] for j, c in enumerate(names)})
+            else:
+                pd.DataFrame(x, columns=names).to_csv(path, index=False)
+            paths.append(path)
+
+        coord = Coordinator(timeout_s=args.timeout)
+
+        def configs(**kw):
+            return [ClientConfig(client_id=k + 1, csv_path=p, **kw) for k, p in enumerate(paths)]
+
+        cases = {
+            "one column": [configs(column=names[0])],
+            "per-column rounds": [configs(column=c) for c in names],
+            "one round": [configs(columns=names)],
+            "one round + cov": [configs(columns="feat_*", covariance=True)],
+        }
+        print(f"{args.clients} clients x {args.rows} rows x {args.columns} columns ({args.format})")
+        print(f"{'case':<18} {'rounds':>7} {'seconds':>9} {'s/column':>9}")
+        for name, rounds in cases.items():
+            seconds = timed_rounds(coord, rounds)
+            cols = 1 if name == "one column" else args.columns
+            print(f"{name:<18} {len(rounds):>7} {seconds:>9.3f} {seconds / cols:>9.4f}")
+
+
+if __name__ == "__main__":
+    main()
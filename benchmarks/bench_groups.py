@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Cost of group-by summaries at high key cardinality.
+
+Client side: GroupStats.from_arrays() on one partition vs. a pandas groupby.
+Coordinator side: merging --clients sparse tables, each holding --keys keys
+drawn from a space of --key-space, with
+
+    buffered   → RunningAggregate (tables compacted GROUP_BUFFER at a time)
+    pairwise   → merge every arriving table into the running one
+    one pass   → GroupStats.merge_many() over all tables at once
+
+Usage:
+    python benchmarks/bench_groups.py --clients 500 --keys 20000 --key-space 1000000
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))  # repo root, for SimuFed
+from SimuFed.utils.aggregator import RunningAggregate, Summary
+from SimuFed.utils.groups import GroupStats
+
+
+def timed(fn) -> tuple[float, object]:
+    t0 = time.perf_counter()
+    out = fn()
+    return time.perf_counter() - t0, out
+
+
+def pairwise(tables):
+    total = tables[0].copy()
+    for t in tables[1:]:
+        total.merge(t)
+    return total
+
+
+def buffered(tables):
+    agg = RunningAggregate()
+    for t in tables:
+        agg.add(Summary(client_id=0, n=0, s=0.0, s2=0.0, hist_counts=[], hist_edges=[], groups=t))
+    return agg.groups
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Group-by summary benchmark")
+    parser.add_argument("--clients", type=int, default=500)
+    parser.add_argument("--rows", type=int, default=100_000, help="Rows per partition (client-side case)")
+    parser.add_argument("--keys", type=int, default=20_000, help="Distinct keys per client")
+    parser.add_argument("--key-space", type=int, default=1_000_000)
+    parser.add_argument("--skip-pairwise", action="store_true")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    keys = rng.integers(0, args.key_space, args.rows)
+    x = rng.normal(size=args.rows)
+    t_ours, _ = timed(lambda: GroupStats.from_arrays(x, keys))
+    t_pd, _ = timed(lambda: pd.DataFrame({"k": keys, "x": x}).groupby("k")["x"].agg(["count", "sum", "var"]))
+    print(f"client: {args.rows} rows -> from_arrays {t_ours * 1e3:.1f} ms, pandas groupby {t_pd * 1e3:.1f} ms")
+
+    tables = []
+    for _ in range(args.clients):
+        k = np.sort(rng.choice(args.key_space, args.keys, replace=False))
+        n = rng.integers(1, 50, args.keys)
+        s = rng.normal(size=args.keys) * n
+        tables.append(GroupStats(k, n, s, s * s / n + n, n.astype(float)))
+
+    cases = {"buffered": buffered, "one pass": GroupStats.merge_many}
+    if not args.skip_pairwise:
+        cases["pairwise"] = pairwise
+    print(f"coordinator: {args.clients} tables x {args.keys} keys (key space {args.key_space})")
+    results = {}
+    for name, fn in cases.items():
+        seconds, merged = timed(lambda: fn(tables))
+        results[name] = merged
+        print(f"  {name:<9} {seconds:8.3f} s   {len(merged)} keys")
+    ref = results["one pass"]
+    for name, merged in results.items():
+        assert np.array_equal(merged.keys, ref.keys) and np.array_equal(merged.n, ref.n), name
+        assert np.allclose(merged.m2, ref.m2), name
+
+
+if __name__ == "__main__":
+    main()
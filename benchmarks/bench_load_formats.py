@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Load-time comparison: CSV partitions vs. memory-mapped .npy partitions.
+
+For each partition size it writes the same column in both formats to a
+temporary directory and times load_partition() alone and load + summarize(),
+i.e. what a client pays every time it (re)reads its data.
+
+Usage:
+    python benchmarks/bench_load_formats.py --rows 10000 100000 1000000 --repeat 5
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))  # repo root, for SimuFed
+from SimuFed.client import ClientConfig, load_partition, summarize
+from SimuFed.utils.ingest import write_npy
+
+
+def best_of(fn, repeat: int) -> float:
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - t0)
+    return min(times)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="CSV vs .npy partition load benchmark")
+    parser.add_argument("--rows", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    print(f"{'rows':>10} {'format':>6} {'size MB':>8} {'load ms':>9} {'load+stats ms':>14}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for rows in args.rows:
+            x = rng.normal(size=rows)
+            csv_path = Path(tmp) / f"p_{rows}.csv"
+            npy_path = Path(tmp) / f"p_{rows}.npy"
+            pd.DataFrame({"value": x}).to_csv(csv_path, index=False)
+            write_npy(str(npy_path), {"value": x})
+
+            results = {}
+            for fmt, path in (("csv", csv_path), ("npy", npy_path)):
+                cfg = ClientConfig(client_id=1, csv_path=str(path))
+                load = best_of(lambda: load_partition(cfg), args.repeat)
+                full = best_of(lambda: summarize(cfg, load_partition(cfg)), args.repeat)
+                results[fmt] = full
+                size_mb = path.stat().st_size / 1e6
+                print(f"{rows:>10} {fmt:>6} {size_mb:>8.2f} {load * 1e3:>9.3f} {full * 1e3:>14.3f}")
+            print(f"{'':>10} speedup (load+stats): {results['csv'] / results['npy']:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Accuracy and cost of the mergeable t-digest quantile sketch.
+
+Accuracy: the data is split across --clients partitions, each client builds
+its own digest, and the coordinator-side merge answers the quantiles. The
+error is reported as rank error, |F(estimate) - q| against the exact
+empirical CDF of the pooled data, so it is comparable across distributions.
+
+Cost, per compression:
+
+    build Mrows/s → TDigest.from_array throughput on one client's partition
+    merge ms      → folding all client digests into one aggregate
+    centroids     → size of one client's digest (what goes on the wire)
+
+Usage:
+    python benchmarks/bench_sketch.py --rows 1000000 --clients 100 --compression 50 100 200
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))  # repo root, for SimuFed
+from SimuFed.utils.aggregator import RunningAggregate, Summary
+from SimuFed.utils.sketch import TDigest
+
+QUANTILES = np.array([0.001, 0.01, 0.1, 0.25, 0.5, 0.75, 0.9, 0.99, 0.999])
+
+DISTRIBUTIONS = {
+    "normal": lambda rng, n: rng.normal(size=n),
+    "lognormal": lambda rng, n: rng.lognormal(sigma=1.5, size=n),
+    "pareto": lambda rng, n: rng.pareto(1.5, size=n),
+    "bimodal": lambda rng, n: np.where(rng.random(n) < 0.9, rng.normal(0, 1, n), rng.normal(50, 5, n)),
+}
+
+
+def rank_error(sorted_x: np.ndarray, estimates: np.ndarray) -> np.ndarray:
+    """|F(estimate) - q| with F the empirical CDF (mid-rank for ties)."""
+    lo = np.searchsorted(sorted_x, estimates, side="left")
+    hi = np.searchsorted(sorted_x, estimates, side="right")
+    return np.abs((lo + hi) / 2 / sorted_x.size - QUANTILES)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="t-digest accuracy / throughput benchmark")
+    parser.add_argument("--rows", type=int, default=1_000_000, help="Total rows across all clients")
+    parser.add_argument("--clients", type=int, default=100)
+    parser.add_argument("--compression", type=float, nargs="+", default=[50, 100, 200])
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    cols = " ".join(f"{f'q={q:g}':>9}" for q in QUANTILES)
+    print(f"rank error x 1e3, {args.rows} rows over {args.clients} clients")
+    print(f"{'distribution':<12} {'compr':>6} {cols} {'max':>7}")
+    cost = {}
+    for dist, draw in DISTRIBUTIONS.items():
+        x = draw(rng, args.rows)
+        parts = np.array_split(x, args.clients)
+        sorted_x = np.sort(x)
+        for compression in args.compression:
+            t0 = time.perf_counter()
+            digests = [TDigest.from_array(p, compression) for p in parts]
+            build_s = time.perf_counter() - t0
+
+            t0 = time.perf_counter()
+            agg = RunningAggregate()
+            for d in digests:
+                agg.add(Summary(client_id=0, n=0, s=0.0, s2=0.0, hist_counts=[], hist_edges=[], sketch=d))
+            est = agg.quantile(QUANTILES)
+            merge_s = time.perf_counter() - t0
+
+            err = rank_error(sorted_x, est) * 1e3
+            cells = " ".join(f"{e:>9.3f}" for e in err)
+            print(f"{dist:<12} {compression:>6g} {cells} {err.max():>7.3f}")
+            cost.setdefault(compression, []).append(
+                (args.rows / build_s / 1e6, merge_s * 1e3, np.mean([d.centroids()[0].size for d in digests]))
+            )
+
+    print(f"\n{'compr':>6} {'build Mrows/s':>14} {'merge ms':>9} {'centroids':>10}")
+    for compression, rows in cost.items():
+        build, merge, size = np.mean(rows, axis=0)
+        print(f"{compression:>6g} {build:>14.1f} {merge:>9.2f} {size:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
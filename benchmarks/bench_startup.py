@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Client startup latency per start method: process launch → first summary byte.
+
+For each start method and partition format, runs --clients clients one at
+a time (so they do not compete for CPUs) through the real worker and a
+QueueTransport from the same context, and reports per client:
+
+    startup  → Process.start() until the worker function runs
+               (interpreter start + imports under spawn; a fork otherwise)
+    work     → load + summarize, from the worker's own marks
+    total    → Process.start() until the coordinator has the summary
+
+The first client of each method is reported separately: it pays the
+forkserver's own start and preloads. Before launching, the context is
+prepared as a coordinator would (startup.prepare).
+
+Usage:
+    python benchmarks/bench_startup.py --clients 20 --rows 10000
+"""
+from __future__ import annotations
+
+import argparse
+import contextlib
+import io
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))  # repo root, for SimuFed
+from SimuFed.client import ClientConfig, worker
+from SimuFed.startup import START_METHODS, make_context, prepare
+from SimuFed.transport import QueueTransport
+from SimuFed.utils.ingest import write_npy
+
+
+def quiet_worker(cfg: ClientConfig, out: QueueTransport) -> None:
+    with contextlib.redirect_stdout(io.StringIO()):
+        worker(cfg, out)
+
+
+def one_client(ctx, cfg: ClientConfig) -> tuple[float, float, float]:
+    out = QueueTransport(ctx=ctx)
+    p = ctx.Process(target=quiet_worker, args=(cfg, out), daemon=True)
+    launched = time.time()
+    p.start()
+    summary = out.get(timeout=60)
+    received = time.time()
+    p.join()
+    out.close()
+    marks = summary.marks
+    return marks["start"] - launched, marks["computed"] - marks["start"], received - launched
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Client startup latency benchmark")
+    parser.add_argument("--clients", type=int, default=20)
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--methods", nargs="+", choices=START_METHODS, default=list(START_METHODS))
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    x = rng.normal(size=args.rows)
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = {"npy": str(Path(tmp) / "p.npy"), "csv": str(Path(tmp) / "p.csv")}
+        write_npy(paths["npy"], {"value": x})
+        np.savetxt(paths["csv"], x, header="value", comments="")
+
+        print(f"{args.clients} clients, {args.rows} rows, one at a time (milliseconds; median / p90)")
+        print(f"{'method':<11} {'format':<6} {'first':>7} {'startup':>15} {'work':>13} {'total':>15}")
+        for method in args.methods:
+            ctx = make_context(method)
+            # as a coordinator with these clients would: fork imports pandas here, the fork server preloads it
+            prepare(ctx, [ClientConfig(client_id=1, csv_path=p) for p in paths.values()])
+            for fmt, path in paths.items():
+                cfg = ClientConfig(client_id=1, csv_path=path)
+                first = one_client(ctx, cfg)[2]
+                runs = np.array([one_client(ctx, cfg) for _ in range(args.clients)]) * 1e3
+                cells = [f"{statistics.median(col):6.1f} / {np.percentile(col, 90):6.1f}" for col in runs.T]
+                print(f"{method:<11} {fmt:<6} {first * 1e3:>7.1f} {cells[0]:>15} {cells[1]:>13} {cells[2]:>15}")
+
+
+if __name__ == "__main__":
+    main()
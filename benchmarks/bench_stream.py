@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Per-update cost of continuous aggregation as a partition grows.
+
+One partition starts with --rows rows and gets --append-rows more per tick
+for --ticks ticks. Each tick is summarized two ways, in this process:
+
+    delta   → PartitionTail.read() of the new rows, summarize() them, add the
+              delta to the cumulative and window aggregates, subtract the
+              bucket leaving the window (what StreamCoordinator does)
+    rescan  → load_partition() + summarize() of the whole file (what a
+              round does today)
+
+and the aggregates of both are compared at the end.
+
+Usage:
+    python benchmarks/bench_stream.py --rows 1000000 --append-rows 10000 --ticks 50
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+import tempfile
+import time
+from collections import deque
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))  # repo root, for SimuFed
+from SimuFed.client import ClientConfig, load_partition, summarize
+from SimuFed.utils.aggregator import RunningAggregate, grid_edges
+from SimuFed.utils.ingest import PartitionTail, append_rows
+
+
+def run(fmt: str, args: argparse.Namespace, tmp: str) -> None:
+    rng = np.random.default_rng(0)
+    path = str(Path(tmp) / f"grow.{fmt}")
+    append_rows(path, {"value": rng.normal(size=args.rows)})
+    cfg = ClientConfig(client_id=1, csv_path=path, bins=args.bins, hist_range=(-10.0, 10.0))
+    grid = grid_edges(-10.0, 10.0, args.bins)
+    tail = PartitionTail(path, "value")
+    cumulative, window = RunningAggregate(edges=grid), RunningAggregate(edges=grid)
+    buckets: deque = deque()
+    delta_s, rescan_s = [], []
+    for tick in range(args.ticks):
+        if tick:
+            append_rows(path, {"value": rng.normal(size=args.append_rows)})
+        t0 = time.perf_counter()
+        delta = summarize(cfg, tail.read(), round_id=tick)
+        cumulative.add(delta)
+        window.add(delta)
+        buckets.append(delta)
+        if len(buckets) > args.window:
+            window.subtract(buckets.popleft())
+        delta_s.append(time.perf_counter() - t0)
+
+        t0 = time.perf_counter()
+        full = summarize(cfg, load_partition(cfg))
+        rescan_s.append(time.perf_counter() - t0)
+
+    assert cumulative.n == full.n and np.array_equal(cumulative.hist_counts, full.hist_counts)
+    assert np.isclose(cumulative.mean, full.mean) and np.isclose(cumulative.var, full.var)
+    steady = slice(1, None)  # tick 0 reads the initial rows in both cases
+    print(f"{fmt:<4} {full.n:>10} rows   first tick: delta {delta_s[0] * 1e3:8.2f} ms, rescan {rescan_s[0] * 1e3:8.2f} ms   "
+          f"later ticks (median): delta {np.median(delta_s[steady]) * 1e3:7.2f} ms, "
+          f"rescan {np.median(rescan_s[steady]) * 1e3:8.2f} ms")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Continuous (delta) vs full-rescan update cost")
+    parser.add_argument("--rows", type=int, default=1_000_000, help="Rows in the partition before the first tick")
+    parser.add_argument("--append-rows", type=int, default=10_000, help="Rows appended per tick")
+    parser.add_argument("--ticks", type=int, default=30)
+    parser.add_argument("--window", type=int, default=10)
+    parser.add_argument("--bins", type=int, default=10)
+    parser.add_argument("--formats", nargs="+", choices=["npy", "csv"], default=["npy", "csv"])
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for fmt in args.formats:
+            run(fmt, args, tmp)
+
+
+if __name__ == "__main__":
+    main()
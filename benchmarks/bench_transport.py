@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Result-transport benchmark: multiprocessing.Queue vs. shared-memory board.
+
+A handful of producer processes publish one summary for each of `--clients`
+simulated clients (split evenly between producers) as fast as they can. The
+coordinator side receives every summary through the transport and folds it
+into a RunningAggregate. Reported time covers receive and merge only, from
+the moment the producers are released until the last summary is merged.
+
+Usage:
+    python benchmarks/bench_transport.py --clients 1000 5000 --bins 10 1000 --producers 4
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from multiprocessing import Event, Process
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))  # repo root, for SimuFed
+from SimuFed.client import ClientConfig
+from SimuFed.transport import TRANSPORTS, make_transport
+from SimuFed.utils.aggregator import RunningAggregate, Summary
+
+
+def producer(out, client_ids: list[int], bins: int, go) -> None:
+    counts = np.arange(bins, dtype=np.int64)
+    edges = np.linspace(0.0, 1.0, bins + 1)
+    summaries = [Summary(cid, 1000, 1.0, 2.0, counts, edges) for cid in client_ids]
+    go.wait()
+    for s in summaries:
+        out.publish(s)
+
+
+def run(kind: str, n_clients: int, bins: int, n_producers: int) -> float:
+    clients = [ClientConfig(client_id=i, csv_path="", bins=bins) for i in range(n_clients)]
+    transport = make_transport(kind, clients)
+    go = Event()
+    ids = [c.client_id for c in clients]
+    procs = [
+        Process(target=producer, args=(transport, ids[k::n_producers], bins, go), daemon=True)
+        for k in range(n_producers)
+    ]
+    for p in procs:
+        p.start()
+    time.sleep(0.5)  # let producers finish importing and build their summaries
+
+    agg = RunningAggregate()
+    t0 = time.perf_counter()
+    go.set()
+    for _ in range(n_clients):
+        agg.add(transport.get(timeout=30))
+    elapsed = time.perf_counter() - t0
+
+    for p in procs:
+        p.join()
+    transport.close()
+    assert agg.n == 1000 * n_clients
+    return elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Queue vs shared-memory transport benchmark")
+    parser.add_argument("--clients", type=int, nargs="+", default=[1000, 5000])
+    parser.add_argument("--bins", type=int, nargs="+", default=[10, 1000])
+    parser.add_argument("--producers", type=int, default=4)
+    args = parser.parse_args()
+
+    print(f"{'clients':>8} {'bins':>6} " + " ".join(f"{k + ' ms':>10} {k + ' /s':>10}" for k in TRANSPORTS))
+    for n in args.clients:
+        for bins in args.bins:
+            cells = []
+            for kind in TRANSPORTS:
+                t = run(kind, n, bins, args.producers)
+                cells.append(f"{t * 1e3:>10.1f} {n / t:>10.0f}")
+            print(f"{n:>8} {bins:>6} " + " ".join(cells))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,284 @@
+#!/usr/bin/env python3
+"""
+SimuFed benchmark suite: scaling characteristics with machine-readable output.
+
+Benchmarks (each case is timed `--repeat` times; median and min are kept):
+    round_latency  → one sync round, no faults, as the client count grows
+    summary_time   → summarize() on one partition, as its size grows
+    merge_cost     → merge_summaries() over 100 summaries, as the bin count grows
+    rebin_merge    → merge_summaries() over client histograms on differing edges
+    queue_transport→ receive + merge of N summaries sent by producer processes
+    spawn_overhead → start + join of one empty Process, per start method
+
+`run` writes a JSON document with environment metadata and one record per
+case; `compare` matches two such documents case by case and exits non-zero
+when a case got slower than the threshold allows.
+
+Usage:
+    python benchmarks/suite.py run --out bench.json [--quick] [--only merge_cost ...]
+    python benchmarks/suite.py run --save-baseline          # → benchmarks/baseline.json
+    python benchmarks/suite.py compare bench.json            # against benchmarks/baseline.json
+    python benchmarks/suite.py compare bench.json --baseline old.json --threshold 0.2
+"""
+from __future__ import annotations
+
+import argparse
+import contextlib
+import json
+import multiprocessing as mp
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))  # repo root, for SimuFed
+sys.path.insert(0, str(Path(__file__).resolve().parent))      # sibling benchmarks
+from bench_transport import run as transport_run
+from SimuFed.client import ClientConfig, summarize
+from SimuFed.coordinator import Coordinator
+from SimuFed.utils.aggregator import Summary, grid_edges, merge_summaries
+
+DEFAULT_BASELINE = Path(__file__).resolve().parent / "baseline.json"
+
+
+def timed(fn, repeat: int) -> dict:
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - t0)
+    return {"median_s": statistics.median(times), "min_s": min(times), "repeat": repeat}
+
+
+@contextlib.contextmanager
+def silenced_stdout():
+    """Client processes print progress lines to fd 1; keep them out of the report."""
+    sys.stdout.flush()
+    saved = os.dup(1)
+    devnull = os.open(os.devnull, os.O_WRONLY)
+    os.dup2(devnull, 1)
+    try:
+        yield
+    finally:
+        sys.stdout.flush()
+        os.dup2(saved, 1)
+        os.close(saved)
+        os.close(devnull)
+
+
+def _noop() -> None:
+    pass
+
+
+# --- benchmarks -------------------------------------------------------------
+# Each takes (quick, repeat) and returns a list of {"case": {...}, <metrics>}.
+
+def bench_round_latency(quick: bool, repeat: int) -> list[dict]:
+    counts = [2, 5] if quick else [5, 10, 20, 50]
+    rows = 1000
+    out = []
+    with tempfile.TemporaryDirectory() as tmp:
+        rng = np.random.default_rng(0)
+        for cid in range(1, max(counts) + 1):
+            pd.DataFrame({"value": rng.normal(size=rows)}).to_csv(Path(tmp) / f"partition_{cid}.csv", index=False)
+        for n in counts:
+            clients = [ClientConfig(client_id=cid, csv_path=str(Path(tmp) / f"partition_{cid}.csv"))
+                       for cid in range(1, n + 1)]
+            coord = Coordinator(timeout_s=60.0)
+            with silenced_stdout():
+                m = timed(lambda: coord.run_round(clients), repeat)
+            m["clients_per_s"] = n / m["median_s"]
+            out.append({"case": {"clients": n, "rows": rows}, **m})
+    return out
+
+
+def bench_summary_time(quick: bool, repeat: int) -> list[dict]:
+    sizes = [10_000, 100_000] if quick else [10_000, 100_000, 1_000_000, 10_000_000]
+    cfg = ClientConfig(client_id=1, csv_path="")
+    rng = np.random.default_rng(0)
+    out = []
+    for rows in sizes:
+        x = rng.normal(size=rows)
+        m = timed(lambda: summarize(cfg, x), repeat)
+        m["rows_per_s"] = rows / m["median_s"]
+        out.append({"case": {"rows": rows}, **m})
+    return out
+
+
+def bench_merge_cost(quick: bool, repeat: int) -> list[dict]:
+    bins_list = [10, 1000] if quick else [10, 100, 1000, 10_000]
+    n_summaries = 100
+    rng = np.random.default_rng(0)
+    out = []
+    for bins in bins_list:
+        edges = np.linspace(-1.0, 1.0, bins + 1)
+        summaries = [Summary(i, 1000, 1.0, 2.0, rng.integers(0, 100, size=bins), edges)
+                     for i in range(n_summaries)]
+        m = timed(lambda: merge_summaries(summaries), repeat)
+        m["summaries_per_s"] = n_summaries / m["median_s"]
+        out.append({"case": {"bins": bins, "summaries": n_summaries}, **m})
+    return out
+
+
+def bench_rebin_merge(quick: bool, repeat: int) -> list[dict]:
+    cases = [(100, 1000)] if quick else [(1000, 100), (1000, 1000), (5000, 1000)]
+    rng = np.random.default_rng(0)
+    out = []
+    for n_summaries, bins in cases:
+        lo = rng.normal(size=n_summaries)
+        summaries = [Summary(i, 1000, 1.0, 2.0, rng.integers(0, 100, size=bins), grid_edges(lo[i], lo[i] + 2, bins))
+                     for i in range(n_summaries)]
+        m = timed(lambda: merge_summaries(summaries), repeat)
+        m["summaries_per_s"] = n_summaries / m["median_s"]
+        out.append({"case": {"bins": bins, "summaries": n_summaries}, **m})
+    return out
+
+
+def bench_queue_transport(quick: bool, repeat: int) -> list[dict]:
+    cases = [(500, 10)] if quick else [(1000, 10), (1000, 1000), (5000, 10)]
+    out = []
+    for n, bins in cases:
+        times = [transport_run("queue", n, bins, 4) for _ in range(repeat)]
+        m = {"median_s": statistics.median(times), "min_s": min(times), "repeat": repeat}
+        m["msgs_per_s"] = n / m["median_s"]
+        out.append({"case": {"clients": n, "bins": bins, "producers": 4}, **m})
+    return out
+
+
+def bench_spawn_overhead(quick: bool, repeat: int) -> list[dict]:
+    out = []
+    for method in mp.get_all_start_methods():
+        ctx = mp.get_context(method)
+
+        def once():
+            p = ctx.Process(target=_noop)
+            p.start()
+            p.join()
+
+        once()  # warm up (forkserver starts its server here)
+        out.append({"case": {"start_method": method}, **timed(once, repeat)})
+    return out
+
+
+BENCHMARKS = {
+    "round_latency": bench_round_latency,
+    "summary_time": bench_summary_time,
+    "merge_cost": bench_merge_cost,
+    "rebin_merge": bench_rebin_merge,
+    "queue_transport": bench_queue_transport,
+    "spawn_overhead": bench_spawn_overhead,
+}
+
+
+# --- run / compare ----------------------------------------------------------
+
+def environment() -> dict:
+    try:
+        commit = subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True,
+                                cwd=Path(__file__).resolve().parents[1]).stdout.strip() or None
+    except OSError:
+        commit = None
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "git_commit": commit,
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpu_count": os.cpu_count(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "start_method": mp.get_start_method(),
+    }
+
+
+def run(args) -> None:
+    names = args.only or list(BENCHMARKS)
+    results = []
+    for name in names:
+        print(f"[bench] {name}", file=sys.stderr)
+        for rec in BENCHMARKS[name](args.quick, args.repeat):
+            results.append({"bench": name, **rec})
+            case = " ".join(f"{k}={v}" for k, v in rec["case"].items())
+            print(f"{name:<16} {case:<36} median={rec['median_s'] * 1e3:10.3f} ms", file=sys.stderr)
+
+    doc = {"meta": environment(), "quick": args.quick, "results": results}
+    out = DEFAULT_BASELINE if args.save_baseline else args.out
+    text = json.dumps(doc, indent=2)
+    if out:
+        Path(out).write_text(text + "\n")
+        print(f"[bench] wrote {out}", file=sys.stderr)
+    else:
+        print(text)
+
+
+def _case_key(rec: dict) -> str:
+    return rec["bench"] + " " + " ".join(f"{k}={v}" for k, v in sorted(rec["case"].items()))
+
+
+def compare(args) -> int:
+    if not Path(args.baseline).exists():
+        print(f"no baseline at {args.baseline}; record one with `python benchmarks/suite.py run --save-baseline`")
+        return 2
+    base = json.loads(Path(args.baseline).read_text())
+    cur = json.loads(Path(args.current).read_text())
+    base_by_key = {_case_key(r): r for r in base["results"]}
+    for field in ("machine", "cpu_count", "python"):
+        if base["meta"].get(field) != cur["meta"].get(field):
+            print(f"warning: {field} differs ({base['meta'].get(field)} vs {cur['meta'].get(field)})")
+
+    regressions = 0
+    print(f"{'case':<56} {'base ms':>10} {'now ms':>10} {'ratio':>7}")
+    for rec in cur["results"]:
+        key = _case_key(rec)
+        old = base_by_key.get(key)
+        if old is None:
+            print(f"{key:<56} {'-':>10} {rec['median_s'] * 1e3:>10.3f} {'new':>7}")
+            continue
+        ratio = rec["median_s"] / old["median_s"]
+        flag = ""
+        if ratio > 1 + args.threshold:
+            flag = "  REGRESSION"
+            regressions += 1
+        elif ratio < 1 - args.threshold:
+            flag = "  faster"
+        print(f"{key:<56} {old['median_s'] * 1e3:>10.3f} {rec['median_s'] * 1e3:>10.3f} {ratio:>7.2f}{flag}")
+
+    print(f"{regressions} regression(s) beyond {args.threshold:.0%}")
+    return 1 if regressions else 0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="SimuFed benchmark suite")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p_run = sub.add_parser("run", help="Run benchmarks and emit JSON")
+    p_run.add_argument("--only", nargs="+", choices=list(BENCHMARKS))
+    p_run.add_argument("--quick", action="store_true", help="Smaller cases, for a fast check")
+    p_run.add_argument("--repeat", type=int, default=5)
+    p_run.add_argument("--out", type=Path, default=None, help="JSON output file (default: stdout)")
+    p_run.add_argument("--save-baseline", action="store_true", help=f"Write to {DEFAULT_BASELINE.name}")
+
+    p_cmp = sub.add_parser("compare", help="Flag regressions of a run against a baseline")
+    p_cmp.add_argument("current", type=Path)
+    p_cmp.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+    p_cmp.add_argument("--threshold", type=float, default=0.10,
+                       help="Allowed slowdown of the median before a case is flagged (0.10 = 10%%)")
+
+    args = parser.parse_args()
+    if args.command == "run":
+        run(args)
+    else:
+        sys.exit(compare(args))
+
+
+if __name__ == "__main__":
+    main()
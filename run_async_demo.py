@@ -3,12 +3,25 @@
 from __future__ import annotations
 
 import argparse
+import shutil
+import tempfile
+import threading
+from dataclasses import replace
 from pathlib import Path
 from multiprocessing import set_start_method
 
+import numpy as np
+
+from SimuFed.binning import negotiate_range, with_grid
 from SimuFed.client import ClientConfig
+from SimuFed.coordinator_aio import AioCoordinator
 from SimuFed.coordinator_async import AsyncCoordinator
+from SimuFed.coordinator_stream import StreamCoordinator
 from SimuFed.fault_simulator import FaultConfig
+from SimuFed.startup import START_METHODS
+from SimuFed.stopping import make_policy
+from SimuFed.timeline import write_chrome_trace
+from SimuFed.utils.ingest import append_rows
 
 
 def build_client_configs(
@@ -17,11 +30,13 @@ def build_client_configs(
     faults: FaultConfig,
     bins: int = 10,
     hist_range: tuple[float, float] | None = None,
+    fmt: str = "csv",
+    sketch_compression: float | None = None,
 ) -> list[ClientConfig]:
     configs: list[ClientConfig] = []
     base = Path(data_dir)
     for cid in range(1, num_clients + 1):
-        csv_path = base / f"partition_{cid}.csv"
+        csv_path = base / f"partition_{cid}.{fmt}"
         cfg = ClientConfig(
             client_id=cid,
             csv_path=str(csv_path),
@@ -29,6 +44,7 @@ def build_client_configs(
             bins=bins,
             hist_range=hist_range,
             faults=faults,
+            sketch_compression=sketch_compression,
         )
         configs.append(cfg)
     return configs
@@ -38,16 +54,66 @@ def main() -> None:
     parser = argparse.ArgumentParser(description="SimuFed asynchronous demo")
     parser.add_argument("--clients", type=int, default=3, help="Number of clients")
     parser.add_argument("--data-dir", type=str, default="datasets", help="Directory with partition_*.csv files")
+    parser.add_argument("--format", choices=["csv", "npy"], default="csv",
+                        help="Partition file format (npy is memory-mapped)")
+    parser.add_argument("--transport", choices=["queue", "shm"], default="queue",
+                        help="Result channel: multiprocessing queue or shared-memory board")
+    parser.add_argument("--start-method", choices=START_METHODS, default=None,
+                        help="How client processes start (default: spawn); forkserver preloads SimuFed.client + numpy")
+    parser.add_argument("--max-concurrent", type=int, default=None,
+                        help="Cap on client processes alive at once")
+    parser.add_argument("--admission", choices=["fifo", "random", "spf"], default="fifo",
+                        help="Admission order when --max-concurrent is set (spf = shortest partition first)")
     parser.add_argument("--timeout", type=float, default=5.0, help="Overall timeout in seconds")
     parser.add_argument("--drop-prob", type=float, default=0.2, help="Per-client drop probability")
     parser.add_argument("--max-delay", type=float, default=3.0, help="Max simulated delay per client (seconds)")
     parser.add_argument("--grace", type=float, default=1.0,
                         help="Grace period after last update before closing the round") 
+    parser.add_argument("--rounds", type=int, default=1,
+                        help="Rounds to run on one persistent client pool")
+    parser.add_argument("--seed", type=int, default=None,
+                        help="Seed for per-client delay/dropout draws and --admission random")
+    parser.add_argument("--virtual-clock", action="store_true",
+                        help="Discrete-event mode: simulate delays/timeouts instead of sleeping")
+    parser.add_argument("--quorum", type=int, default=None,
+                        help="End the round once this many clients answered")
+    parser.add_argument("--ci-width", type=float, default=None,
+                        help="End the round once the CI on the global mean is narrower than this")
+    parser.add_argument("--confidence", type=float, default=0.95)
+    parser.add_argument("--ci-level", choices=["row", "client"], default="row",
+                        help="CI from pooled rows, or from the spread of client means")
+    parser.add_argument("--stop-when", choices=["any", "all"], default="any",
+                        help="With both --quorum and --ci-width: stop on either, or only on both")
+    parser.add_argument("--trace", type=Path, default=None,
+                        help="Write the rounds' phase timelines as Chrome trace-event JSON")
+    parser.add_argument("--aio", action="store_true",
+                        help="Run clients as asyncio tasks in this process instead of OS processes")
+    parser.add_argument("--partitions", type=int, default=None,
+                        help="With --aio: clients share this many partition files (client i reads i mod N)")
+    parser.add_argument("--quiet", action="store_true",
+                        help="With --aio: only print the STATS line")
+    parser.add_argument("--hist-range", type=float, nargs=2, default=None, metavar=("LO", "HI"),
+                        help="Bin every client's histogram on this fixed global range")
+    parser.add_argument("--negotiate-range", action="store_true",
+                        help="Before the round, collect client min/max and bin everyone on their union")
+    parser.add_argument("--sketch", type=float, default=None, metavar="COMPRESSION",
+                        help="Clients also send a t-digest of this compression; report global median/p99")
+    parser.add_argument("--continuous", type=float, default=None, metavar="SECONDS",
+                        help="Continuous session: clients send deltas of newly appended rows for this long")
+    parser.add_argument("--interval", type=float, default=1.0,
+                        help="With --continuous: seconds per tick (one delta per client per tick)")
+    parser.add_argument("--window", type=int, default=10,
+                        help="With --continuous: ticks in the sliding-window aggregate")
+    parser.add_argument("--append-rows", type=int, default=0,
+                        help="With --continuous: append this many rows per tick to temporary copies of the partitions")
+    parser.add_argument("--drift", type=float, default=0.0,
+                        help="With --append-rows: the appended rows' mean moves by this much per tick")
     args = parser.parse_args()
 
     faults = FaultConfig(
         drop_prob=args.drop_prob,
         max_delay_s=args.max_delay,
+        seed=args.seed,
     )
 
     configs = build_client_configs(
@@ -55,12 +121,115 @@ def main() -> None:
         data_dir=args.data_dir,
         faults=faults,
         bins=10,
-        hist_range=None,
+        hist_range=tuple(args.hist_range) if args.hist_range else None,
+        fmt=args.format,
+        sketch_compression=args.sketch,
+    )
+
+    if args.aio and args.partitions:
+        base = Path(args.data_dir)
+        for cfg in configs:
+            cfg.csv_path = str(base / f"partition_{(cfg.client_id - 1) % args.partitions + 1}.{args.format}")
+    if args.negotiate_range:
+        hist_range = negotiate_range(configs)
+        configs = with_grid(configs, hist_range)
+        print(f"Negotiated histogram range: [{hist_range[0]:.4f}, {hist_range[1]:.4f}]")
+
+    if args.continuous:
+        run_continuous(args, configs)
+        return
+
+    stopping = make_policy(args.quorum, args.ci_width, args.confidence, args.ci_level, args.stop_when)
+    if args.aio:
+        coord = AioCoordinator(timeout_s=args.timeout, grace_after_last=args.grace,
+                               verbose=not args.quiet, stopping=stopping)
+        report_round(coord.run_round(configs), args.clients)
+        return
+
+    coord = AsyncCoordinator(timeout_s=args.timeout, grace_after_last=args.grace,
+                             virtual_clock=args.virtual_clock, transport=args.transport,
+                             max_concurrent=args.max_concurrent, admission=args.admission,
+                             admission_seed=args.seed, stopping=stopping, start_method=args.start_method)
+    if args.rounds > 1:
+        results = coord.run_rounds(configs, args.rounds)
+    else:
+        results = [coord.run_round(configs)]
+
+    for result in results:
+        report_round(result, args.clients)
+    if args.trace:
+        write_chrome_trace(args.trace, [r.timeline for r in results if r.timeline is not None])
+        print(f"Trace written to {args.trace}")
+
+
+def append_loop(paths: list[str], rows: int, interval_s: float, drift: float, scale: float,
+                seed: int | None, stop: threading.Event) -> None:
+    # stands in for the producers writing to the partitions
+    rng = np.random.default_rng(seed)
+    tick = 0
+    while not stop.wait(interval_s):
+        tick += 1
+        for path in paths:
+            append_rows(path, {"value": rng.normal(drift * tick, scale, rows)})
+
+
+def scratch_copies(configs: list[ClientConfig], tmp: str) -> list[ClientConfig]:
+    # the appender writes to copies in tmp, never to the --data-dir partitions
+    copies: dict[str, str] = {}
+    for cfg in configs:
+        if cfg.csv_path not in copies:
+            copies[cfg.csv_path] = shutil.copy(cfg.csv_path, Path(tmp) / f"{len(copies)}_{Path(cfg.csv_path).name}")
+    return [replace(c, csv_path=str(copies[c.csv_path])) for c in configs]
+
+
+def run_continuous(args, configs: list[ClientConfig]) -> None:
+    if not args.append_rows:
+        stream_session(args, configs)
+        return
+    with tempfile.TemporaryDirectory(prefix="simufed_stream_") as tmp:
+        stream_session(args, scratch_copies(configs, tmp))
+
+
+def stream_session(args, configs: list[ClientConfig]) -> None:
+    if configs[0].hist_range is None:
+        # window buckets subtract bin by bin, so everyone needs the same grid
+        hist_range = negotiate_range(configs)
+        configs = with_grid(configs, hist_range)
+        print(f"Negotiated histogram range: [{hist_range[0]:.4f}, {hist_range[1]:.4f}]")
+    stop = threading.Event()
+    appender = None
+    if args.append_rows:
+        appender = threading.Thread(target=append_loop, daemon=True,
+                                    args=(sorted({c.csv_path for c in configs}), args.append_rows, args.interval,
+                                          args.drift, float(args.clients), args.seed, stop))
+        appender.start()
+    coord = StreamCoordinator(interval_s=args.interval, window=args.window, start_method=args.start_method)
+    try:
+        result = coord.run(configs, args.continuous)
+    finally:
+        stop.set()
+        if appender is not None:
+            appender.join()
+
+    cum, win = result.cumulative, result.window
+    print(
+        "STATS,"
+        f"mode=stream,"
+        f"clients_expected={len(configs)},"
+        f"ticks={len(result.ticks)},"
+        f"deltas={result.deltas},"
+        f"late={result.late},"
+        f"duration={result.duration_s:.4f},"
+        f"global_n={cum['n']},"
+        f"global_mean={cum['mean']:.4f},"
+        f"global_var={cum['var']:.4f},"
+        f"window_n={win['n']},"
+        f"window_mean={win['mean']:.4f},"
+        f"window_var={win['var']:.4f}"
     )
 
-    coord = AsyncCoordinator(timeout_s=args.timeout, grace_after_last=args.grace)
-    result = coord.run_round(configs)
 
+def report_round(result, clients_expected: int) -> None:
     # Extract global stats safely
     if result.aggregated:
         global_n = result.aggregated["n"]
@@ -73,18 +242,22 @@ def main() -> None:
 
     gm_str = f"{global_mean:.4f}" if global_n > 0 else "nan"
     gv_str = f"{global_var:.4f}" if global_n > 0 else "nan"
+    if global_n > 0 and "median" in result.aggregated:
+        print(f"Quantiles: median={result.aggregated['median']:.4f}, p99={result.aggregated['p99']:.4f}")
 
     # Machine-readable stats line (async)
     print(
         "STATS,"
         f"mode=async,"
-        f"clients_expected={args.clients},"
+        f"clients_expected={clients_expected},"
         f"received={result.received},"
         f"dropped={result.dropped},"
+        f"pending={result.pending},"
         f"duration={result.duration_s:.4f},"
         f"global_n={global_n},"
         f"global_mean={gm_str},"
-        f"global_var={gv_str}"
+        f"global_var={gv_str},"
+        f"stopped_by={result.stopped_by}"
     )
 
 
@@ -2,9 +2,16 @@ from __future__ import annotations
 import argparse
 from pathlib import Path
 
+from SimuFed.batch import BatchEngine, check_aggregate
 from SimuFed.coordinator import Coordinator
+from SimuFed.coordinator_tree import TreeCoordinator
+from SimuFed.binning import negotiate_range, with_grid
 from SimuFed.client import ClientConfig
 from SimuFed.fault_simulator import FaultConfig
+from SimuFed.speculation import BackupPolicy
+from SimuFed.startup import START_METHODS
+from SimuFed.stopping import make_policy
+from SimuFed.timeline import write_chrome_trace
 
 
 def main():
@@ -17,10 +24,58 @@ def main():
     parser.add_argument("--timeout", type=float, default=5.0)
     parser.add_argument("--drop-prob", type=float, default=0.0)
     parser.add_argument("--max-delay", type=float, default=0.0)
+    parser.add_argument("--rounds", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--virtual-clock", action="store_true")
+    parser.add_argument("--format", choices=["csv", "npy"], default="csv")
+    parser.add_argument("--transport", choices=["queue", "shm"], default="queue")
+    parser.add_argument("--start-method", choices=START_METHODS, default=None,
+                        help="How client processes start; forkserver preloads SimuFed.client + numpy")
+    parser.add_argument("--tree-fan-in", type=int, default=None,
+                        help="Aggregate through a tree of intermediate aggregators with this fan-in")
+    parser.add_argument("--tree-depth", type=int, default=None)
+    parser.add_argument("--max-concurrent", type=int, default=None,
+                        help="Cap on client processes alive at once")
+    parser.add_argument("--admission", choices=["fifo", "random", "spf"], default="fifo")
+    parser.add_argument("--quorum", type=int, default=None,
+                        help="End the round once this many clients answered")
+    parser.add_argument("--ci-width", type=float, default=None,
+                        help="End the round once the CI on the global mean is narrower than this")
+    parser.add_argument("--confidence", type=float, default=0.95)
+    parser.add_argument("--ci-level", choices=["row", "client"], default="row",
+                        help="CI from pooled rows, or from the spread of client means")
+    parser.add_argument("--stop-when", choices=["any", "all"], default="any",
+                        help="With both --quorum and --ci-width: stop on either, or only on both")
+    parser.add_argument("--replicas", type=int, default=0,
+                        help="Extra clients per partition launched with the round (first result wins)")
+    parser.add_argument("--hedge-percentile", type=float, default=None,
+                        help="Launch a backup for a partition quiet past this latency quantile (0-1)")
+    parser.add_argument("--hedge-after", type=float, default=None,
+                        help="Launch a backup for a partition quiet for this many seconds")
+    parser.add_argument("--trace", type=Path, default=None,
+                        help="Write the rounds' phase timelines as Chrome trace-event JSON")
+    parser.add_argument("--hist-range", type=float, nargs=2, default=None, metavar=("LO", "HI"),
+                        help="Bin every client's histogram on this fixed global range")
+    parser.add_argument("--negotiate-range", action="store_true",
+                        help="Before the round, collect client min/max and bin everyone on their union")
+    parser.add_argument("--columns", nargs="+", default=None,
+                        help="Summarize several columns in one pass: names, or one pattern like 'feat_*'")
+    parser.add_argument("--covariance", action="store_true",
+                        help="With --columns: also merge the covariance / correlation matrix")
+    parser.add_argument("--group-by", default=None, metavar="KEY",
+                        help="Also report per-key statistics of 'value', keyed by this column")
+    parser.add_argument("--group-hist", action="store_true",
+                        help="With --group-by: clients also send per-key histograms")
+    parser.add_argument("--sketch", type=float, default=None, metavar="COMPRESSION",
+                        help="Clients also send a t-digest of this compression; report global median/p99")
+    parser.add_argument("--batch", action="store_true",
+                        help="Summarize all partitions in this process with the batch engine (no faults)")
+    parser.add_argument("--check", action="store_true",
+                        help="Compare each round's aggregate with the exact statistics of the answered partitions")
     args = parser.parse_args()
 
     # verify dataset files exist
-    files = [args.dataset_dir / f"partition_{i+1}.csv" for i in range(args.clients)]
+    files = [args.dataset_dir / f"partition_{i+1}.{args.format}" for i in range(args.clients)]
     for f in files:
         if not f.exists():
             raise FileNotFoundError(
@@ -36,19 +91,100 @@ def main():
                 csv_path=str(f),
                 column="value",
                 bins=args.bins,
-                hist_range=None,
+                hist_range=tuple(args.hist_range) if args.hist_range else None,
                 faults=FaultConfig(
                     drop_prob=args.drop_prob,
                     max_delay_s=args.max_delay,
+                    seed=args.seed,
                 ),
+                sketch_compression=args.sketch,
+                columns=_column_spec(args.columns),
+                covariance=args.covariance,
+                group_by=args.group_by,
+                group_hist=args.group_hist,
             )
         )
 
-    # run one synchronous round
-    coord = Coordinator(timeout_s=args.timeout)
-    result = coord.run_round(clients)
+    # one shared histogram grid: union of the client ranges, from a min/max-only pass
+    if args.negotiate_range:
+        hist_range = negotiate_range(clients)
+        clients = with_grid(clients, hist_range)
+        print(f"Negotiated histogram range: [{hist_range[0]:.4f}, {hist_range[1]:.4f}]")
 
-    received_count = len(result.summaries)
+    # run one synchronous round (or several on a persistent client pool)
+    stopping = make_policy(args.quorum, args.ci_width, args.confidence, args.ci_level, args.stop_when)
+    backups = None
+    if args.replicas or args.hedge_percentile is not None or args.hedge_after is not None:
+        backups = BackupPolicy(replicas=args.replicas, hedge_percentile=args.hedge_percentile,
+                               hedge_after_s=args.hedge_after)
+    coord = Coordinator(timeout_s=args.timeout, virtual_clock=args.virtual_clock,
+                        transport=args.transport, max_concurrent=args.max_concurrent,
+                        admission=args.admission, admission_seed=args.seed, stopping=stopping,
+                        backups=backups, start_method=args.start_method)
+    if args.batch:
+        results = [BatchEngine().run_round(clients) for _ in range(args.rounds)]
+    elif args.tree_fan_in:
+        tree = TreeCoordinator(timeout_s=args.timeout, fan_in=args.tree_fan_in,
+                               depth=args.tree_depth, transport=args.transport,
+                               start_method=args.start_method)
+        results = [tree.run_round(clients) for _ in range(args.rounds)]
+    elif args.rounds > 1:
+        results = coord.run_rounds(clients, args.rounds)
+    else:
+        results = [coord.run_round(clients)]
+
+    for result in results:
+        report_round(result, args.clients)
+        if args.check:
+            check_round(result, clients)
+    if args.trace:
+        write_chrome_trace(args.trace, [r.timeline for r in results if r.timeline is not None])
+        print(f"Trace written to {args.trace}")
+
+
+def _column_spec(columns: list[str] | None) -> list[str] | str | None:
+    # one argument with wildcards is a pattern; anything else is a list of names
+    if columns and len(columns) == 1 and any(ch in columns[0] for ch in "*?["):
+        return columns[0]
+    return columns
+
+
+def check_round(result, clients: list[ClientConfig]) -> None:
+    if any(c.columns for c in clients):
+        print("Check: skipped (multi-column rounds are not checked)")
+        return
+    if any(s.members > 1 for s in result.summaries):
+        # tree partials do not say which leaves they cover
+        if result.dropped:
+            print("Check: skipped (tree round with drops)")
+            return
+        answered = clients
+    else:
+        keys = {s.partition_id for s in result.summaries}
+        answered = [c for c in clients if c.partition_key in keys]
+    problems = check_aggregate(result.aggregated, answered)
+    print(f"Check vs exact ({len(answered)} partitions):", "OK" if not problems else "; ".join(problems))
+
+
+def report_columns(cols: dict) -> None:
+    print(f"{'column':<16} {'mean':>12} {'std':>12} {'skew':>8} {'kurt':>8}")
+    for name, mean, var, skew, kurt in zip(cols["names"], cols["mean"], cols["var"], cols["skewness"], cols["kurtosis"]):
+        print(f"{name:<16} {mean:>12.4f} {var ** 0.5:>12.4f} {skew:>8.3f} {kurt:>8.3f}")
+    if "correlation" in cols:
+        print("Correlation:")
+        for name, row in zip(cols["names"], cols["correlation"]):
+            print(f"  {name:<14} " + " ".join(f"{r:>6.3f}" for r in row))
+
+
+def report_groups(groups: dict, shown: int = 10) -> None:
+    print(f"Groups: {len(groups['keys'])} keys (first {min(shown, len(groups['keys']))})")
+    print(f"  {'key':<14} {'n':>10} {'mean':>12} {'std':>12}")
+    for key, n, mean, var in list(zip(groups["keys"], groups["n"], groups["mean"], groups["var"]))[:shown]:
+        print(f"  {str(key):<14} {n:>10} {mean:>12.4f} {var ** 0.5:>12.4f}")
+
+
+def report_round(result, clients_expected: int) -> None:
+    received_count = sum(s.members for s in result.summaries)  # partials from a tree count all their clients
     dropped_count = result.dropped
     duration = result.duration_s
 
@@ -65,14 +201,25 @@ def main():
 
      # human-readable summary
     print("\n=== Federated Round Complete ===")
-    print(f"Received: {received_count} / Dropped: {dropped_count}")
+    pending = f" / Pending: {result.pending}" if result.pending else ""
+    print(f"Received: {received_count} / Dropped: {dropped_count}{pending} (stopped by {result.stopped_by})")
     print(f"Duration: {duration:.3f}s")
+    if result.backups_launched:
+        print(f"Backups: {result.backups_launched} launched / {result.backups_won} won")
     if global_n > 0:
         print(
             f"Global n={global_n}, "
             f"mean={global_mean:.4f}, "
-            f"std={global_std:.4f}"
+            f"std={global_std:.4f}, "
+            f"skew={result.aggregated['skewness']:.4f}, "
+            f"kurt={result.aggregated['kurtosis']:.4f}"
         )
+        if "columns" in result.aggregated:
+            report_columns(result.aggregated["columns"])
+        if "groups" in result.aggregated:
+            report_groups(result.aggregated["groups"])
+        if "median" in result.aggregated:
+            print(f"Quantiles: median={result.aggregated['median']:.4f}, p99={result.aggregated['p99']:.4f}")
     else:
         print("No summaries received; no aggregate computed.")
 
@@ -84,13 +231,17 @@ def main():
     print(
         "STATS,"
         f"mode=sync,"
-        f"clients_expected={args.clients},"
+        f"clients_expected={clients_expected},"
         f"received={received_count},"
         f"dropped={dropped_count},"
+        f"pending={result.pending},"
         f"duration={duration:.4f},"
         f"global_n={global_n},"
         f"global_mean={gm_str},"
-        f"global_var={gv_str}"
+        f"global_var={gv_str},"
+        f"stopped_by={result.stopped_by},"
+        f"backups_launched={result.backups_launched},"
+        f"backups_won={result.backups_won}"
     )
 
 
@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+import argparse
+import sys
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))  # repo root, for SimuFed
+from SimuFed.utils.ingest import write_npy
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Convert existing CSV partitions to the binary .npy partition format."
+    )
+    parser.add_argument("--indir", type=Path, default=Path("datasets"))
+    parser.add_argument("--outdir", type=Path, default=None,
+                        help="Where to write the .npy files (default: next to the CSVs)")
+    parser.add_argument("--pattern", default="partition_*.csv")
+    args = parser.parse_args()
+
+    outdir = args.outdir or args.indir
+    outdir.mkdir(parents=True, exist_ok=True)
+
+    files = sorted(args.indir.glob(args.pattern))
+    if not files:
+        print(f"No files matching {args.pattern} in {args.indir}/")
+        return
+
+    for f in files:
+        df = pd.read_csv(f)
+        numeric = df.select_dtypes("number")
+        out = outdir / f.with_suffix(".npy").name
+        write_npy(str(out), {c: numeric[c].to_numpy(dtype=float) for c in numeric.columns})
+        skipped = [c for c in df.columns if c not in numeric.columns]
+        note = f" (skipped non-numeric: {', '.join(skipped)})" if skipped else ""
+        print(f"Converted {f.name} → {out.name} (rows={len(df)}, columns={len(numeric.columns)}){note}")
+
+    print(f">>> Converted {len(files)} partitions into {outdir}/")
+
+
+if __name__ == "__main__":
+    main()
+
+'''
+Each CSV becomes one structured .npy file with a float64 field per numeric
+column. Clients pick the format from the file suffix, so pointing a
+ClientConfig at partition_1.npy instead of partition_1.csv is all it takes.
+'''
@@ -1,52 +1,153 @@
 from __future__ import annotations
 import argparse
+import os
+from concurrent.futures import ProcessPoolExecutor
 import numpy as np
 import pandas as pd
+import sys
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))  # repo root, for SimuFed
+from SimuFed.utils.ingest import write_npy
+
+SCHEMES = ("sorted", "iid", "dirichlet", "size-skewed")
+
+# Acklam's rational approximation of the standard normal quantile (relative error < 1.2e-9)
+_A = (-3.969683028665376e+01, 2.209460984245205e+02, -2.759285104469687e+02,
+      1.383577518672690e+02, -3.066479806614716e+01, 2.506628277459239e+00)
+_B = (-5.447609879822406e+01, 1.615858368580409e+02, -1.556989798598866e+02,
+      6.680131188771972e+01, -1.328068155288572e+01)
+_C = (-7.784894002430293e-03, -3.223964580411365e-01, -2.400758277161838e+00,
+      -2.549732539343734e+00, 4.374664141464968e+00, 2.938163982698783e+00)
+_D = (7.784695709041462e-03, 3.224671290700398e-01, 2.445134137142996e+00, 3.754408661907416e+00)
+_P_LOW = 0.02425
+
+
+def norm_ppf(u: np.ndarray) -> np.ndarray:
+    """Standard normal quantile of u in (0, 1), vectorized."""
+    u = np.clip(u, np.finfo(float).tiny, 1.0 - np.finfo(float).epsneg)
+    out = np.empty_like(u)
+    tail = np.minimum(u, 1.0 - u) < _P_LOW
+    q = u[~tail] - 0.5
+    r = q * q
+    out[~tail] = (((((_A[0] * r + _A[1]) * r + _A[2]) * r + _A[3]) * r + _A[4]) * r + _A[5]) * q / \
+                 (((((_B[0] * r + _B[1]) * r + _B[2]) * r + _B[3]) * r + _B[4]) * r + 1.0)
+    ut = u[tail]
+    q = np.sqrt(-2.0 * np.log(np.minimum(ut, 1.0 - ut)))
+    x = (((((_C[0] * q + _C[1]) * q + _C[2]) * q + _C[3]) * q + _C[4]) * q + _C[5]) / \
+        ((((_D[0] * q + _D[1]) * q + _D[2]) * q + _D[3]) * q + 1.0)
+    out[tail] = np.where(ut < 0.5, x, -x)
+    return out
+
+
+def partition_values(index: int, seed: np.random.SeedSequence, args: argparse.Namespace) -> np.ndarray:
+    """
+    Values of partition `index` (0-based), from its own seeded stream only.
+
+    Every scheme draws uniform quantiles u and returns scale * Φ⁻¹(u), so the
+    pooled data is N(0, clients) in distribution; schemes differ in which
+    quantiles each partition gets.
+    """
+    rng = np.random.default_rng(seed)
+    rows = args.rows
+    if args.scheme == "size-skewed":
+        # lognormal sizes with mean --rows
+        rows = max(1, int(round(rows * rng.lognormal(-args.size_sigma ** 2 / 2, args.size_sigma))))
+    if args.scheme == "sorted":
+        # the index-th slice of the globally sorted data
+        u = (index + rng.random(rows)) / args.clients
+    elif args.scheme == "dirichlet":
+        # mixture of --components quantile slices, with Dirichlet(alpha) weights per partition
+        k = args.components
+        weights = rng.dirichlet(np.full(k, args.alpha))
+        u = (rng.choice(k, size=rows, p=weights) + rng.random(rows)) / k
+    else:
+        u = rng.random(rows)
+    return args.clients * norm_ppf(u)
+
+
+def write_partition(index: int, seed: np.random.SeedSequence, args: argparse.Namespace):
+    x = partition_values(index, seed, args)
+    columns = {"value": x}
+    if args.groups:
+        # drawn after the values from a child stream, so --groups leaves "value" unchanged
+        columns["group"] = np.random.default_rng(seed.spawn(1)[0]).integers(0, args.groups, x.size)
+    name = f"partition_{index + 1}.{args.format}"
+    if args.format == "npy":
+        write_npy(str(args.outdir / name), columns)
+    else:
+        pd.DataFrame(columns).to_csv(args.outdir / name, index=False)
+    return name, x.size, float(x.mean()), float(x.std(ddof=1)) if x.size > 1 else float("nan")
+
+
+def _write_one(job):
+    return write_partition(*job)
+
+
 def main():
     parser = argparse.ArgumentParser(
-        description="Generate synthetic CSV partitions for SimuFed clients."
+        description="Generate synthetic CSV (or binary .npy) partitions for SimuFed clients."
     )
     parser.add_argument("--outdir", type=Path, default=Path("datasets"))
     parser.add_argument("--clients", type=int, default=3)
-    parser.add_argument("--rows", type=int, default=1000)
+    parser.add_argument("--rows", type=int, default=1000, help="Rows per partition (the mean, with size-skewed)")
     parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--format", choices=["csv", "npy"], default="csv",
+                        help="csv (text) or npy (binary, memory-mappable)")
+    parser.add_argument("--scheme", choices=SCHEMES, default="sorted",
+                        help="sorted: consecutive slices of the sorted data (pathological); iid; "
+                             "dirichlet: skewed mixtures of quantile slices; size-skewed: iid, lognormal sizes")
+    parser.add_argument("--alpha", type=float, default=0.5, help="Dirichlet concentration (smaller = more skewed)")
+    parser.add_argument("--components", type=int, default=10, help="Quantile slices mixed by the dirichlet scheme")
+    parser.add_argument("--size-sigma", type=float, default=1.0, help="Lognormal sigma of size-skewed row counts")
+    parser.add_argument("--groups", type=int, default=0,
+                        help="Also write an integer 'group' column with this many categories (for --group-by)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                        help="Processes writing partitions; output does not depend on it")
     args = parser.parse_args()
 
-    rng = np.random.default_rng(args.seed)
     args.outdir.mkdir(parents=True, exist_ok=True)
 
-    # Generate a single dataset with n elements
-    n = args.clients * args.rows
-    x = rng.normal(loc=0, scale=args.clients, size=n)
-    x = np.sort(x)
-    df = pd.DataFrame({"value": x})
-
-    # Pathologically partition the dataset into consecutive chunks
-    # Each client gets a chunk with slightly different statistics
-    # We will show that aggregate of the clients approximates the global stats: mean=0, std=args.clients
-    for i in range(args.clients):
-        start_idx = i * args.rows
-        end_idx = start_idx + args.rows
-        partition = df.iloc[start_idx:end_idx].sample(frac=1, random_state=args.seed).reset_index(drop=True)
-        partition.to_csv(args.outdir / f"partition_{i+1}.csv", index=False)
-        client_mean = partition["value"].mean()
-        client_std = partition["value"].std()
-        print(f"Generated partition_{i+1}.csv (rows={len(partition)}) (mean {client_mean:.2f}, std {client_std:.2f})")
-
-    print(f">>> Created {args.clients} CSV partitions in {args.outdir}/")
+    # One independent stream per partition: the output depends only on --seed and the partition index
+    seeds = np.random.SeedSequence(args.seed).spawn(args.clients)
+    jobs = [(i, seeds[i], args) for i in range(args.clients)]
+    if args.workers > 1 and args.clients > 1:
+        with ProcessPoolExecutor(max_workers=args.workers) as pool:
+            results = pool.map(_write_one, jobs, chunksize=max(1, args.clients // (4 * args.workers)))
+            for name, n, client_mean, client_std in results:
+                print(f"Generated {name} (rows={n}) (mean {client_mean:.2f}, std {client_std:.2f})")
+    else:
+        for job in jobs:
+            name, n, client_mean, client_std = _write_one(job)
+            print(f"Generated {name} (rows={n}) (mean {client_mean:.2f}, std {client_std:.2f})")
+
+    print(f">>> Created {args.clients} {args.format.upper()} partitions ({args.scheme}) in {args.outdir}/")
     print(f">>> Federated Average should approximate global stats: mean=0, std={args.clients:.2f}")
 
 if __name__ == "__main__":
     main()
 
 '''
-Generates one CSV per client.
+Generates one CSV per client (or one structured .npy file with --format npy).
 
 Each CSV has a column "value" with numeric data.
+With --groups K it also has an integer column "group" in [0, K), for the
+group-by demo (run_sync_demo.py --group-by group).
+
+Partitions are generated independently: partition i draws from its own
+stream, SeedSequence(--seed).spawn(clients)[i], so memory is one partition
+per worker, partitions are written in parallel (--workers), and the files
+are bit-identical for any worker count.
+
+--scheme picks how the N(0, clients) data is split:
+    sorted      → partition i holds the i-th slice of the sorted data (the
+                  original pathological split; means differ strongly)
+    iid         → every partition is a random sample
+    dirichlet   → each partition mixes --components quantile slices with
+                  Dirichlet(--alpha) weights (label-skew style)
+    size-skewed → iid values, lognormal row counts around --rows
 
 Slight variations in mean/variance ensure global aggregation isn’t trivial.
 
 Reproducible across runs because of --seed.
-'''
\ No newline at end of file
+'''
@@ -1,14 +1,14 @@
 #!/usr/bin/env python3
 from __future__ import annotations
 
+import argparse
 import csv
-import shlex
-import subprocess
+import sys
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))  # repo root, for SimuFed
+from SimuFed.sweep import grid, run_sweep
 
-# Each command string contains the drop probability as: --drop-prob X
-COMMANDS = []
 clients = 50
 timeout = 2
 max_delay = 4
@@ -17,81 +17,29 @@ grace = 2
 # Linearly spaced drop probabilities
 probs = [round(i * 1.0 / 20, 2) for i in range(20)]
 
-for p in probs:
-    COMMANDS.append(
-        f"run_sync_demo.py --clients {clients} --timeout {timeout} --drop-prob {p} --max-delay {max_delay}"
-    )
-    COMMANDS.append(
-        f"run_async_demo.py --clients {clients} --timeout {timeout} --drop-prob {p} --max-delay {max_delay} --grace {grace}"
-    )
-
-PYTHON = "python"  # or ".venv/bin/python3" if you prefer absolute
-
-
-def parse_drop_prob(cmd: str) -> float:
-    parts = shlex.split(cmd)
-    if "--drop-prob" in parts:
-        idx = parts.index("--drop-prob")
-        return float(parts[idx + 1])
-    return 0.0
-
-
-def run_and_collect(cmd: str) -> dict | None:
-    print(f"Running: {PYTHON} {cmd}")
-    proc = subprocess.Popen(
-        [PYTHON] + shlex.split(cmd),
-        stdout=subprocess.PIPE,
-        stderr=subprocess.PIPE,
-        text=True,
-    )
-    stdout, stderr = proc.communicate()
-
-    stats_line = None
-    for line in stdout.splitlines():
-        if line.startswith("STATS,"):
-            stats_line = line.strip()
-            break
-
-    if stats_line is None:
-        print("  !! No STATS line found, skipping")
-        if stderr.strip():
-            print("  stderr:\n", stderr)
-        return None
-
-    # stats_line example:
-    # STATS,mode=sync,clients_expected=5,received=3,...
-    tokens = stats_line.split(",")[1:]  # skip "STATS"
-    data = {}
-    for tok in tokens:
-        k, v = tok.split("=", 1)
-        data[k] = v
-
-    # Convert numeric fields
-    for key in ("clients_expected", "received", "dropped", "global_n"):
-        data[key] = int(data[key])
-    for key in ("duration", "global_mean", "global_var"):
-        try:
-            data[key] = float(data[key])
-        except ValueError:
-            data[key] = float("nan")
-
-    # Add drop_prob from the command string
-    data["drop_prob"] = parse_drop_prob(cmd)
-
-    return data
-
 
 def main() -> None:
-    rows: list[dict] = []
-
-    for cmd in COMMANDS:
-        res = run_and_collect(cmd)
-        if res is not None:
-            rows.append(res)
-
-    if not rows:
-        print("No results collected.")
-        return
+    parser = argparse.ArgumentParser(description="Run the sync/async drop-probability sweep")
+    parser.add_argument("--virtual-clock", action="store_true",
+                        help="Run every configuration in discrete-event mode (no real sleeping)")
+    parser.add_argument("--seed", type=int, default=0,
+                        help="Base seed for the per-client delay/dropout draws (replicate r uses seed + r)")
+    parser.add_argument("--replicates", type=int, default=1,
+                        help="Seeded repetitions of every configuration")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Configurations run in parallel (default: CPU count)")
+    parser.add_argument("--cache", type=Path, default=Path("results.jsonl"),
+                        help="JSONL cache of finished configurations; reruns only compute missing ones")
+    parser.add_argument("--out", type=Path, default=Path("results.csv"))
+    args = parser.parse_args()
+
+    common = dict(clients=[clients], timeout=[timeout], max_delay=[max_delay],
+                  virtual_clock=[args.virtual_clock])
+    points = (
+        grid(args.replicates, args.seed, mode=["sync"], drop_prob=probs, **common)
+        + grid(args.replicates, args.seed, mode=["async"], drop_prob=probs, grace=[grace], **common)
+    )
+    rows = run_sweep(points, cache_path=args.cache, workers=args.workers)
 
     # Define column order (note: drop_prob included!)
     fieldnames = [
@@ -104,16 +52,17 @@ def main() -> None:
         "global_n",
         "global_mean",
         "global_var",
+        "seed",
+        "replicate",
     ]
 
-    out_path = Path("results.csv")
-    with out_path.open("w", newline="") as f:
-        writer = csv.DictWriter(f, fieldnames=fieldnames)
+    with args.out.open("w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=fieldnames, extrasaction="ignore")
         writer.writeheader()
         for r in rows:
             writer.writerow(r)
 
-    print(f"Saved {out_path} with {len(rows)} rows")
+    print(f"Saved {args.out} with {len(rows)} rows")
 
 
 if __name__ == "__main__":
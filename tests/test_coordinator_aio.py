@@ -0,0 +1,37 @@
+import numpy as np
+import pytest
+
+from SimuFed import coordinator_aio
+from SimuFed.client import ClientConfig
+from SimuFed.coordinator_aio import AioCoordinator
+
+
+def _clients(tmp_path, count: int) -> list[ClientConfig]:
+    path = tmp_path / "p.npy"
+    np.save(path, np.arange(100, dtype=float))
+    return [ClientConfig(client_id=i + 1, csv_path=str(path), bins=4, hist_range=(0.0, 100.0)) for i in range(count)]
+
+
+def test_clients_sharing_a_partition_send_their_own_summary(tmp_path, monkeypatch):
+    sent = []
+    add = coordinator_aio.RunningAggregate.add
+
+    def recording_add(self, summary):
+        sent.append(summary)
+        add(self, summary)
+
+    monkeypatch.setattr(coordinator_aio.RunningAggregate, "add", recording_add)
+    result = AioCoordinator(timeout_s=5.0, verbose=False).run_round(_clients(tmp_path, 3))
+    assert result.received == 3 and result.aggregated["n"] == 300
+    assert sorted(s.client_id for s in sent) == [1, 2, 3]
+    assert [s.partition_id for s in sent] == [s.client_id for s in sent]
+    assert len({id(s) for s in sent}) == 3 and len({id(s.marks) for s in sent}) == 3
+
+
+def test_failed_partition_job_raises(tmp_path, monkeypatch):
+    def broken(cfg):
+        raise OSError(f"cannot read {cfg.csv_path}")
+
+    monkeypatch.setattr(coordinator_aio, "summarize_partition", broken)
+    with pytest.raises(OSError, match="cannot read"):
+        AioCoordinator(timeout_s=5.0, verbose=False).run_round(_clients(tmp_path, 2))
@@ -0,0 +1,48 @@
+import numpy as np
+import pytest
+
+from SimuFed.client import ClientConfig
+from SimuFed.coordinator_tree import TreeCoordinator, build_tree
+from SimuFed.fault_simulator import FaultConfig, fault_rng, sample_fault
+
+
+def _clients(tmp_path, faults: FaultConfig, count: int = 10) -> list[ClientConfig]:
+    clients = []
+    for i in range(count):
+        path = tmp_path / f"partition_{i + 1}.npy"
+        np.save(path, np.full(50, float(i)))
+        clients.append(ClientConfig(client_id=i + 1, csv_path=str(path), bins=4, hist_range=(0.0, 10.0), faults=faults))
+    return clients
+
+
+def test_default_deadlines_add_slack_per_tier():
+    assert TreeCoordinator(timeout_s=5.0, tier_slack_s=0.5)._deadlines(10.0, 2) == [15.0, 15.5, 16.0]
+
+
+def test_short_tier_timeouts_are_padded_with_slack():
+    coord = TreeCoordinator(tier_timeouts=[3.0, 1.0], tier_slack_s=0.25)
+    assert coord._deadlines(0.0, 3) == [3.0, 4.0, 4.25, 4.5]
+    assert coord._deadlines(0.0, 1) == [3.0, 4.0]
+
+
+def test_too_many_tier_timeouts():
+    with pytest.raises(ValueError, match="2 tiers plus the root"):
+        TreeCoordinator(tier_timeouts=[1.0] * 4)._deadlines(0.0, 2)
+
+
+def test_dropped_is_counted_in_clients_not_partials(tmp_path):
+    # seed 2 drops clients 7, 8 and 9: one whole tier-0 node (fan_in 3) hears from nobody
+    faults = FaultConfig(drop_prob=0.4, seed=2)
+    clients = _clients(tmp_path, faults)
+    dropped = [c.client_id for c in clients if sample_fault(faults, fault_rng(faults, c.client_id))[1]]
+    assert [n.children for n in build_tree([c.client_id for c in clients], 3)[0]][2] == dropped
+    result = TreeCoordinator(timeout_s=1.0, fan_in=3, tier_slack_s=0.25).run_round(clients)
+    assert result.dropped == len(dropped)
+    assert sum(s.members for s in result.summaries) == len(clients) - len(dropped)
+    assert result.aggregated["n"] == 50 * (len(clients) - len(dropped))
+    assert result.stopped_by == "timeout"
+
+
+def test_no_drops(tmp_path):
+    result = TreeCoordinator(timeout_s=5.0, fan_in=3).run_round(_clients(tmp_path, FaultConfig()))
+    assert (result.dropped, result.stopped_by, result.aggregated["n"]) == (0, "all", 500)
@@ -0,0 +1,41 @@
+import numpy as np
+import pytest
+
+from SimuFed.utils.aggregator import grid_edges
+from SimuFed.utils.groups import GroupStats
+
+rng = np.random.default_rng(0)
+x = rng.normal(50.0, 10.0, 6000)
+keys = rng.zipf(1.5, x.size) % 40  # skewed: some keys only occur in a few shards
+edges = grid_edges(0.0, 100.0, 16)
+
+
+def _shards(count: int) -> list[GroupStats]:
+    return [GroupStats.from_arrays(xs, ks, edges) for xs, ks in zip(np.array_split(x, count), np.array_split(keys, count))]
+
+
+@pytest.mark.parametrize("count", [2, 7, 50])
+def test_merge_many_matches_one_table_of_everything(count):
+    want = GroupStats.from_arrays(x, keys, edges)
+    got = GroupStats.merge_many(_shards(count))
+    assert np.array_equal(got.keys, want.keys) and np.array_equal(got.n, want.n)
+    assert got.s == pytest.approx(want.s) and got.s2 == pytest.approx(want.s2)
+    assert got.m2 == pytest.approx(want.m2, rel=1e-9)
+    assert np.array_equal(got.hist_counts, want.hist_counts)
+
+
+def test_merge_many_rebins_differing_edges_per_key():
+    tables = _shards(3)
+    tables[1] = GroupStats.from_arrays(np.array_split(x, 3)[1], np.array_split(keys, 3)[1], grid_edges(-20.0, 120.0, 9))
+    got = GroupStats.merge_many(tables)
+    assert got.hist_edges[0] == -20.0 and got.hist_edges[-1] == 120.0
+    assert np.array_equal(got.hist_counts.sum(axis=1), got.n)
+
+
+def test_empty_tables_are_skipped_and_inputs_untouched():
+    table = GroupStats.from_arrays(x[:100], keys[:100], edges)
+    empty = GroupStats.from_arrays(np.empty(0), np.empty(0, dtype=keys.dtype), edges)
+    got = GroupStats.merge_many([empty, table, empty])
+    assert np.array_equal(got.keys, table.keys) and np.array_equal(got.n, table.n)
+    got.n[:] = 0
+    assert table.n.sum() == 100
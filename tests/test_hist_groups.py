@@ -0,0 +1,34 @@
+import numpy as np
+import pandas as pd
+
+from SimuFed.client import ClientConfig, load_partition, summarize
+from SimuFed.utils.aggregator import grid_edges, hist_groups
+
+
+def _edge_valued(rows: int, cols: int) -> np.ndarray:
+    # multiples of 0.1 on a 10-bin [0, 1] grid: most values sit on a bin edge
+    return np.round(np.random.default_rng(0).random((rows, cols)), 1)
+
+
+def _reference(x: np.ndarray, edges: np.ndarray) -> np.ndarray:
+    return np.array([np.histogram(x[:, j], bins=edges[j])[0] for j in range(x.shape[1])])
+
+
+def test_hist_groups_fortran_order_matches_np_histogram():
+    x = _edge_valued(1000, 4)
+    edges = grid_edges(np.zeros(4), np.ones(4), 10)
+    for arr in (x, np.asfortranarray(x)):
+        for within in (False, True):
+            got = hist_groups(arr, np.arange(4), edges, within=within)
+            assert np.array_equal(got, _reference(x, edges))
+
+
+def test_multi_column_csv_client_matches_np_histogram(tmp_path):
+    x = _edge_valued(500, 3)
+    path = tmp_path / "p.csv"
+    pd.DataFrame(x, columns=["a", "b", "c"]).to_csv(path, index=False)
+    cfg = ClientConfig(client_id=1, csv_path=str(path), columns=["a", "b", "c"], bins=10, hist_range=(0.0, 1.0))
+    loaded = load_partition(cfg)
+    assert not loaded.flags.c_contiguous  # the layout that used to lose the edge fix-up
+    stats = summarize(cfg, loaded).columns
+    assert np.array_equal(stats.hist_counts, _reference(x, np.tile(np.linspace(0, 1, 11), (3, 1))))
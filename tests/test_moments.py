@@ -0,0 +1,35 @@
+import numpy as np
+import pytest
+
+from SimuFed.utils.aggregator import central_moments, combine_moments
+
+rng = np.random.default_rng(0)
+# skewed, far from zero: the case naive power sums get wrong
+parts = [rng.gamma(2.0, 3.0, size) + 1e6 for size in (1, 7, 300, 5000)]
+
+
+def _close(got, want) -> None:
+    assert got[0] == want[0]
+    assert got[1:] == pytest.approx(want[1:], rel=1e-9, abs=1e-9)
+
+
+def test_combine_two_groups_matches_whole():
+    a, b = parts[2], parts[3]
+    _close(combine_moments(central_moments(a), central_moments(b)), central_moments(np.concatenate([a, b])))
+
+
+def test_merge_order_does_not_matter():
+    whole = central_moments(np.concatenate(parts))
+    ms = [central_moments(p) for p in parts]
+    left = ms[0]
+    for m in ms[1:]:
+        left = combine_moments(left, m)
+    tree = combine_moments(combine_moments(ms[3], ms[1]), combine_moments(ms[2], ms[0]))
+    _close(left, whole)
+    _close(tree, whole)
+
+
+def test_empty_group_is_identity():
+    m = central_moments(parts[2])
+    empty = central_moments(np.empty(0))
+    assert combine_moments(m, empty) == m and combine_moments(empty, m) == m
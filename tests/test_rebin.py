@@ -0,0 +1,33 @@
+import numpy as np
+import pytest
+
+from SimuFed.utils.aggregator import RunningAggregate, Summary, grid_edges, make_hist, rebin, rebin_cumulative
+
+rng = np.random.default_rng(0)
+x = rng.normal(0.0, 1.0, 10_000)
+counts, edges = make_hist(x, bins=37)  # edges of this sample, not a round grid
+
+
+@pytest.mark.parametrize("bins", [5, 37, 100, 1000])
+def test_mass_is_preserved_on_a_covering_grid(bins):
+    grid = grid_edges(edges[0] - 1.0, edges[-1] + 2.5, bins)
+    cum = rebin_cumulative(counts, edges, grid)
+    assert cum[0] == 0.0 and cum[-1] == pytest.approx(x.size)
+    assert np.all(np.diff(cum) >= -1e-9)
+    assert rebin(counts, edges, grid).sum() == x.size
+
+
+def test_mass_outside_the_grid_is_dropped_pro_rata():
+    # half of the first source bin lies below the grid, the rest is covered
+    grid = np.array([(edges[0] + edges[1]) / 2, edges[-1]])
+    assert rebin_cumulative(counts, edges, grid)[-1] == pytest.approx(x.size - counts[0] / 2)
+
+
+@pytest.mark.parametrize("grid", [None, grid_edges(-8.0, 8.0, 20)])
+def test_running_aggregate_keeps_mass_across_client_edges(grid):
+    # every part brings its own edges; with grid=None the aggregate also widens
+    agg = RunningAggregate(edges=grid)
+    for i, part in enumerate(np.array_split(np.sort(x), 7)):
+        c, e = make_hist(part, bins=13)
+        agg.add(Summary(client_id=i, n=part.size, s=float(part.sum()), s2=float(part @ part), hist_counts=c, hist_edges=e))
+    assert agg.hist_counts.sum() == x.size
@@ -0,0 +1,38 @@
+import time
+from queue import Empty
+
+import pytest
+
+from SimuFed.client import ClientConfig
+from SimuFed.scheduler import ClientScheduler, admission_order
+from SimuFed.transport import QueueTransport
+
+
+def _silent(cfg, out):
+    pass  # a client that exits without reporting, like a dropped one
+
+
+def _clients(count: int) -> list[ClientConfig]:
+    return [ClientConfig(client_id=i + 1, csv_path=f"partition_{i + 1}.csv") for i in range(count)]
+
+
+def _ids(order: list[ClientConfig]) -> list[int]:
+    return [c.client_id for c in order]
+
+
+def test_random_admission_is_seeded():
+    clients = _clients(20)
+    assert _ids(admission_order(clients, "random", seed=4)) == _ids(admission_order(clients, "random", seed=4))
+    assert _ids(admission_order(clients, "random", seed=4)) != _ids(clients)
+
+
+def test_get_does_not_wait_out_the_deadline_once_everyone_exited():
+    out = QueueTransport()
+    sched = ClientScheduler(_clients(3), _silent, out, max_concurrent=2).start()
+    t0 = time.time()
+    with pytest.raises(Empty):
+        while True:
+            sched.get(timeout=30.0)
+    assert sched.finished
+    assert time.time() - t0 < 10.0
+    out.close()
@@ -0,0 +1,51 @@
+import numpy as np
+
+from SimuFed.utils.sketch import TDigest, max_centroids
+
+rng = np.random.default_rng(0)
+parts = [rng.lognormal(0.0, 1.0, rng.integers(100, 5000)) for _ in range(50)]
+x = np.sort(np.concatenate(parts))
+qs = np.array([0.001, 0.01, 0.1, 0.25, 0.5, 0.75, 0.9, 0.99, 0.999])
+
+
+def _merged(compression: float) -> TDigest:
+    d = TDigest(compression)
+    for part in parts:
+        d.merge(TDigest.from_array(part, compression))
+    return d
+
+
+def _rank_error(d: TDigest) -> np.ndarray:
+    return np.abs(np.searchsorted(x, d.quantile(qs)) / x.size - qs)
+
+
+def test_merge_keeps_count_extremes_and_size_bound():
+    d = _merged(100.0)
+    assert d.count == x.size
+    assert (d.min, d.max) == (x[0], x[-1])
+    assert d.centroids()[0].size <= max_centroids(100.0)
+    assert d.quantile(0.0) == x[0] and d.quantile(1.0) == x[-1]
+
+
+def test_quantile_rank_error_of_merged_digest():
+    err = _rank_error(_merged(200.0))
+    assert np.all(err < 1e-3)
+    assert np.all(err[[0, 1, -2, -1]] < 5e-4)  # the tails stay tighter
+
+
+def test_merge_order_keeps_the_error_bound():
+    backward = TDigest(200.0)
+    for part in reversed(parts):
+        backward.merge(TDigest.from_array(part, 200.0))
+    # a tree of merges, as TreeCoordinator nodes would do
+    halves = [TDigest(200.0), TDigest(200.0)]
+    for i, part in enumerate(parts):
+        halves[i % 2].merge(TDigest.from_array(part, 200.0))
+    tree = halves[0].merge(halves[1])
+    for d in (backward, tree):
+        assert d.count == x.size and np.all(_rank_error(d) < 1e-3)
+
+
+def test_empty_digest():
+    d = TDigest(50.0).merge(TDigest.from_array(np.empty(0), 50.0))
+    assert d.count == 0 and np.isnan(d.quantile(0.5))
@@ -0,0 +1,33 @@
+import numpy as np
+
+from SimuFed.client import ClientConfig
+from SimuFed.coordinator import Coordinator
+from SimuFed.coordinator_async import AsyncCoordinator
+from SimuFed.fault_simulator import FaultConfig
+from SimuFed.stopping import Quorum
+
+
+def _clients(tmp_path, count: int, drop_prob: float) -> list[ClientConfig]:
+    faults = FaultConfig(drop_prob=drop_prob, max_delay_s=1.0, seed=2)
+    clients = []
+    for i in range(count):
+        path = tmp_path / f"p{i}.npy"
+        np.save(path, np.full(10, float(i)))
+        clients.append(ClientConfig(client_id=i + 1, csv_path=str(path), faults=faults))
+    return clients
+
+
+def test_policy_stop_counts_unheard_clients_as_pending(tmp_path):
+    clients = _clients(tmp_path, 10, drop_prob=0.0)
+    for coord in (Coordinator(timeout_s=5.0, virtual_clock=True, stopping=Quorum(4)),
+                  AsyncCoordinator(timeout_s=5.0, virtual_clock=True, stopping=Quorum(4))):
+        result = coord.run_round(clients)
+        assert result.stopped_by == "quorum"
+        assert (result.dropped, result.pending) == (0, 6)
+
+
+def test_rounds_that_run_their_course_have_nothing_pending(tmp_path):
+    clients = _clients(tmp_path, 10, drop_prob=0.5)
+    result = Coordinator(timeout_s=5.0, virtual_clock=True).run_round(clients)
+    assert result.stopped_by == "timeout"
+    assert result.pending == 0 and result.dropped == 10 - len(result.summaries) > 0
@@ -0,0 +1,68 @@
+import numpy as np
+import pytest
+
+from SimuFed.utils.aggregator import (RunningAggregate, Summary, central_moments, combine_moments, grid_edges,
+                                      make_hist, split_moments)
+from SimuFed.utils.sketch import TDigest
+
+rng = np.random.default_rng(0)
+grid = grid_edges(-10.0, 10.0, 20)
+chunks = [rng.normal(loc, 1.0 + loc / 4, size) for loc, size in ((0.0, 800), (2.5, 50), (-1.0, 3000), (4.0, 1))]
+
+
+def _summary(x: np.ndarray, edges=grid, **kw) -> Summary:
+    counts, edges = make_hist(x, bins=len(edges) - 1, range_=(edges[0], edges[-1]))
+    _, _, m2, m3, m4 = central_moments(x)
+    return Summary(client_id=1, n=x.size, s=float(x.sum()), s2=float(x @ x), hist_counts=counts,
+                   hist_edges=edges, m2=m2, m3=m3, m4=m4, **kw)
+
+
+def _assert_same(got: RunningAggregate, want: RunningAggregate) -> None:
+    assert (got.n, got.count) == (want.n, want.count)
+    assert np.array_equal(got.hist_counts, want.hist_counts)
+    assert got.moments()[1:] == pytest.approx(want.moments()[1:], rel=1e-9, abs=1e-9)
+
+
+def test_split_moments_undoes_combine_moments():
+    a, b = central_moments(chunks[0]), central_moments(chunks[1])
+    got = split_moments(combine_moments(a, b), b)
+    assert got[0] == a[0] and got[1:] == pytest.approx(a[1:], rel=1e-9)
+
+
+def test_split_moments_edge_cases():
+    m = central_moments(chunks[2])
+    assert split_moments(m, central_moments(np.empty(0))) == m
+    assert split_moments(m, m) == (0, 0.0, 0.0, 0.0, 0.0)
+
+
+@pytest.mark.parametrize("drop", range(len(chunks)))
+def test_subtract_summary_is_inverse_of_add(drop):
+    agg, want = RunningAggregate(edges=grid), RunningAggregate(edges=grid)
+    for i, x in enumerate(chunks):
+        agg.add(_summary(x))
+        if i != drop:
+            want.add(_summary(x))
+    _assert_same(agg.subtract(_summary(chunks[drop])), want)
+
+
+def test_subtract_aggregate_is_inverse_of_merge():
+    left, right = RunningAggregate(edges=grid), RunningAggregate(edges=grid)
+    for x in chunks[:2]:
+        left.add(_summary(x))
+    for x in chunks[2:]:
+        right.add(_summary(x))
+    both = RunningAggregate(edges=grid).merge(left).merge(right)
+    _assert_same(both.subtract(right), left)
+
+
+def test_subtract_off_grid_histogram():
+    other = grid_edges(-6.0, 7.0, 13)
+    agg = RunningAggregate(edges=grid).add(_summary(chunks[0])).add(_summary(chunks[2], other))
+    agg.subtract(_summary(chunks[2], other))
+    assert np.array_equal(agg.hist_counts, _summary(chunks[0]).hist_counts)
+
+
+def test_subtract_rejects_sketches():
+    agg = RunningAggregate(edges=grid).add(_summary(chunks[0]))
+    with pytest.raises(ValueError, match="cannot be subtracted"):
+        agg.subtract(_summary(chunks[0], sketch=TDigest.from_array(chunks[0])))
@@ -0,0 +1,44 @@
+from queue import Empty
+
+import numpy as np
+import pytest
+
+from SimuFed.transport import SharedMemoryTransport
+from SimuFed.utils.aggregator import Summary
+
+
+def _summary(n: int, round_id: int = 0) -> Summary:
+    return Summary(client_id=1, n=n, s=float(n), s2=float(n), hist_counts=np.array([n]),
+                   hist_edges=np.array([0.0, 1.0]), round_id=round_id)
+
+
+@pytest.fixture
+def board():
+    b = SharedMemoryTransport([1], bins=1)
+    yield b
+    b.close()
+
+
+def test_round_trip(board):
+    board.publish(_summary(5))
+    assert board.get(timeout=1).n == 5
+    with pytest.raises(Empty):
+        board.get(timeout=0.05)
+
+
+def test_queued_slot_mid_write_is_not_returned_torn(board):
+    # slot already queued when its client starts rewriting it (next pooled round, late straggler)
+    board.publish(_summary(5))
+    board.sem.acquire()
+    board._pending.append(0)
+    board.seq[0] = -1
+    board.n[0] = 999  # half-written
+    with pytest.raises(Empty):
+        board.get(timeout=0.05)
+
+    # the writer finishes: delivered once, intact
+    board.publish(_summary(7, round_id=1))
+    got = board.get(timeout=1)
+    assert (got.n, got.round_id) == (7, 1)
+    with pytest.raises(Empty):
+        board.get(timeout=0.05)
@@ -0,0 +1,52 @@
+import numpy as np
+import pytest
+
+from SimuFed.client import ClientConfig
+from SimuFed.coordinator import Coordinator
+from SimuFed.coordinator_async import AsyncCoordinator
+from SimuFed.fault_simulator import FaultConfig, fault_rng, sample_fault
+
+
+def _clients(tmp_path, faults: FaultConfig, count: int = 12) -> list[ClientConfig]:
+    rng = np.random.default_rng(0)
+    clients = []
+    for i in range(count):
+        path = tmp_path / f"partition_{i + 1}.npy"
+        np.save(path, rng.normal(i, 1.0, 200))
+        clients.append(ClientConfig(client_id=i + 1, csv_path=str(path), bins=8, hist_range=(-5.0, 20.0), faults=faults))
+    return clients
+
+
+def _outcome(result) -> tuple:
+    ids = sorted(s.client_id for s in result.summaries) if hasattr(result, "summaries") else None
+    agg = result.aggregated
+    return ids, result.dropped, agg["n"], agg["hist_counts"], agg["mean"], agg["var"]
+
+
+@pytest.mark.parametrize("make", [lambda vc: Coordinator(timeout_s=1.5, virtual_clock=vc),
+                                  lambda vc: AsyncCoordinator(timeout_s=1.5, grace_after_last=0.75, virtual_clock=vc)])
+def test_virtual_clock_matches_real_mode_for_a_seed(tmp_path, make):
+    # short delays well inside the timeout: in both modes exactly the undropped clients answer
+    clients = _clients(tmp_path, FaultConfig(drop_prob=0.3, max_delay_s=0.2, seed=7))
+    real, virtual = _outcome(make(False).run_round(clients)), _outcome(make(True).run_round(clients))
+    assert real[:4] == virtual[:4]
+    assert real[4:] == pytest.approx(virtual[4:])
+    assert 0 < real[1] < len(clients)  # the seed drops some, not all
+
+
+def test_virtual_round_follows_the_seeded_fault_draws(tmp_path):
+    faults = FaultConfig(drop_prob=0.2, max_delay_s=10.0, seed=3)
+    clients = _clients(tmp_path, faults, count=40)
+    draws = {c.client_id: sample_fault(faults, fault_rng(faults, c.client_id)) for c in clients}
+    result = Coordinator(timeout_s=5.0, virtual_clock=True).run_round(clients)
+    on_time = sorted(cid for cid, (delay, drop) in draws.items() if not drop and delay < 5.0)
+    assert sorted(s.client_id for s in result.summaries) == on_time
+    assert result.duration_s == pytest.approx(5.0)  # someone was late, so the round ran to the virtual deadline
+
+
+def test_virtual_async_round_ends_at_the_grace_deadline(tmp_path):
+    # last_recv_time + 2.0 - last_recv_time < 2.0 in floating point here; the
+    # round must still end once the clock reaches last_recv_time + 2.0
+    clients = _clients(tmp_path, FaultConfig(drop_prob=0.3, max_delay_s=0.2, seed=7))
+    result = AsyncCoordinator(timeout_s=3.0, grace_after_last=2.0, virtual_clock=True).run_round(clients)
+    assert result.stopped_by == "grace"
@@ -0,0 +1,170 @@
+import struct
+
+import numpy as np
+import pytest
+
+from SimuFed.utils.aggregator import MARKS, Summary, central_moments, make_hist
+from SimuFed.utils.columns import ColumnStats
+from SimuFed.utils.groups import GroupStats
+from SimuFed.utils.sketch import TDigest
+from SimuFed.utils.wire import (FLAG_GRID, FLAG_GROUPS, MAGIC, VERSION, _HEADER, decode_summary,
+                                encode_summary)
+
+
+def _summary(x: np.ndarray, bins: int = 8, range_=None, **kw) -> Summary:
+    counts, edges = make_hist(x, bins=bins, range_=range_)
+    _, _, m2, m3, m4 = central_moments(x)
+    fields = dict(client_id=3, n=x.size, s=float(x.sum()), s2=float(x @ x), hist_counts=counts,
+                  hist_edges=edges, m2=m2, m3=m3, m4=m4)
+    fields.update(kw)
+    return Summary(**fields)
+
+
+def _flags(buf: bytes) -> int:
+    return _HEADER.unpack_from(buf, 0)[2]
+
+
+def _round_trip(summary: Summary, grid=None) -> Summary:
+    return decode_summary(encode_summary(summary, grid=grid))
+
+
+def _assert_scalars(got: Summary, want: Summary) -> None:
+    for name in ("client_id", "partition_id", "round_id", "members", "n", "s", "s2", "m2", "m3", "m4"):
+        assert getattr(got, name) == getattr(want, name), name
+
+
+x = np.random.default_rng(0).normal(3.0, 2.0, 500)
+
+
+def test_uniform_grid_sends_only_range():
+    s = _summary(x)
+    buf = encode_summary(s)
+    assert _flags(buf) & FLAG_GRID
+    got = decode_summary(buf)
+    _assert_scalars(got, s)
+    assert np.array_equal(got.hist_counts, s.hist_counts)
+    assert np.array_equal(got.hist_edges, s.hist_edges)  # rebuilt bit for bit
+
+
+def test_negotiated_grid():
+    s = _summary(x, range_=(-10.0, 10.0))
+    buf = encode_summary(s, grid=(-10.0, 10.0))
+    assert _flags(buf) & FLAG_GRID
+    assert np.array_equal(decode_summary(buf).hist_edges, s.hist_edges)
+
+
+def test_explicit_edges():
+    edges = np.array([-10.0, -1.0, 0.0, 0.5, 20.0])
+    s = _summary(x, hist_edges=edges, hist_counts=np.histogram(x, edges)[0])
+    buf = encode_summary(s)
+    assert not _flags(buf) & FLAG_GRID
+    got = decode_summary(buf)
+    assert np.array_equal(got.hist_edges, edges)
+    assert np.array_equal(got.hist_counts, s.hist_counts)
+
+
+@pytest.mark.parametrize("edges", [[], [0.0]])
+def test_empty_summary_zero_bins(edges):
+    s = Summary(client_id=1, n=0, s=0.0, s2=0.0, hist_counts=[], hist_edges=edges)
+    got = _round_trip(s)
+    _assert_scalars(got, s)
+    assert got.hist_counts.size == 0 and got.hist_edges.size == 0
+    assert got.marks == {} and got.sketch is None and got.columns is None and got.groups is None
+
+
+def test_identity_and_marks():
+    marks = {"start": 1.5, "computed": 2.25}  # "loaded" / "delayed" unset
+    s = _summary(x, partition_id=7, round_id=12, members=40, marks=marks)
+    got = _round_trip(s)
+    _assert_scalars(got, s)
+    assert got.marks == marks
+    assert set(got.marks) <= set(MARKS)
+
+
+def test_central_moments_nan_is_none():
+    s = _summary(x, m2=None, m3=None, m4=None)
+    got = _round_trip(s)
+    assert got.m2 is None and got.m3 is None and got.m4 is None
+    assert got.var == pytest.approx(s.var)
+    assert _round_trip(_summary(x)).m3 == pytest.approx(central_moments(x)[3])
+
+
+def test_sketch():
+    sketch = TDigest.from_array(x, 50.0)
+    got = _round_trip(_summary(x, sketch=sketch)).sketch
+    means, weights = sketch.centroids()
+    got_means, got_weights = got.centroids()
+    assert np.array_equal(got_means, means) and np.array_equal(got_weights, weights)
+    assert (got.compression, got.min, got.max) == (sketch.compression, sketch.min, sketch.max)
+    assert got.quantile(0.5) == sketch.quantile(0.5)
+
+
+@pytest.mark.parametrize("covariance", [False, True])
+def test_columns(covariance):
+    arr = np.random.default_rng(1).normal(size=(200, 3))
+    cs = ColumnStats.from_array(arr, ["a", "feat_b", "c"], bins=6, covariance=covariance)
+    got = _round_trip(_summary(arr[:, 0], columns=cs)).columns
+    assert got.names == cs.names and got.n == cs.n
+    for name in ("mean", "m2", "m3", "m4", "hist_counts", "hist_edges"):
+        assert np.array_equal(getattr(got, name), getattr(cs, name)), name
+    if covariance:
+        assert np.array_equal(got.comoment, cs.comoment)
+    else:
+        assert got.comoment is None
+
+
+@pytest.mark.parametrize("keys", [
+    np.array([3, -1, 7, 3, 1_000_000_000_000, 7]),        # int
+    np.array([0.5, np.nan, -2.0, 0.5, 1e300, -2.0]),      # float, one missing
+    np.array(["b", "a", "é", "b", "a", "longer key"], dtype=object),  # text
+])
+@pytest.mark.parametrize("hist", [False, True])
+def test_groups(keys, hist):
+    values = np.arange(keys.size, dtype=float)
+    s = _summary(values)
+    gs = GroupStats.from_arrays(values, keys, s.hist_edges if hist else None)
+    buf = encode_summary(_summary(values, groups=gs))
+    assert _flags(buf) & FLAG_GROUPS
+    got = decode_summary(buf).groups
+    assert list(got.keys) == list(gs.keys)
+    for name in ("n", "s", "s2", "m2"):
+        assert np.array_equal(getattr(got, name), getattr(gs, name)), name
+    if hist:
+        assert np.array_equal(got.hist_counts, gs.hist_counts)
+        assert np.array_equal(got.hist_edges, gs.hist_edges)
+    else:
+        assert got.hist_counts is None and got.hist_edges is None
+
+
+@pytest.mark.parametrize("dtype", [np.int64, np.float64, object])
+def test_empty_group_table(dtype):
+    gs = GroupStats.from_arrays(np.empty(0), np.empty(0, dtype=dtype))
+    got = _round_trip(_summary(x, groups=gs)).groups
+    assert len(got) == 0 and got.keys.dtype == gs.keys.dtype
+
+
+def test_every_section_together():
+    arr = np.random.default_rng(2).normal(size=(100, 2))
+    s = _summary(arr[:, 0], marks={"start": 1.0}, sketch=TDigest.from_array(arr[:, 0], 25.0),
+                 columns=ColumnStats.from_array(arr, ["u", "v"]),
+                 groups=GroupStats.from_arrays(arr[:, 0], np.arange(100) % 4))
+    got = _round_trip(s)
+    _assert_scalars(got, s)
+    assert got.marks == {"start": 1.0}
+    assert np.array_equal(got.columns.mean, s.columns.mean)
+    assert np.array_equal(got.groups.s, s.groups.s)
+    assert got.sketch.quantile(0.9) == s.sketch.quantile(0.9)
+
+
+def test_rejects_bad_magic():
+    buf = bytearray(encode_summary(_summary(x)))
+    buf[:3] = b"XYZ"
+    with pytest.raises(ValueError, match="not a SimuFed summary"):
+        decode_summary(bytes(buf))
+
+
+def test_rejects_other_version():
+    buf = bytearray(encode_summary(_summary(x)))
+    struct.pack_into("<B", buf, len(MAGIC), VERSION - 1)
+    with pytest.raises(ValueError, match="version"):
+        decode_summary(bytes(buf))